@@ -0,0 +1,22 @@
+"""Tiny timing helpers shared by the benchmark scripts."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+
+
+def best_of(run: Callable[[], object], *, repeat: int = 5) -> float:
+    """Return the fastest wall-clock duration of `run` over `repeat` attempts."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def report(label: str, count: int, seconds: float, *, unit: str = "msg") -> None:
+    rate = count / seconds if seconds > 0 else float("inf")
+    per_item_us = seconds / count * 1_000_000 if count else 0.0
+    print(f"{label:<48} {rate:>12,.0f} {unit}/s {per_item_us:>9.2f} us/{unit}")
@@ -0,0 +1,115 @@
+"""Representative app-server transcript used by the benchmark scripts.
+
+Pass `--transcript path.jsonl` to any benchmark to replay a real recording
+captured from `codex app-server` stdout instead of the synthetic turn below.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any
+
+JsonObject = dict[str, Any]
+
+
+def _usage() -> JsonObject:
+    breakdown = {
+        "cachedInputTokens": 0,
+        "inputTokens": 1200,
+        "outputTokens": 800,
+        "reasoningOutputTokens": 0,
+        "totalTokens": 2000,
+    }
+    return {"last": breakdown, "total": breakdown}
+
+
+def _agent_message(text: str, item_id: str) -> JsonObject:
+    return {"id": item_id, "type": "agentMessage", "phase": "final_answer", "text": text}
+
+
+def synthetic_turn(
+    *,
+    thread_id: str = "thr-1",
+    turn_id: str = "turn-1",
+    text_deltas: int = 2_000,
+    output_deltas: int = 500,
+) -> list[JsonObject]:
+    """Build a turn shaped like a real streaming run: mostly deltas, few lifecycle events."""
+    scope = {"threadId": thread_id, "turnId": turn_id}
+    messages: list[JsonObject] = [
+        {
+            "method": "turn/started",
+            "params": {
+                "threadId": thread_id,
+                "turn": {"id": turn_id, "status": "inProgress", "items": [], "error": None},
+            },
+        },
+    ]
+    for index in range(output_deltas):
+        messages.append(
+            {
+                "method": "item/commandExecution/outputDelta",
+                "params": {**scope, "itemId": "cmd-1", "delta": f"line {index}\n"},
+            }
+        )
+    chunks = [f"token{index} " for index in range(text_deltas)]
+    for chunk in chunks:
+        messages.append(
+            {
+                "method": "item/agentMessage/delta",
+                "params": {**scope, "itemId": "msg-1", "delta": chunk},
+            }
+        )
+    messages.extend(
+        [
+            {
+                "method": "thread/tokenUsage/updated",
+                "params": {**scope, "tokenUsage": _usage()},
+            },
+            {
+                "method": "item/completed",
+                "params": {
+                    **scope,
+                    "completedAtMs": 1_714_000_000_000,
+                    "item": _agent_message("".join(chunks), "msg-1"),
+                },
+            },
+            {
+                "method": "turn/completed",
+                "params": {
+                    "threadId": thread_id,
+                    "turn": {"id": turn_id, "status": "completed", "items": [], "error": None},
+                },
+            },
+        ]
+    )
+    return messages
+
+
+def load_transcript(path: Path) -> list[JsonObject]:
+    """Load notifications from a JSONL capture, ignoring responses and server requests."""
+    messages: list[JsonObject] = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if not line.strip():
+            continue
+        message = json.loads(line)
+        if isinstance(message, dict) and "method" in message and "id" not in message:
+            messages.append(message)
+    return messages
+
+
+def add_transcript_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--transcript",
+        type=Path,
+        default=None,
+        help="JSONL app-server capture to replay instead of the synthetic turn.",
+    )
+
+
+def transcript_from_args(args: argparse.Namespace) -> list[JsonObject]:
+    if args.transcript is not None:
+        return load_transcript(args.transcript)
+    return synthetic_turn()
@@ -0,0 +1,93 @@
+"""JSON encode/decode cost per app-server message for each available codec.
+
+"json.loads + dict()" and "json.dumps + encode" are the transport's previous
+stdlib path, including the redundant `dict()` copy after decoding. Each codec row
+decodes the transcript as newline-terminated stdio lines and encodes it back.
+Codecs whose optional package is not installed are skipped.
+
+Run from the repository root:
+
+    uv run python -m benchmarks.json_codec
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from functools import partial
+
+from benchmarks._harness import best_of, report
+from benchmarks._recorded_turn import JsonObject, add_transcript_argument, transcript_from_args
+from codex.app_server._json_codec import (
+    JsonCodec,
+    MsgspecJsonCodec,
+    OrjsonCodec,
+    StdlibJsonCodec,
+)
+from codex.app_server.errors import AppServerConnectionError
+
+
+def _previous_decode(lines: list[bytes]) -> None:
+    for line in lines:
+        dict(json.loads(line))
+
+
+def _previous_encode(messages: list[JsonObject]) -> None:
+    for message in messages:
+        (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _decode(codec: JsonCodec, lines: list[bytes]) -> None:
+    for line in lines:
+        codec.decode(line)
+
+
+def _encode(codec: JsonCodec, messages: list[JsonObject]) -> None:
+    for message in messages:
+        codec.encode(message) + b"\n"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_transcript_argument(parser)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    messages = transcript_from_args(args)
+    lines = [json.dumps(message).encode("utf-8") + b"\n" for message in messages]
+    count = len(messages)
+
+    print(f"{count} messages per run, best of {args.repeat}")
+    report(
+        "decode: json.loads + dict()",
+        count,
+        best_of(partial(_previous_decode, lines), repeat=args.repeat),
+    )
+    report(
+        "encode: json.dumps + encode",
+        count,
+        best_of(partial(_previous_encode, messages), repeat=args.repeat),
+    )
+    for name, codec_type in [
+        ("stdlib", StdlibJsonCodec),
+        ("orjson", OrjsonCodec),
+        ("msgspec", MsgspecJsonCodec),
+    ]:
+        try:
+            codec: JsonCodec = codec_type()
+        except AppServerConnectionError:
+            print(f"{name}: not installed, skipped")
+            continue
+        report(
+            f"decode: {name}",
+            count,
+            best_of(partial(_decode, codec, lines), repeat=args.repeat),
+        )
+        report(
+            f"encode: {name}",
+            count,
+            best_of(partial(_encode, codec, messages), repeat=args.repeat),
+        )
+
+
+if __name__ == "__main__":
+    main()
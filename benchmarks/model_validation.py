@@ -0,0 +1,146 @@
+"""Model-building cost for item-heavy turns under each `validation` mode.
+
+An item-heavy turn is mostly `item/started` / `item/completed` notifications for
+command executions, file changes, and agent messages, followed by a `thread/read`
+of the whole history. "full" validates every payload, trying each `ThreadItem`
+variant in turn. "lazy" picks the variant from the item's `type` tag and validates
+only that one. "trusted" assembles the picked variant without validating it.
+
+Run from the repository root:
+
+    uv run python -m benchmarks.model_validation
+"""
+
+from __future__ import annotations
+
+import argparse
+from functools import partial
+
+from benchmarks._harness import best_of, report
+from benchmarks._recorded_turn import JsonObject, add_transcript_argument, load_transcript
+from codex.app_server._protocol_helpers import parse_notification, parse_result
+from codex.app_server.options import ProtocolValidationMode
+from codex.protocol import types as protocol
+
+_MODES: tuple[ProtocolValidationMode, ...] = ("full", "lazy", "trusted")
+
+
+def _items(count: int) -> list[JsonObject]:
+    items: list[JsonObject] = []
+    for index in range(count):
+        kind = index % 3
+        if kind == 0:
+            items.append(
+                {
+                    "id": f"cmd-{index}",
+                    "type": "commandExecution",
+                    "command": "rg -n needle src",
+                    "commandActions": [
+                        {"type": "search", "command": "rg", "query": "needle", "path": "src"}
+                    ],
+                    "cwd": "/repo",
+                    "status": "completed",
+                    "aggregatedOutput": "src/a.py:1:needle\n" * 20,
+                    "exitCode": 0,
+                    "durationMs": 12,
+                }
+            )
+        elif kind == 1:
+            items.append(
+                {
+                    "id": f"patch-{index}",
+                    "type": "fileChange",
+                    "status": "completed",
+                    "changes": [
+                        {"path": "src/a.py", "diff": "+needle\n", "kind": {"type": "update"}},
+                        {"path": "src/b.py", "diff": "+b\n", "kind": {"type": "add"}},
+                    ],
+                }
+            )
+        else:
+            items.append(
+                {
+                    "id": f"msg-{index}",
+                    "type": "agentMessage",
+                    "phase": "commentary",
+                    "text": f"Step {index} done.",
+                }
+            )
+    return items
+
+
+def _notifications(items: list[JsonObject]) -> list[JsonObject]:
+    scope = {"threadId": "thr-1", "turnId": "turn-1"}
+    messages: list[JsonObject] = []
+    for item in items:
+        messages.append(
+            {"method": "item/started", "params": {**scope, "startedAtMs": 1, "item": item}}
+        )
+        messages.append(
+            {"method": "item/completed", "params": {**scope, "completedAtMs": 2, "item": item}}
+        )
+    return messages
+
+
+def _thread_read(items: list[JsonObject], turns: int) -> JsonObject:
+    per_turn = max(1, len(items) // turns)
+    return {
+        "thread": {
+            "id": "thr-1",
+            "sessionId": "session-1",
+            "preview": "",
+            "ephemeral": False,
+            "modelProvider": "openai",
+            "createdAt": 1730910000,
+            "updatedAt": 1730910000,
+            "cwd": "/repo",
+            "cliVersion": "1.0.0",
+            "source": "appServer",
+            "status": {"type": "idle"},
+            "turns": [
+                {
+                    "id": f"turn-{index}",
+                    "status": "completed",
+                    "items": items[index * per_turn : (index + 1) * per_turn],
+                    "error": None,
+                }
+                for index in range(turns)
+            ],
+        }
+    }
+
+
+def _parse_notifications(messages: list[JsonObject], mode: ProtocolValidationMode) -> None:
+    for message in messages:
+        parse_notification(message, strict=False, validation=mode)
+
+
+def _parse_thread(result: JsonObject, mode: ProtocolValidationMode) -> None:
+    parse_result(result, protocol.ThreadReadResponse, validation=mode)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_transcript_argument(parser)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--items", type=int, default=3_000)
+    parser.add_argument("--turns", type=int, default=50)
+    args = parser.parse_args()
+    items = _items(args.items)
+    messages = (
+        load_transcript(args.transcript) if args.transcript is not None else _notifications(items)
+    )
+    thread = _thread_read(items, args.turns)
+
+    print(f"{len(messages)} notifications per run, best of {args.repeat}")
+    for mode in _MODES:
+        seconds = best_of(partial(_parse_notifications, messages, mode), repeat=args.repeat)
+        report(f"notifications, validation={mode!r}", len(messages), seconds)
+    print(f"thread/read with {args.items} items in {args.turns} turns, best of {args.repeat}")
+    for mode in _MODES:
+        seconds = best_of(partial(_parse_thread, thread, mode), repeat=args.repeat)
+        report(f"thread/read, validation={mode!r}", args.items, seconds, unit="item")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Notifications/sec for the session notification path, before and after method dispatch.
+
+Run from the repository root:
+
+    uv run python -m benchmarks.notification_parsing
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from benchmarks._harness import best_of, report
+from benchmarks._recorded_turn import JsonObject, add_transcript_argument, transcript_from_args
+from codex.app_server._async_threads import _TURN_STREAM_NOTIFICATION_METHODS
+from codex.app_server._protocol_helpers import parse_notification
+from codex.app_server._session import _AsyncSession
+from codex.app_server.options import AppServerInitializeOptions
+from codex.protocol import types as protocol
+
+
+class _NullTransport:
+    async def start(self) -> None:
+        return None
+
+    async def send(self, message: JsonObject) -> None:
+        _ = message
+
+    async def receive(self) -> JsonObject | None:
+        return None
+
+    async def close(self) -> None:
+        return None
+
+
+def _legacy_union_parse(messages: list[JsonObject]) -> None:
+    for message in messages:
+        protocol.ServerNotification.model_validate(message)
+
+
+def _dispatch_parse(messages: list[JsonObject]) -> None:
+    for message in messages:
+        parse_notification(message, strict=False)
+
+
+def _broadcast(
+    messages: list[JsonObject], *, subscribed: bool, compact_deltas: bool = False
+) -> None:
+    async def scenario() -> None:
+        session = _AsyncSession(
+            _NullTransport(), AppServerInitializeOptions(compact_deltas=compact_deltas)
+        )
+        subscription = (
+            session.subscribe_notifications(_TURN_STREAM_NOTIFICATION_METHODS)
+            if subscribed
+            else session.subscribe_notifications({"account/updated"})
+        )
+        for message in messages:
+            await session._broadcast_notification(message)
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+
+    asyncio.run(scenario())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_transcript_argument(parser)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    messages = transcript_from_args(args)
+    count = len(messages)
+
+    print(f"{count} notifications per run, best of {args.repeat}")
+    report(
+        "before: ServerNotification union validation",
+        count,
+        best_of(lambda: _legacy_union_parse(messages), repeat=args.repeat),
+    )
+    report(
+        "after: method-keyed model validation",
+        count,
+        best_of(lambda: _dispatch_parse(messages), repeat=args.repeat),
+    )
+    report(
+        "session broadcast, turn subscriber",
+        count,
+        best_of(lambda: _broadcast(messages, subscribed=True), repeat=args.repeat),
+    )
+    report(
+        "session broadcast, compact deltas",
+        count,
+        best_of(
+            lambda: _broadcast(messages, subscribed=True, compact_deltas=True),
+            repeat=args.repeat,
+        ),
+    )
+    report(
+        "session broadcast, no interested subscriber",
+        count,
+        best_of(lambda: _broadcast(messages, subscribed=False), repeat=args.repeat),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Notification routing cost as the number of concurrent turn streams grows.
+
+Each active sink follows its own `(threadId, turnId)` like a turn stream does; the
+replayed transcript belongs to exactly one of them. "predicate scan" visits every
+sink and filters with a scope predicate, which is how turn streams were routed
+before the index. "scoped index" registers the same sinks by scope.
+
+Run from the repository root:
+
+    uv run python -m benchmarks.notification_routing
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable
+from functools import partial
+
+from benchmarks._harness import best_of, report
+from benchmarks._recorded_turn import JsonObject, add_transcript_argument, transcript_from_args
+from benchmarks.notification_parsing import _NullTransport
+from codex.app_server._async_threads import _TURN_STREAM_NOTIFICATION_METHODS
+from codex.app_server._protocol_helpers import (
+    Notification,
+    extract_thread_id,
+    extract_turn_id,
+    method_name,
+)
+from codex.app_server._session import _AsyncSession
+from codex.app_server.options import AppServerInitializeOptions
+
+_SINK_COUNTS = (1, 100, 1000)
+
+
+def _scope_predicate(thread_id: str, turn_id: str) -> Callable[[Notification], bool]:
+    def predicate(notification: Notification) -> bool:
+        if extract_thread_id(notification) != thread_id:
+            return False
+        if method_name(notification) == "thread/tokenUsage/updated":
+            return True
+        return extract_turn_id(notification) == turn_id
+
+    return predicate
+
+
+def _scope_of(messages: list[JsonObject]) -> tuple[str, str]:
+    for message in messages:
+        params = message.get("params")
+        if isinstance(params, dict) and isinstance(params.get("turnId"), str):
+            return params["threadId"], params["turnId"]
+    raise SystemExit("transcript has no turn-scoped notifications")
+
+
+def _route(messages: list[JsonObject], sinks: int, *, indexed: bool) -> None:
+    thread_id, turn_id = _scope_of(messages)
+
+    async def scenario() -> None:
+        session = _AsyncSession(_NullTransport(), AppServerInitializeOptions())
+        scopes = [(f"{thread_id}-idle-{index}", turn_id) for index in range(sinks - 1)]
+        scopes.append((thread_id, turn_id))
+        subscriptions = [
+            session.subscribe_notifications(_TURN_STREAM_NOTIFICATION_METHODS, scope=scope)
+            if indexed
+            else session.subscribe_notifications(
+                _TURN_STREAM_NOTIFICATION_METHODS,
+                predicate=_scope_predicate(*scope),
+            )
+            for scope in scopes
+        ]
+        for message in messages:
+            await session._broadcast_notification(message)
+        active = subscriptions[-1]
+        assert active.queue.qsize() == len(messages)
+
+    asyncio.run(scenario())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_transcript_argument(parser)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    messages = transcript_from_args(args)
+    count = len(messages)
+
+    print(f"{count} notifications per run, best of {args.repeat}")
+    for sinks in _SINK_COUNTS:
+        report(
+            f"predicate scan, {sinks} active sinks",
+            count,
+            best_of(partial(_route, messages, sinks, indexed=False), repeat=args.repeat),
+        )
+        report(
+            f"scoped index, {sinks} active sinks",
+            count,
+            best_of(partial(_route, messages, sinks, indexed=True), repeat=args.repeat),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Stdout framing and decode cost per app-server message.
+
+"readline()" is the previous path: `StreamReader.readline()` allocates a bytes
+object per line, which is then decoded. "buffered framer" is the transport's
+`_LineFramer`, which reads large chunks into one reusable buffer and decodes each
+message in place through a `memoryview`. The transcript is followed by
+`--large-items` `item/completed` messages carrying `--large-kib` of command output.
+
+Run from the repository root:
+
+    uv run python -m benchmarks.stdio_framing
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from functools import partial
+
+from benchmarks._harness import best_of, report
+from benchmarks._recorded_turn import JsonObject, add_transcript_argument, transcript_from_args
+from codex.app_server._json_codec import StdlibJsonCodec
+from codex.app_server.transports import STDIO_STREAM_LIMIT_BYTES, _decode_message, _LineFramer
+
+
+def _stdout_bytes(messages: list[JsonObject], large_items: int, large_kib: int) -> bytes:
+    output = "x" * (large_kib * 1024)
+    large: list[JsonObject] = [
+        {
+            "method": "item/completed",
+            "params": {
+                "threadId": "thr-1",
+                "turnId": "turn-1",
+                "item": {"id": f"cmd-{index}", "type": "commandExecution", "output": output},
+            },
+        }
+        for index in range(large_items)
+    ]
+    return b"".join(json.dumps(message).encode() + b"\n" for message in [*messages, *large])
+
+
+def _reader(data: bytes) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader(limit=STDIO_STREAM_LIMIT_BYTES)
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+def _readline(data: bytes) -> None:
+    async def scenario() -> None:
+        reader = _reader(data)
+        while line := await reader.readline():
+            dict(json.loads(line))
+
+    asyncio.run(scenario())
+
+
+def _framer(data: bytes) -> None:
+    codec = StdlibJsonCodec()
+
+    async def scenario() -> None:
+        framer = _LineFramer(_reader(data), max_line_bytes=None)
+        while (bounds := await framer.next_line()) is not None:
+            with framer.view(*bounds) as line:
+                _decode_message(codec, line, "decode failed")
+
+    asyncio.run(scenario())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_transcript_argument(parser)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--large-items", type=int, default=20)
+    parser.add_argument("--large-kib", type=int, default=512)
+    args = parser.parse_args()
+    messages = transcript_from_args(args)
+    data = _stdout_bytes(messages, args.large_items, args.large_kib)
+    count = len(messages) + args.large_items
+
+    print(f"{count} messages ({len(data) / 1024 / 1024:.1f} MiB) per run, best of {args.repeat}")
+    report("readline()", count, best_of(partial(_readline, data), repeat=args.repeat))
+    report("buffered framer", count, best_of(partial(_framer, data), repeat=args.repeat))
+
+
+if __name__ == "__main__":
+    main()
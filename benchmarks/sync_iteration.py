@@ -0,0 +1,102 @@
+"""Per-event overhead of consuming notifications from the sync client.
+
+The notifications are already buffered on the loop thread, so the numbers isolate
+the cost of handing them to the calling thread:
+
+- "per-item round trip" is the previous sync path: one `run_coroutine_threadsafe`
+  future per notification.
+- "buffered next()" is `NotificationSubscription.__next__`, which drains whatever
+  is ready in one round trip and serves the rest locally.
+- "iter_batches()" yields the same notifications in lists.
+
+Run from the repository root:
+
+    uv run python -m benchmarks.sync_iteration
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Callable
+
+from benchmarks._harness import report
+from benchmarks._recorded_turn import JsonObject, add_transcript_argument, transcript_from_args
+from benchmarks.notification_parsing import _NullTransport
+from codex.app_server._session import _AsyncNotificationSubscription, _AsyncSession
+from codex.app_server._sync_client import _LoopThread
+from codex.app_server._sync_threads import NotificationSubscription
+
+
+def _filled_subscription(
+    loop: _LoopThread,
+    messages: list[JsonObject],
+) -> _AsyncNotificationSubscription:
+    async def fill() -> _AsyncNotificationSubscription:
+        session = _AsyncSession(_NullTransport())
+        subscription = session.subscribe_notifications()
+        for message in messages:
+            await session._broadcast_notification(message)
+        subscription.queue.put_control(None)
+        return subscription
+
+    return loop.run(fill())
+
+
+def _per_item(loop: _LoopThread, subscription: _AsyncNotificationSubscription) -> None:
+    while True:
+        try:
+            loop.run(subscription.next())
+        except StopAsyncIteration:
+            return
+
+
+def _buffered_next(loop: _LoopThread, subscription: _AsyncNotificationSubscription) -> None:
+    for _ in NotificationSubscription(subscription, loop.run):
+        pass
+
+
+def _batches(loop: _LoopThread, subscription: _AsyncNotificationSubscription) -> None:
+    sync_subscription = NotificationSubscription(subscription, loop.run)
+    for _ in sync_subscription.iter_batches(max_items=256, max_latency=0.0):
+        pass
+
+
+def _best_consume(
+    loop: _LoopThread,
+    messages: list[JsonObject],
+    consume: Callable[[_LoopThread, _AsyncNotificationSubscription], None],
+    repeat: int,
+) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        subscription = _filled_subscription(loop, messages)
+        started = time.perf_counter()
+        consume(loop, subscription)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_transcript_argument(parser)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    messages = transcript_from_args(args)
+    count = len(messages)
+
+    loop = _LoopThread()
+    try:
+        print(f"{count} notifications per run, best of {args.repeat}")
+        for label, consume in [
+            ("per-item round trip", _per_item),
+            ("buffered next()", _buffered_next),
+            ("iter_batches()", _batches),
+        ]:
+            report(label, count, _best_consume(loop, messages, consume, args.repeat))
+    finally:
+        loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from codex.codex import Codex
+from codex.codex import Codex, CodexStartupTimings
 from codex.dynamic_tools import dynamic_tool
 from codex.errors import CodexError, CodexExecError, CodexParseError, ThreadRunError
 from codex.options import (
@@ -11,16 +11,21 @@ from codex.options import (
     CodexConfigObject,
     CodexConfigValue,
     CodexOptions,
+    CodexPoolOptions,
     ThreadResumeOptions,
     ThreadStartOptions,
     TurnOptions,
 )
+from codex.pool import AsyncCodexPool, CodexPool
 from codex.thread import CodexTurnStream, Input, Thread
 
 __version__ = "1.145.0"
 
 __all__ = [
     "Codex",
+    "CodexStartupTimings",
+    "CodexPool",
+    "AsyncCodexPool",
     "CodexTurnStream",
     "Thread",
     "Input",
@@ -30,6 +35,7 @@ __all__ = [
     "CodexParseError",
     "ThreadRunError",
     "CodexOptions",
+    "CodexPoolOptions",
     "ThreadStartOptions",
     "ThreadResumeOptions",
     "TurnOptions",
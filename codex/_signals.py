@@ -0,0 +1,181 @@
+"""Process-wide cancel-signal watching for `Codex` turn streams."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from codex.options import CancelSignal, SupportsAborted, SupportsIsSet
+
+_POLL_INTERVAL_SECONDS = 0.05
+_CALLBACK_WORKERS = 4
+
+
+def is_signal_aborted(signal: CancelSignal | None) -> bool:
+    if signal is None:
+        return False
+    if isinstance(signal, SupportsAborted):
+        return signal.aborted
+    if isinstance(signal, SupportsIsSet):
+        return bool(signal.is_set())
+    raise TypeError("signal must expose `aborted` or `is_set()`")
+
+
+class _SignalWatch:
+    """Registration handle returned by `_SignalWatchService.watch()`."""
+
+    def __init__(self, group: _SignalGroup, callback: Callable[[], None]) -> None:
+        self._group = group
+        self._callback = callback
+
+    def cancel(self) -> None:
+        self._group.service._unwatch(self)
+
+
+class _SignalGroup:
+    """Every watch registered for one signal object, sharing a single waiter."""
+
+    def __init__(self, service: _SignalWatchService, signal: CancelSignal) -> None:
+        self.service = service
+        self.signal = signal
+        self.watches: set[_SignalWatch] = set()
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.task: asyncio.Task[None] | None = None
+
+
+class _SignalWatchService:
+    """Fire callbacks when cancel signals are set, without a polling thread per turn.
+
+    Watches on the same signal object share one waiter:
+
+    - `asyncio.Event` bound to a running loop: one task on that loop.
+    - anything else exposing `aborted` or `is_set()`, `threading.Event` included: a
+      single shared thread polls every such signal every 50 ms, and stops once none
+      is watched.
+
+    Callbacks run on a small worker pool so a slow callback never delays another
+    signal.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._groups: dict[int, _SignalGroup] = {}
+        self._polled: dict[int, _SignalGroup] = {}
+        self._poller: threading.Thread | None = None
+        self._callbacks: ThreadPoolExecutor | None = None
+
+    def watch(self, signal: CancelSignal, callback: Callable[[], None]) -> _SignalWatch:
+        """Call `callback` once, off the caller's thread, when `signal` is set."""
+        with self._lock:
+            group = self._groups.get(id(signal))
+            is_new = group is None
+            if group is None:
+                group = self._groups[id(signal)] = _SignalGroup(self, signal)
+            watch = _SignalWatch(group, callback)
+            group.watches.add(watch)
+        if is_new:
+            self._start_waiter(group)
+        return watch
+
+    def _unwatch(self, watch: _SignalWatch) -> None:
+        group = watch._group
+        with self._lock:
+            group.watches.discard(watch)
+            if group.watches or self._groups.get(id(group.signal)) is not group:
+                return
+            del self._groups[id(group.signal)]
+            self._polled.pop(id(group.signal), None)
+        self._stop_async_waiter(group)
+
+    def _start_waiter(self, group: _SignalGroup) -> None:
+        signal = group.signal
+        loop = _bound_running_loop(signal)
+        if isinstance(signal, asyncio.Event) and loop is not None:
+            group.loop = loop
+            loop.call_soon_threadsafe(self._start_async_waiter, group, signal)
+            return
+        with self._lock:
+            if self._groups.get(id(signal)) is group:
+                self._polled[id(signal)] = group
+            if self._poller is None:
+                self._poller = threading.Thread(
+                    target=self._poll,
+                    name="codex-turn-signal-poller",
+                    daemon=True,
+                )
+                self._poller.start()
+
+    def _start_async_waiter(self, group: _SignalGroup, event: asyncio.Event) -> None:
+        if not self._is_watched(group):
+            return
+
+        async def wait() -> None:
+            await event.wait()
+            self._fire(group)
+
+        group.task = asyncio.get_running_loop().create_task(wait())
+
+    def _stop_async_waiter(self, group: _SignalGroup) -> None:
+        if group.loop is None:
+            return
+
+        def cancel() -> None:
+            if group.task is not None:
+                group.task.cancel()
+
+        try:
+            group.loop.call_soon_threadsafe(cancel)
+        except RuntimeError:
+            pass  # The signal's loop is already closed.
+
+    def _poll(self) -> None:
+        while True:
+            with self._lock:
+                groups = list(self._polled.values())
+                if not groups:
+                    self._poller = None
+                    return
+            for group in groups:
+                if is_signal_aborted(group.signal):
+                    self._fire(group)
+            time.sleep(_POLL_INTERVAL_SECONDS)
+
+    def _is_watched(self, group: _SignalGroup) -> bool:
+        with self._lock:
+            return self._groups.get(id(group.signal)) is group
+
+    def _fire(self, group: _SignalGroup) -> None:
+        with self._lock:
+            if self._groups.get(id(group.signal)) is not group:
+                return
+            del self._groups[id(group.signal)]
+            self._polled.pop(id(group.signal), None)
+            watches = list(group.watches)
+            group.watches.clear()
+            if self._callbacks is None:
+                self._callbacks = ThreadPoolExecutor(
+                    max_workers=_CALLBACK_WORKERS,
+                    thread_name_prefix="codex-turn-interrupt",
+                )
+            callbacks = self._callbacks
+        for watch in watches:
+            callbacks.submit(watch._callback)
+
+
+def _bound_running_loop(signal: object) -> asyncio.AbstractEventLoop | None:
+    # asyncio primitives bind to a loop on first use; only that loop may wait on them.
+    loop = getattr(signal, "_loop", None)
+    if isinstance(loop, asyncio.AbstractEventLoop) and loop.is_running():
+        return loop
+    return None
+
+
+_service = _SignalWatchService()
+
+
+def signal_watch_service() -> _SignalWatchService:
+    """Return the process-wide watcher shared by every `Codex` turn stream."""
+    return _service
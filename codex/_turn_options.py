@@ -1,4 +1,4 @@
-"""Shared turn-option helpers for structured-output runs."""
+"""Shared turn-option helpers for structured-output and final-text runs."""
 
 from __future__ import annotations
 
@@ -26,3 +26,13 @@ def with_model_output_schema(
             )
         }
     )
+
+
+def without_text_deltas(options: AppServerTurnOptions | None) -> AppServerTurnOptions:
+    """Configure deltas for runs that only hand back the final text or model.
+
+    The stream is never exposed, so deltas are neither retained nor built as protocol models.
+    """
+    return (options or AppServerTurnOptions()).model_copy(
+        update={"retain_text_deltas": False, "compact_deltas": True}
+    )
@@ -3,6 +3,20 @@ from __future__ import annotations
 from codex._config_types import CodexConfig
 from codex.app_server._async_client import AsyncAppServerClient, AsyncRpcClient
 from codex.app_server._async_threads import AsyncAppServerThread, AsyncTurnStream
+from codex.app_server._broker import AppServerBroker
+from codex.app_server._deadline import deadline
+from codex.app_server._delta_events import (
+    AgentMessageDeltaEvent,
+    CommandOutputDeltaEvent,
+    DeltaEvent,
+    ReasoningTextDeltaEvent,
+)
+from codex.app_server._fan_out import MappedTurn
+from codex.app_server._fs_sync import FsSyncResult
+from codex.app_server._incremental_json import IncrementalJsonParser
+from codex.app_server._json_codec import JsonCodec
+from codex.app_server._response_cache import AppServerCacheStats
+from codex.app_server._session import AppServerRequestStats, AppServerStartupTimings
 from codex.app_server._sync_client import AppServerClient, RpcClient
 from codex.app_server._sync_threads import AppServerThread, TurnStream
 from codex.app_server.errors import (
@@ -11,12 +25,17 @@ from codex.app_server.errors import (
     AppServerError,
     AppServerProtocolError,
     AppServerRpcError,
+    AppServerTimeoutError,
     AppServerTurnError,
 )
 from codex.app_server.options import (
+    DEFAULT_COALESCE_METHODS,
+    AppServerCacheOptions,
     AppServerClientInfo,
     AppServerInitializeOptions,
     AppServerProcessOptions,
+    AppServerReconnectOptions,
+    AppServerSocketOptions,
     AppServerThreadForkOptions,
     AppServerThreadListOptions,
     AppServerThreadResumeOptions,
@@ -31,7 +50,17 @@ __all__ = [
     "AsyncAppServerThread",
     "AsyncRpcClient",
     "AsyncTurnStream",
+    "MappedTurn",
+    "FsSyncResult",
+    "DeltaEvent",
+    "AgentMessageDeltaEvent",
+    "CommandOutputDeltaEvent",
+    "ReasoningTextDeltaEvent",
+    "IncrementalJsonParser",
+    "JsonCodec",
+    "AppServerBroker",
     "AppServerClient",
+    "deadline",
     "dynamic_tool",
     "AppServerThread",
     "RpcClient",
@@ -41,15 +70,23 @@ __all__ = [
     "AppServerError",
     "AppServerProtocolError",
     "AppServerRpcError",
+    "AppServerTimeoutError",
     "AppServerTurnError",
     "AppServerClientInfo",
+    "AppServerCacheStats",
+    "AppServerRequestStats",
+    "AppServerStartupTimings",
     "CodexConfig",
     "AppServerInitializeOptions",
     "AppServerProcessOptions",
     "AppServerWebSocketOptions",
+    "AppServerReconnectOptions",
+    "AppServerCacheOptions",
+    "AppServerSocketOptions",
     "AppServerTurnOptions",
     "AppServerThreadStartOptions",
     "AppServerThreadResumeOptions",
     "AppServerThreadForkOptions",
     "AppServerThreadListOptions",
+    "DEFAULT_COALESCE_METHODS",
 ]
@@ -2,7 +2,18 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable, Collection, Mapping
+import os
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Collection,
+    Iterable,
+    Mapping,
+    Sequence,
+)
+from contextlib import suppress
 from typing import TypeVar, cast
 
 from pydantic import BaseModel
@@ -24,9 +35,20 @@ from codex.app_server._async_services import (
 from codex.app_server._async_threads import AsyncAppServerThread as AsyncAppServerThread
 from codex.app_server._async_threads import AsyncTurnStream as AsyncTurnStream
 from codex.app_server._async_threads import _ThreadClient
+from codex.app_server._fan_out import MappedTurn, map_turns
+from codex.app_server._pagination import DEFAULT_PREFETCH, iter_pages
+from codex.app_server._payloads import TurnInput
 from codex.app_server._protocol_helpers import Notification, RequestHandler
-from codex.app_server._session import _AsyncNotificationSubscription, _AsyncSession
+from codex.app_server._response_cache import AppServerCacheStats
+from codex.app_server._session import (
+    AppServerRequestStats,
+    AppServerStartupTimings,
+    _AsyncNotificationSubscription,
+    _AsyncSession,
+)
+from codex.app_server.errors import AppServerRpcError
 from codex.app_server.models import (
+    EmptyResult,
     InitializeResult,
     LoadedThreadsResult,
     ThreadResult,
@@ -34,14 +56,20 @@ from codex.app_server.models import (
 from codex.app_server.options import (
     AppServerInitializeOptions,
     AppServerProcessOptions,
+    AppServerReconnectOptions,
+    AppServerSocketOptions,
     AppServerThreadListOptions,
     AppServerThreadResumeOptions,
     AppServerThreadStartOptions,
+    AppServerTurnOptions,
     AppServerWebSocketOptions,
+    NotificationOverflowPolicy,
 )
 from codex.app_server.transports import (
     AsyncMessageTransport,
     AsyncStdioTransport,
+    AsyncTcpTransport,
+    AsyncUnixSocketTransport,
     AsyncWebSocketTransport,
 )
 from codex.dynamic_tools import _DynamicToolRuntime, merge_dynamic_tool_specs, resolve_dynamic_tools
@@ -70,16 +98,21 @@ class AsyncRpcClient:
         self,
         method: str,
         params: BaseModel | Mapping[str, object] | None = None,
+        *,
+        timeout: float | None = None,
     ) -> object:
-        return await self._session.request(method, params)
+        """Send a raw request; `timeout` overrides the connection's `request_timeout`."""
+        return await self._session.request(method, params, timeout=timeout)
 
     async def request_typed(
         self,
         method: str,
         params: BaseModel | Mapping[str, object] | None,
         result_model: type[_ModelT],
+        *,
+        timeout: float | None = None,
     ) -> _ModelT:
-        return await self._session.request_typed(method, params, result_model)
+        return await self._session.request_typed(method, params, result_model, timeout=timeout)
 
     async def notify(
         self,
@@ -105,8 +138,20 @@ class AsyncEventsClient:
     def __init__(self, session: _AsyncSession) -> None:
         self._session = session
 
-    def subscribe(self, methods: Collection[str] | None = None) -> _AsyncNotificationSubscription:
-        return self._session.subscribe_notifications(methods)
+    def subscribe(
+        self,
+        methods: Collection[str] | None = None,
+        *,
+        maxsize: int | None = None,
+        overflow: NotificationOverflowPolicy | None = None,
+    ) -> _AsyncNotificationSubscription:
+        """Subscribe to notifications, optionally bounding the subscription buffer.
+
+        `maxsize` and `overflow` default to the connection-wide
+        `AppServerInitializeOptions.notification_queue_maxsize` and
+        `notification_overflow` settings.
+        """
+        return self._session.subscribe_notifications(methods, maxsize=maxsize, overflow=overflow)
 
     def subscribe_command_exec_output(self, process_id: str) -> _AsyncNotificationSubscription:
         """Subscribe to `command/exec/outputDelta` notifications for one process id."""
@@ -145,9 +190,14 @@ class AsyncAppServerClient:
         self,
         transport: AsyncMessageTransport,
         initialize_options: AppServerInitializeOptions | None = None,
+        *,
+        reconnect: AppServerReconnectOptions | None = None,
     ) -> None:
-        self._session = _AsyncSession(transport, initialize_options)
-        self._dynamic_tools = _DynamicToolRuntime(self._session.on_request)
+        self._session = _AsyncSession(transport, initialize_options, reconnect=reconnect)
+        self._dynamic_tools = _DynamicToolRuntime(
+            self._session.on_request,
+            run_blocking=self._session.run_blocking,
+        )
         self.rpc = AsyncRpcClient(self._session, self._dynamic_tools)
         self.events = AsyncEventsClient(self._session)
         self.models = AsyncModelsClient(self.rpc)
@@ -182,7 +232,44 @@ class AsyncAppServerClient:
         initialize_options: AppServerInitializeOptions | None = None,
     ) -> AsyncAppServerClient:
         """Connect to an app-server websocket endpoint and initialize the session."""
-        client = cls(AsyncWebSocketTransport(url, websocket_options), initialize_options)
+        client = cls(
+            AsyncWebSocketTransport(url, websocket_options),
+            initialize_options,
+            reconnect=None if websocket_options is None else websocket_options.reconnect,
+        )
+        await client.start()
+        return client
+
+    @classmethod
+    async def connect_unix_socket(
+        cls,
+        path: str | os.PathLike[str],
+        socket_options: AppServerSocketOptions | None = None,
+        initialize_options: AppServerInitializeOptions | None = None,
+    ) -> AsyncAppServerClient:
+        """Connect to an app-server or `AppServerBroker` Unix socket and initialize the session."""
+        client = cls(
+            AsyncUnixSocketTransport(path, socket_options),
+            initialize_options,
+            reconnect=None if socket_options is None else socket_options.reconnect,
+        )
+        await client.start()
+        return client
+
+    @classmethod
+    async def connect_tcp(
+        cls,
+        host: str,
+        port: int,
+        socket_options: AppServerSocketOptions | None = None,
+        initialize_options: AppServerInitializeOptions | None = None,
+    ) -> AsyncAppServerClient:
+        """Connect to an app-server or `AppServerBroker` TCP port and initialize the session."""
+        client = cls(
+            AsyncTcpTransport(host, port, socket_options),
+            initialize_options,
+            reconnect=None if socket_options is None else socket_options.reconnect,
+        )
         await client.start()
         return client
 
@@ -194,12 +281,51 @@ class AsyncAppServerClient:
         _ = (exc_type, exc, tb)
         await self.close()
 
+    @property
+    def connected(self) -> bool:
+        """Whether the session is initialized and its connection is still being read."""
+        return self._session.connected
+
+    @property
+    def request_stats(self) -> AppServerRequestStats:
+        """Counts of requests sent, failed, timed out, and still pending on this connection."""
+        return self._session.request_stats
+
+    @property
+    def cache_stats(self) -> AppServerCacheStats | None:
+        """Hit, miss, and eviction counts of the response cache, or None when it is off."""
+        return self._session.cache_stats
+
+    def invalidate_cache(self, methods: str | Collection[str] | None = None) -> int:
+        """Drop cached results for `methods`, or all of them, and return how many were dropped."""
+        return self._session.invalidate_cache((methods,) if isinstance(methods, str) else methods)
+
+    @property
+    def startup_timings(self) -> AppServerStartupTimings | None:
+        """Transport and handshake durations from `start()`, or None before it completes."""
+        return self._session.startup_timings
+
     async def start(self) -> InitializeResult:
         return await self._session.start()
 
     async def close(self) -> None:
         await self._session.close()
 
+    async def _release_threads(self) -> None:
+        """Unsubscribe from every loaded thread and drop its dynamic tools.
+
+        Pools call this when a connection's last lease ends, so the next borrower
+        does not inherit threads, notifications, or tool handlers from the last one.
+        """
+        for thread_id in self._session.loaded_thread_ids():
+            self._dynamic_tools.deactivate(thread_id)
+            with suppress(AppServerRpcError):
+                await self.rpc.request_typed(
+                    "thread/unsubscribe",
+                    protocol.ThreadUnsubscribeParams(threadId=thread_id),
+                    EmptyResult,
+                )
+
     async def start_thread(
         self,
         options: AppServerThreadStartOptions | None = None,
@@ -269,10 +395,66 @@ class AsyncAppServerClient:
             protocol.ThreadListResponse,
         )
 
+    async def iter_threads(
+        self,
+        options: AppServerThreadListOptions | None = None,
+        *,
+        page_size: int | None = None,
+        prefetch: int = DEFAULT_PREFETCH,
+    ) -> AsyncIterator[protocol.Thread]:
+        """Yield every thread matching `options`, fetching pages as the caller advances.
+
+        Iteration starts at `options.cursor` and follows `nextCursor` to the last page.
+        `page_size` overrides `options.limit`, and up to `prefetch` pages are requested
+        ahead of the one being consumed.
+        """
+        options = options or AppServerThreadListOptions()
+        if page_size is not None:
+            options = options.model_copy(update={"limit": page_size})
+
+        def fetch(cursor: str | None) -> Awaitable[protocol.ThreadListResponse]:
+            return self.list_threads_page(options.model_copy(update={"cursor": cursor}))
+
+        async for page in iter_pages(fetch, cursor=options.cursor, prefetch=prefetch):
+            for thread in page.data:
+                yield thread
+
     async def loaded_thread_ids(self) -> list[str]:
         result = await self.rpc.request_typed("thread/loaded/list", {}, LoadedThreadsResult)
         return result.data
 
+    def map_turns(
+        self,
+        inputs: Iterable[TurnInput],
+        *,
+        concurrency: int = 8,
+        thread_options: AppServerThreadStartOptions | None = None,
+        turn_options: AppServerTurnOptions | None = None,
+        reuse_threads: bool = False,
+        ordered: bool = False,
+        connections: Sequence[AsyncAppServerClient] = (),
+    ) -> AsyncGenerator[MappedTurn]:
+        """Run one turn per input with at most `concurrency` turns in flight.
+
+        Results are yielded as turns finish, or in input order with `ordered=True`. A failed
+        thread start or turn is reported on its `MappedTurn.error` instead of stopping the
+        batch. Each of the `concurrency` workers starts a fresh thread per input, or keeps one
+        thread for all of its inputs with `reuse_threads=True` when inputs may share
+        conversation context. Each thread is unsubscribed once the worker is done with it.
+        Workers are spread round-robin over this client and any extra
+        `connections`, which must belong to the same event loop. `inputs` is consumed
+        lazily. Calling `aclose()` on the generator cancels the turns still running.
+        """
+        return map_turns(
+            [self, *connections],
+            inputs,
+            concurrency=concurrency,
+            thread_options=thread_options,
+            turn_options=turn_options,
+            reuse_threads=reuse_threads,
+            ordered=ordered,
+        )
+
     def on_request(
         self,
         method: str,
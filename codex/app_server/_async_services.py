@@ -1,14 +1,30 @@
 from __future__ import annotations
 
+import asyncio
 import base64
 import json
+import math
+import os
 import re
-from collections.abc import Mapping, Sequence
+import time
+import uuid
+from collections.abc import AsyncIterator, Awaitable, Mapping, Sequence
+from contextlib import suppress
 from typing import Any, Literal, Protocol, TypeVar
 
 from pydantic import BaseModel
 
+from codex.app_server._fs_sync import FsSyncResult, sync_tree
+from codex.app_server._pagination import DEFAULT_PREFETCH, iter_pages
 from codex.app_server._payloads import skill_input
+from codex.app_server._uploads import (
+    DEFAULT_UPLOAD_CHUNK_SIZE,
+    UploadProgress,
+    UploadSource,
+    encoded_chunks,
+    source_size,
+)
+from codex.app_server.errors import AppServerError, AppServerRpcError
 from codex.app_server.models import (
     AccountCancelLoginResult,
     AccountRateLimitsResult,
@@ -38,6 +54,9 @@ from codex.protocol import types as protocol
 
 _ModelT = TypeVar("_ModelT", bound=BaseModel)
 _CONFIG_BARE_KEY = re.compile(r"^[A-Za-z0-9_-]+$")
+# How long an upload retries its first stdin write while the server starts the process.
+_UPLOAD_START_SECONDS = 30.0
+_INVALID_REQUEST_CODE = -32600
 
 
 class _TypedRpcClient(Protocol):
@@ -46,6 +65,8 @@ class _TypedRpcClient(Protocol):
         method: str,
         params: BaseModel | Mapping[str, object] | None,
         result_model: type[_ModelT],
+        *,
+        timeout: float | None = None,
     ) -> _ModelT: ...
 
 
@@ -106,6 +127,23 @@ class AsyncModelsClient(_AsyncServiceClient):
         params = protocol.ModelListParams(cursor=cursor, includeHidden=include_hidden, limit=limit)
         return await self._rpc.request_typed("model/list", params, ModelListResult)
 
+    async def iter_all(
+        self,
+        *,
+        cursor: str | None = None,
+        include_hidden: bool | None = None,
+        page_size: int | None = None,
+        prefetch: int = DEFAULT_PREFETCH,
+    ) -> AsyncIterator[ModelInfo]:
+        """Yield models across every page, prefetching up to `prefetch` pages ahead."""
+
+        def fetch(cursor: str | None) -> Awaitable[ModelListResult]:
+            return self.list_page(cursor=cursor, include_hidden=include_hidden, limit=page_size)
+
+        async for page in iter_pages(fetch, cursor=cursor, prefetch=prefetch):
+            for model in page.data:
+                yield model
+
 
 class AsyncAppsClient(_AsyncServiceClient):
     async def list(
@@ -141,6 +179,29 @@ class AsyncAppsClient(_AsyncServiceClient):
         )
         return await self._rpc.request_typed("app/list", params, AppListResult)
 
+    async def iter_all(
+        self,
+        *,
+        cursor: str | None = None,
+        force_refetch: bool | None = None,
+        page_size: int | None = None,
+        thread_id: str | None = None,
+        prefetch: int = DEFAULT_PREFETCH,
+    ) -> AsyncIterator[protocol.AppInfo]:
+        """Yield apps across every page, prefetching up to `prefetch` pages ahead."""
+
+        def fetch(cursor: str | None) -> Awaitable[AppListResult]:
+            return self.list_page(
+                cursor=cursor,
+                force_refetch=force_refetch,
+                limit=page_size,
+                thread_id=thread_id,
+            )
+
+        async for page in iter_pages(fetch, cursor=cursor, prefetch=prefetch):
+            for app in page.data:
+                yield app
+
 
 class AsyncFsClient(_AsyncServiceClient):
     async def create_directory(
@@ -177,6 +238,194 @@ class AsyncFsClient(_AsyncServiceClient):
             protocol.FsWriteFileResponse,
         )
 
+    async def upload(
+        self,
+        *,
+        path: str,
+        source: UploadSource,
+        chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE,
+        progress: UploadProgress | None = None,
+        sandbox_policy: protocol.SandboxPolicy | None = None,
+    ) -> int:
+        """Write `source` to `path` on the app-server host without holding it all in memory.
+
+        `source` is a local file path, bytes, a binary file object, or a sync or async
+        iterable of bytes. It is read and base64-encoded `chunk_size` bytes at a time.
+        Data that fits in one chunk is sent with a single `fs/writeFile`. Larger data is
+        streamed, one `command/exec/write` per chunk, to the stdin of a `command/exec`
+        process that writes it to `path`, so no message grows with the file. That needs
+        `sh` on the host, and `sandbox_policy` must allow writing `path`.
+
+        `progress` is called with the bytes uploaded so far and the total, or None for
+        sources of unknown size. Returns the number of bytes written.
+        """
+        total = source_size(source)
+        chunks = encoded_chunks(source, chunk_size)
+        try:
+            first = await anext(chunks, None)
+            second = None if first is None else await anext(chunks, None)
+            if first is None or second is None:
+                encoded, sent = first if first is not None else ("", 0)
+                params = protocol.FsWriteFileParams(
+                    path=protocol.AbsolutePathBuf(path),
+                    dataBase64=encoded,
+                )
+                await self._rpc.request_typed(
+                    "fs/writeFile",
+                    params,
+                    protocol.FsWriteFileResponse,
+                )
+                if progress is not None:
+                    progress(sent, total)
+                return sent
+            return await self._stream_upload(
+                path, [first, second], chunks, total, progress, sandbox_policy
+            )
+        finally:
+            await chunks.aclose()
+
+    async def sync_tree(
+        self,
+        *,
+        local_dir: str | os.PathLike[str],
+        remote_dir: str,
+        manifest: str | os.PathLike[str] | None = None,
+        concurrency: int = 8,
+        chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE,
+    ) -> FsSyncResult:
+        """Copy the files under `local_dir` into `remote_dir`, like a one-way rsync.
+
+        Up to `concurrency` files are hashed and uploaded at a time, each with `upload()`,
+        and every remote directory is created once. `manifest` names a local JSON file
+        recording the SHA-256 of each file written to `remote_dir`; files that match it
+        are skipped, and it is updated after every run. It only tracks what this client
+        wrote, so remote files changed or deleted by anything else are not noticed.
+        Remote files are never deleted.
+        """
+        return await sync_tree(
+            self,
+            local_dir,
+            remote_dir,
+            manifest=manifest,
+            concurrency=concurrency,
+            chunk_size=chunk_size,
+        )
+
+    async def _stream_upload(
+        self,
+        path: str,
+        head: list[tuple[str, int]],
+        rest: AsyncIterator[tuple[str, int]],
+        total: int | None,
+        progress: UploadProgress | None,
+        sandbox_policy: protocol.SandboxPolicy | None,
+    ) -> int:
+        process_id = f"fs-upload-{uuid.uuid4().hex}"
+        params = protocol.CommandExecParams(
+            command=["sh", "-c", 'cat > "$0"', path],
+            disableTimeout=True,
+            processId=process_id,
+            sandboxPolicy=sandbox_policy,
+            streamStdin=True,
+        )
+        # The exec only answers once the whole file is written, so it must not inherit the
+        # connection's request_timeout.
+        execution = asyncio.ensure_future(
+            self._rpc.request_typed("command/exec", params, CommandExecResult, timeout=math.inf)
+        )
+        sent = 0
+        try:
+            encoded, sent = head[0]
+            await self._write_first_chunk(execution, process_id, encoded)
+            if progress is not None:
+                progress(sent, total)
+            for encoded, size in head[1:]:
+                sent = await self._write_chunk(process_id, encoded, sent + size, total, progress)
+            async for encoded, size in rest:
+                sent = await self._write_chunk(process_id, encoded, sent + size, total, progress)
+            await self._write_stdin(process_id, close_stdin=True)
+            result = await execution
+        except BaseException:
+            if execution.done():
+                # A write fails when the process did; the exec error says why.
+                error = None if execution.cancelled() else execution.exception()
+                if error is not None:
+                    raise error from None
+            else:
+                execution.cancel()
+                with suppress(Exception):
+                    await self._rpc.request_typed(
+                        "command/exec/terminate",
+                        protocol.CommandExecTerminateParams(processId=process_id),
+                        EmptyResult,
+                    )
+            raise
+        if result.exit_code != 0:
+            raise AppServerError(
+                f"Uploading to {path} failed with exit code {result.exit_code}: "
+                f"{result.stderr.strip()}"
+            )
+        return sent
+
+    async def _write_first_chunk(
+        self, execution: asyncio.Future[CommandExecResult], process_id: str, encoded: str
+    ) -> None:
+        """Write the first chunk, retrying while `command/exec` may not have started yet.
+
+        Nothing orders the exec request before the first write on the server, and
+        the exec only answers once the process exits, so a write rejected because the
+        server does not know `process_id` yet is retried until it succeeds, the exec
+        fails, or `_UPLOAD_START_SECONDS` pass. Any other error is raised at once.
+        """
+        deadline = time.monotonic() + _UPLOAD_START_SECONDS
+        delay = 0.01
+        while True:
+            try:
+                await self._write_stdin(process_id, delta_base64=encoded)
+                return
+            except AppServerRpcError as exc:
+                if (
+                    not _is_unknown_process(exc, process_id)
+                    or execution.done()
+                    or time.monotonic() + delay > deadline
+                ):
+                    raise
+            await asyncio.wait({execution}, timeout=delay)
+            delay = min(delay * 2, 0.5)
+
+    async def _write_chunk(
+        self,
+        process_id: str,
+        encoded: str,
+        sent: int,
+        total: int | None,
+        progress: UploadProgress | None,
+    ) -> int:
+        await self._write_stdin(process_id, delta_base64=encoded)
+        if progress is not None:
+            progress(sent, total)
+        return sent
+
+    async def _write_stdin(
+        self,
+        process_id: str,
+        *,
+        delta_base64: str | None = None,
+        close_stdin: bool | None = None,
+    ) -> None:
+        params = protocol.CommandExecWriteParams(
+            closeStdin=close_stdin,
+            deltaBase64=delta_base64,
+            processId=process_id,
+        )
+        await self._rpc.request_typed("command/exec/write", params, EmptyResult)
+
+
+def _is_unknown_process(error: AppServerRpcError, process_id: str) -> bool:
+    # The server rejects writes to a process it has not registered as an invalid request
+    # naming the process id.
+    return error.code == _INVALID_REQUEST_CODE and process_id in error.message
+
 
 class AsyncEnvironmentClient(_AsyncServiceClient):
     async def info(self, *, environment_id: str) -> protocol.EnvironmentInfoResponse:
@@ -431,6 +680,22 @@ class AsyncMcpServersClient(_AsyncServiceClient):
             McpServerStatusListResult,
         )
 
+    async def iter_all(
+        self,
+        *,
+        cursor: str | None = None,
+        page_size: int | None = None,
+        prefetch: int = DEFAULT_PREFETCH,
+    ) -> AsyncIterator[McpServerStatus]:
+        """Yield MCP server statuses across every page, prefetching up to `prefetch` pages."""
+
+        def fetch(cursor: str | None) -> Awaitable[McpServerStatusListResult]:
+            return self.list_page(cursor=cursor, limit=page_size)
+
+        async for page in iter_pages(fetch, cursor=cursor, prefetch=prefetch):
+            for status in page.data:
+                yield status
+
     # Backward-compatible aliases; prefer list()/list_page().
     list_status = list
     list_status_page = list_page
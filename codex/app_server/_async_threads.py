@@ -3,23 +3,22 @@
 from __future__ import annotations
 
 import json
-from collections.abc import Callable, Collection, Mapping, Sequence
+from collections.abc import AsyncIterator, Awaitable, Callable, Collection, Mapping, Sequence
 from dataclasses import dataclass
-from typing import Protocol, TypeVar, cast
+from typing import Protocol, TypeVar, cast, overload
 
 from pydantic import BaseModel
 
-from codex._turn_options import with_model_output_schema
+from codex._turn_options import with_model_output_schema, without_text_deltas
+from codex.app_server._incremental_json import _MessageJsonFeed
+from codex.app_server._pagination import DEFAULT_PREFETCH, iter_pages
 from codex.app_server._payloads import TurnInput, normalize_turn_input, serialize_value
 from codex.app_server._protocol_helpers import (
     Notification,
     extract_item,
     extract_text_delta,
-    extract_thread_id,
     extract_token_usage,
     extract_turn,
-    extract_turn_id,
-    method_name,
 )
 from codex.app_server._session import _AsyncNotificationSubscription
 from codex.app_server.errors import AppServerTurnError
@@ -78,6 +77,8 @@ class _NotificationSession(Protocol):
         methods: Collection[str] | None = None,
         *,
         predicate: Callable[[Notification], bool] | None = None,
+        scope: tuple[str, str | None] | None = None,
+        compact_deltas: bool | None = None,
     ) -> _AsyncNotificationSubscription: ...
 
 
@@ -96,21 +97,6 @@ class _StartedStream:
 class AsyncTurnStream:
     """Async iterator over protocol-native notifications for a single turn."""
 
-    @staticmethod
-    def _scope_predicate(
-        thread_id: str,
-        turn_id: str | None = None,
-    ) -> Callable[[Notification], bool]:
-        def predicate(notification: Notification) -> bool:
-            if extract_thread_id(notification) != thread_id:
-                return False
-            if method_name(notification) == "thread/tokenUsage/updated":
-                return True
-            notification_turn_id = extract_turn_id(notification)
-            return turn_id is None or notification_turn_id == turn_id
-
-        return predicate
-
     @staticmethod
     def _reject_all_notifications(_: Notification) -> bool:
         return False
@@ -122,6 +108,7 @@ class AsyncTurnStream:
         initial_turn: protocol.Turn,
         *,
         review_thread_id: str | None = None,
+        retain_text_deltas: bool = True,
     ) -> None:
         self._thread = thread
         self._subscription = subscription
@@ -130,14 +117,23 @@ class AsyncTurnStream:
         self.turn_id = initial_turn.id
         self.thread_id = review_thread_id or thread.id
         self.final_turn: protocol.Turn | None = None
-        self._final_text = ""
+        # Text chunks are joined lazily on `final_text` access; `_final_text` caches the join.
+        self._final_text_chunks: list[str] = []
+        self._final_text: str | None = ""
+        # Where the agent message that is currently streaming starts in `_final_text_chunks`.
+        self._delta_item_id: str | None = None
+        self._message_start = 0
+        self._json_feed: _MessageJsonFeed | None = None
+        # Commentary messages are progress prose, never structured output.
+        self._commentary_items: set[str] = set()
         self._final_message: protocol.AgentMessageThreadItem | None = None
         self.items: list[protocol.ThreadItem] = []
         self.usage: protocol.ThreadTokenUsage | None = None
         self._item_index: dict[str, int] = {}
-        self._text_deltas: list[str] = []
+        self._text_deltas: list[str] | None = [] if retain_text_deltas else None
         self._retryable_error_notifications: list[protocol.ErrorNotificationModel] = []
         self._done = False
+        self._received_last = False
         self._closed = False
 
     @classmethod
@@ -145,18 +141,31 @@ class AsyncTurnStream:
         cls,
         thread: AsyncAppServerThread,
         params: BaseModel | Mapping[str, object],
+        *,
+        retain_text_deltas: bool = True,
+        compact_deltas: bool | None = None,
     ) -> AsyncTurnStream:
-        """Start a turn and return its notification stream."""
+        """Start a turn and return its notification stream.
+
+        With `compact_deltas`, delta notifications are yielded as `DeltaEvent`s; None
+        uses the connection's `AppServerInitializeOptions.compact_deltas`.
+        """
         result = await cls._bootstrap_stream(
             thread,
             method="turn/start",
             params=params,
             result_model=TurnResult,
-            initial_predicate=cls._scope_predicate(thread.id),
+            initial_scope=(thread.id, None),
             scope_from_result=lambda result: (thread.id, result.turn.id),
             review_thread_id_from_result=lambda result: None,
+            compact_deltas=compact_deltas,
+        )
+        return cls(
+            thread,
+            result.subscription,
+            result.turn,
+            retain_text_deltas=retain_text_deltas,
         )
-        return cls(thread, result.subscription, result.turn)
 
     @classmethod
     async def start_review(
@@ -187,16 +196,49 @@ class AsyncTurnStream:
     def __aiter__(self) -> AsyncTurnStream:
         return self
 
+    def has_buffered(self) -> bool:
+        """Return whether `__anext__` can complete without waiting for the connection."""
+        return self._done or self._subscription.has_buffered()
+
     async def __anext__(self) -> Notification:
         if self._done:
             await self.close()
             raise StopAsyncIteration
         notification = await self._subscription.next()
+        try:
+            return self._accept(notification)
+        except AppServerTurnError:
+            await self.close()
+            raise
+
+    async def _receive(self) -> Notification:
+        """Return the next notification without applying it to the aggregate state.
+
+        The sync wrapper prefetches with this and calls `_accept()` as it hands each
+        notification to its caller, so properties such as `final_text` never run
+        ahead of what the caller has seen.
+        """
+        if self._received_last:
+            await self.close()
+            raise StopAsyncIteration
+        notification = await self._subscription.next()
+        if isinstance(notification, protocol.TurnCompletedNotificationModel) or (
+            isinstance(notification, protocol.ErrorNotificationModel)
+            and not notification.params.willRetry
+        ):
+            self._received_last = True
+        return notification
+
+    def _receive_ready(self) -> bool:
+        """Return whether `_receive()` can complete without waiting for the connection."""
+        return self._received_last or self._subscription.has_buffered()
+
+    def _accept(self, notification: Notification) -> Notification:
+        """Apply `notification` to the aggregate state; raise if it fails the turn."""
         self._apply(notification)
         if isinstance(notification, protocol.ErrorNotificationModel):
             if not notification.params.willRetry:
                 self._done = True
-                await self.close()
                 error = notification.params.error
                 message = error.message
                 if error.additionalDetails is not None and error.additionalDetails != "":
@@ -247,6 +289,10 @@ class AsyncTurnStream:
     @property
     def final_text(self) -> str:
         self._require_terminal_turn()
+        if self._final_text is None:
+            self._final_text = "".join(self._final_text_chunks)
+            self._final_text_chunks = [self._final_text]
+            self._message_start = 0
         return self._final_text
 
     @property
@@ -285,10 +331,59 @@ class AsyncTurnStream:
         """Validate the final assistant message text with a Pydantic model."""
         return model_type.model_validate_json(self._require_final_message_text())
 
+    def partial_json(self) -> object | None:
+        """Return the assistant message streamed so far as JSON, or None before it starts.
+
+        Unfinished objects and arrays are closed and unfinished scalars are left out, so
+        the result only ever gains fields as deltas arrive. Intended for turns started
+        with an `output_schema`, for example to render a progress view.
+        """
+        feed = self._json_feed or self._structured_output_feed(("*",))
+        return feed.partial()
+
+    @overload
+    def iter_json_items(
+        self, path: Sequence[str | int], model: None = None
+    ) -> AsyncIterator[object]: ...
+
+    @overload
+    def iter_json_items(
+        self, path: Sequence[str | int], model: type[_ModelT]
+    ) -> AsyncIterator[_ModelT]: ...
+
+    async def iter_json_items(
+        self, path: Sequence[str | int], model: type[_ModelT] | None = None
+    ) -> AsyncIterator[object]:
+        """Consume the stream and yield each JSON value at `path` as soon as it completes.
+
+        `path` names object keys and array indexes from the root of the structured
+        output, with `"*"` matching any key or index: `("records", "*")` yields every
+        element of the `records` array while later elements are still streaming. With
+        `model`, each value is validated with `model.model_validate()` before it is
+        yielded. Values are checked against the completed message when the turn ends,
+        so nothing is lost if deltas were coalesced or dropped.
+        """
+        feed = self._structured_output_feed(path)
+        try:
+            while True:
+                for value in feed.drain():
+                    yield value if model is None else model.model_validate(value)
+                if self._done:
+                    break
+                await self.__anext__()
+            self._require_terminal_turn()
+            for value in feed.finish(self._final_message):
+                yield value if model is None else model.model_validate(value)
+        finally:
+            await self.close()
+
     @property
     def text_deltas(self) -> tuple[str, ...]:
-        """Return the streamed agent text deltas received so far."""
-        return tuple(self._text_deltas)
+        """Return the streamed agent text deltas received so far.
+
+        Empty when the turn was started with `retain_text_deltas=False`.
+        """
+        return () if self._text_deltas is None else tuple(self._text_deltas)
 
     @property
     def retryable_error_notifications(self) -> tuple[protocol.ErrorNotificationModel, ...]:
@@ -308,6 +403,17 @@ class AsyncTurnStream:
         self._apply_item(notification)
         self._apply_turn_completion(notification)
 
+    def _structured_output_feed(self, path: Sequence[str | int]) -> _MessageJsonFeed:
+        path = tuple(path)
+        feed = self._json_feed
+        if feed is None or feed.path != path:
+            # Catch up on the message that is already streaming, then follow its deltas.
+            text = "".join(self._final_text_chunks[self._message_start :])
+            feed = self._json_feed = _MessageJsonFeed(
+                path, self._delta_item_id, text, self._commentary_items
+            )
+        return feed
+
     def _require_final_message_text(self) -> str:
         self._require_terminal_turn()
         if self._final_message is None:
@@ -325,8 +431,16 @@ class AsyncTurnStream:
         text_delta = extract_text_delta(notification)
         if text_delta is None:
             return
-        self._text_deltas.append(text_delta)
-        self._final_text += text_delta
+        if self._text_deltas is not None:
+            self._text_deltas.append(text_delta)
+        item_id = cast(protocol.ItemAgentMessageDeltaNotification, notification).params.itemId
+        if item_id != self._delta_item_id:
+            self._delta_item_id = item_id
+            self._message_start = len(self._final_text_chunks)
+        self._final_text_chunks.append(text_delta)
+        self._final_text = None
+        if self._json_feed is not None:
+            self._json_feed.feed(item_id, text_delta)
 
     def _apply_token_usage(self, notification: Notification) -> None:
         token_usage = extract_token_usage(notification)
@@ -346,8 +460,13 @@ class AsyncTurnStream:
         else:
             self.items.append(item)
         if isinstance(item.root, protocol.AgentMessageThreadItem):
+            phase = item.root.phase
+            if phase is not None and phase.root == "commentary":
+                self._commentary_items.add(item.root.id)
             self._final_message = item.root
+            self._final_text_chunks = [item.root.text]
             self._final_text = item.root.text
+            self._message_start = 0
 
     def _apply_turn_completion(self, notification: Notification) -> None:
         turn = extract_turn(notification)
@@ -362,13 +481,17 @@ class AsyncTurnStream:
         method: str,
         params: BaseModel | Mapping[str, object],
         result_model: type[TurnResult] | type[ReviewResult],
-        initial_predicate: Callable[[Notification], bool],
+        initial_scope: tuple[str, None] | None = None,
+        initial_predicate: Callable[[Notification], bool] | None = None,
         scope_from_result: Callable[[TurnResult | ReviewResult], tuple[str, str]],
         review_thread_id_from_result: Callable[[TurnResult | ReviewResult], str | None],
+        compact_deltas: bool | None = None,
     ) -> _StartedStream:
         subscription = thread._client._session.subscribe_notifications(
             _TURN_STREAM_NOTIFICATION_METHODS,
             predicate=initial_predicate,
+            scope=initial_scope,
+            compact_deltas=compact_deltas,
         )
         try:
             result: TurnResult | ReviewResult = await thread._client.rpc.request_typed(
@@ -380,7 +503,7 @@ class AsyncTurnStream:
             await subscription.close()
             raise
         scoped_thread_id, scoped_turn_id = scope_from_result(result)
-        subscription.update_predicate(cls._scope_predicate(scoped_thread_id, scoped_turn_id))
+        subscription.update_scope(scoped_thread_id, scoped_turn_id)
         return _StartedStream(
             subscription=subscription,
             turn=result.turn,
@@ -465,6 +588,29 @@ class AsyncAppServerThread:
             protocol.ThreadItemsListResponse,
         )
 
+    async def iter_items(
+        self,
+        *,
+        cursor: str | None = None,
+        page_size: int | None = None,
+        sort_direction: protocol.SortDirection | None = None,
+        turn_id: str | None = None,
+        prefetch: int = DEFAULT_PREFETCH,
+    ) -> AsyncIterator[protocol.ThreadItem]:
+        """Yield every persisted item from `cursor` on, prefetching up to `prefetch` pages."""
+
+        def fetch(cursor: str | None) -> Awaitable[protocol.ThreadItemsListResponse]:
+            return self.list_items_page(
+                cursor=cursor,
+                limit=page_size,
+                sort_direction=sort_direction,
+                turn_id=turn_id,
+            )
+
+        async for page in iter_pages(fetch, cursor=cursor, prefetch=prefetch):
+            for entry in page.data:
+                yield entry.item
+
     async def list_turns(
         self,
         *,
@@ -504,6 +650,29 @@ class AsyncAppServerThread:
             protocol.ThreadTurnsListResponse,
         )
 
+    async def iter_turns(
+        self,
+        *,
+        cursor: str | None = None,
+        items_view: protocol.TurnItemsView | None = None,
+        page_size: int | None = None,
+        sort_direction: protocol.SortDirection | None = None,
+        prefetch: int = DEFAULT_PREFETCH,
+    ) -> AsyncIterator[protocol.Turn]:
+        """Yield every persisted turn from `cursor` on, prefetching up to `prefetch` pages."""
+
+        def fetch(cursor: str | None) -> Awaitable[protocol.ThreadTurnsListResponse]:
+            return self.list_turns_page(
+                cursor=cursor,
+                items_view=items_view,
+                limit=page_size,
+                sort_direction=sort_direction,
+            )
+
+        async for page in iter_pages(fetch, cursor=cursor, prefetch=prefetch):
+            for turn in page.data:
+                yield turn
+
     async def search_occurrences(
         self,
         search_term: str,
@@ -539,6 +708,23 @@ class AsyncAppServerThread:
             protocol.ThreadSearchOccurrencesResponse,
         )
 
+    async def iter_search_occurrences(
+        self,
+        search_term: str,
+        *,
+        cursor: str | None = None,
+        page_size: int | None = None,
+        prefetch: int = DEFAULT_PREFETCH,
+    ) -> AsyncIterator[protocol.ThreadSearchOccurrence]:
+        """Yield every message occurrence of `search_term`, prefetching up to `prefetch` pages."""
+
+        def fetch(cursor: str | None) -> Awaitable[protocol.ThreadSearchOccurrencesResponse]:
+            return self.search_occurrences_page(search_term, cursor=cursor, limit=page_size)
+
+        async for page in iter_pages(fetch, cursor=cursor, prefetch=prefetch):
+            for occurrence in page.data:
+                yield occurrence
+
     async def run(
         self,
         input: TurnInput,
@@ -547,11 +733,17 @@ class AsyncAppServerThread:
         skills: Sequence[protocol.SkillUserInput] | None = None,
     ) -> AsyncTurnStream:
         """Start a turn and return the protocol-native notification stream."""
-        payload = (options or AppServerTurnOptions()).to_params(
+        turn_options = options or AppServerTurnOptions()
+        payload = turn_options.to_params(
             thread_id=self.id,
             input=normalize_turn_input(input, skills=skills),
         )
-        return await AsyncTurnStream.start(self, payload)
+        return await AsyncTurnStream.start(
+            self,
+            payload,
+            retain_text_deltas=turn_options.retain_text_deltas,
+            compact_deltas=turn_options.compact_deltas,
+        )
 
     async def run_text(
         self,
@@ -560,7 +752,7 @@ class AsyncAppServerThread:
         *,
         skills: Sequence[protocol.SkillUserInput] | None = None,
     ) -> str:
-        stream = await self.run(input, options, skills=skills)
+        stream = await self.run(input, without_text_deltas(options), skills=skills)
         await stream.wait()
         stream.raise_for_terminal_status()
         return stream.final_text
@@ -572,7 +764,7 @@ class AsyncAppServerThread:
         *,
         skills: Sequence[protocol.SkillUserInput] | None = None,
     ) -> object:
-        stream = await self.run(input, options, skills=skills)
+        stream = await self.run(input, without_text_deltas(options), skills=skills)
         await stream.wait()
         stream.raise_for_terminal_status()
         return stream.final_json()
@@ -588,10 +780,12 @@ class AsyncAppServerThread:
         """Run a turn and validate the final assistant text with `model_type`."""
         stream = await self.run(
             input,
-            with_model_output_schema(
-                options,
-                model_type,
-                owner="AppServerThread.run_model()",
+            without_text_deltas(
+                with_model_output_schema(
+                    options,
+                    model_type,
+                    owner="AppServerThread.run_model()",
+                )
             ),
             skills=skills,
         )
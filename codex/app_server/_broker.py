@@ -0,0 +1,371 @@
+"""Share one app-server process between many local client connections."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from collections.abc import Mapping
+from contextlib import suppress
+from dataclasses import dataclass, field
+from typing import Any, cast
+
+from codex.app_server._json_codec import JsonCodec, JsonCodecName, resolve_json_codec
+from codex.app_server._types import JsonObject
+from codex.app_server.errors import AppServerClosedError, AppServerError, AppServerRpcError
+from codex.app_server.options import AppServerInitializeOptions
+from codex.app_server.transports import (
+    STDIO_STREAM_LIMIT_BYTES,
+    AsyncMessageTransport,
+    AsyncStdioTransport,
+    _decode_message,
+    _LineFramer,
+)
+
+_LOGGER = logging.getLogger("codex.app_server.broker")
+# A client whose unsent output grows past this is too slow to keep up and is disconnected.
+_CLIENT_BUFFER_LIMIT_BYTES = 64 * 1024 * 1024
+_THREAD_LOADING_METHODS = frozenset({"thread/start", "thread/resume", "thread/fork"})
+
+
+@dataclass(eq=False, slots=True)
+class _BrokerClient:
+    number: int
+    writer: asyncio.StreamWriter
+    codec: JsonCodec
+    threads: set[str] = field(default_factory=set)
+
+    @property
+    def connected(self) -> bool:
+        return not self.writer.is_closing()
+
+    def send(self, message: JsonObject) -> None:
+        """Queue `message` without waiting, so one slow client never stalls the broker."""
+        if not self.connected:
+            return
+        self.writer.write(self.codec.encode(message) + b"\n")
+        if self.writer.transport.get_write_buffer_size() > _CLIENT_BUFFER_LIMIT_BYTES:
+            _LOGGER.warning("disconnecting broker client %d: output buffer full", self.number)
+            self.writer.close()
+
+
+@dataclass(slots=True)
+class _Route:
+    """Where the response to a forwarded request goes; `client` is None for the broker's own."""
+
+    client: _BrokerClient | None
+    client_id: object
+    method: str
+    future: asyncio.Future[object] | None = None
+
+
+class AppServerBroker:
+    """Multiplex many JSON-RPC clients onto one app-server over Unix sockets or TCP.
+
+    The broker owns a single app-server connection (by default a stdio child) and
+    completes its `initialize` handshake once; each client's `initialize` is answered
+    from that cached result. Request ids are rewritten per client, notifications and
+    server requests that name a thread go to the clients that started, resumed, or
+    forked it, and only messages that name no thread are broadcast. Clients connect
+    with `AsyncAppServerClient.connect_unix_socket()` or `connect_tcp()`.
+    """
+
+    def __init__(
+        self,
+        transport: AsyncMessageTransport | None = None,
+        initialize_options: AppServerInitializeOptions | None = None,
+        *,
+        json_codec: JsonCodecName | JsonCodec = "auto",
+    ) -> None:
+        self._transport = transport or AsyncStdioTransport()
+        self._initialize_options = initialize_options or AppServerInitializeOptions()
+        self._codec = resolve_json_codec(json_codec)
+        self._initialize_result: object = None
+        self._next_id = 0
+        self._next_client = 0
+        self._routes: dict[int, _Route] = {}
+        self._server_requests: dict[object, _BrokerClient] = {}
+        self._clients: dict[_BrokerClient, None] = {}
+        self._thread_clients: dict[str, dict[_BrokerClient, None]] = {}
+        self._servers: list[asyncio.Server] = []
+        self._client_tasks: set[asyncio.Task[None]] = set()
+        self._reader_task: asyncio.Task[None] | None = None
+        self._started = False
+        self._closed = False
+
+    @property
+    def client_count(self) -> int:
+        """Number of currently connected clients."""
+        return len(self._clients)
+
+    async def __aenter__(self) -> AppServerBroker:
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type: object, exc: object, tb: object) -> None:
+        _ = (exc_type, exc, tb)
+        await self.close()
+
+    async def start(self) -> None:
+        """Start the shared app-server and complete its `initialize` handshake."""
+        if self._closed:
+            raise AppServerClosedError("app-server broker is closed")
+        if self._started:
+            return
+        await self._transport.start()
+        self._reader_task = asyncio.create_task(self._read_upstream())
+        try:
+            self._initialize_result = await self._request(
+                "initialize", cast(JsonObject, self._initialize_options.to_params())
+            )
+            await self._transport.send({"method": "initialized", "params": {}})
+        except BaseException:
+            await self.close()
+            raise
+        self._started = True
+
+    async def listen_unix(self, path: str | os.PathLike[str]) -> None:
+        """Accept clients on a Unix domain socket at `path`."""
+        await self.start()
+        server = await asyncio.start_unix_server(
+            self._serve_client, os.fspath(path), limit=STDIO_STREAM_LIMIT_BYTES
+        )
+        self._servers.append(server)
+
+    async def listen_tcp(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Accept clients on a TCP address and return the bound port (useful with `port=0`)."""
+        await self.start()
+        server = await asyncio.start_server(
+            self._serve_client, host, port, limit=STDIO_STREAM_LIMIT_BYTES
+        )
+        self._servers.append(server)
+        return int(server.sockets[0].getsockname()[1])
+
+    async def serve_forever(self) -> None:
+        """Wait until the shared app-server exits or the broker is closed."""
+        if self._reader_task is None:
+            raise AppServerClosedError("app-server broker is not started")
+        await asyncio.shield(self._reader_task)
+
+    async def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        for server in self._servers:
+            server.close()
+        for client in list(self._clients):
+            client.writer.close()
+        if self._client_tasks:
+            await asyncio.gather(*self._client_tasks, return_exceptions=True)
+        for server in self._servers:
+            await server.wait_closed()
+        self._servers.clear()
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+        self._fail_routes(AppServerClosedError("app-server broker closed"))
+        await self._transport.close()
+
+    async def _request(self, method: str, params: JsonObject) -> object:
+        future: asyncio.Future[object] = asyncio.get_running_loop().create_future()
+        upstream_id = self._route(_Route(None, None, method, future))
+        await self._transport.send({"id": upstream_id, "method": method, "params": params})
+        return await future
+
+    def _route(self, route: _Route) -> int:
+        upstream_id = self._next_id
+        self._next_id += 1
+        self._routes[upstream_id] = route
+        return upstream_id
+
+    async def _serve_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        task = asyncio.current_task()
+        if task is not None:
+            self._client_tasks.add(task)
+            task.add_done_callback(self._client_tasks.discard)
+        client = _BrokerClient(self._next_client, writer, self._codec)
+        self._next_client += 1
+        self._clients[client] = None
+        framer = _LineFramer(reader, max_line_bytes=None, stream_name="broker client")
+        try:
+            while (bounds := await framer.next_line()) is not None:
+                with framer.view(*bounds) as line:
+                    message = _decode_message(self._codec, line, "Malformed broker client message")
+                await self._from_client(client, message)
+        except (AppServerError, ConnectionError) as exc:
+            _LOGGER.info("broker client %d disconnected: %s", client.number, exc)
+        finally:
+            await self._drop_client(client)
+
+    async def _from_client(self, client: _BrokerClient, message: JsonObject) -> None:
+        method = message.get("method")
+        if "id" not in message:
+            # `initialized` was already sent once for the shared connection.
+            if method != "initialized":
+                await self._transport.send(message)
+            return
+        if method is None:
+            # A response to a server request that was routed to this client.
+            if self._server_requests.pop(message["id"], None) is not None:
+                await self._transport.send(message)
+            return
+        if method == "initialize":
+            client.send({"id": message["id"], "result": self._initialize_result})
+            return
+        if method == "thread/unsubscribe" and self._release_thread(client, message):
+            return
+        route = _Route(client, message["id"], str(method))
+        await self._transport.send({**message, "id": self._route(route)})
+
+    def _release_thread(self, client: _BrokerClient, message: JsonObject) -> bool:
+        """Drop `client`'s interest in a thread; True when other clients still need it."""
+        params = message.get("params")
+        thread_id = params.get("threadId") if isinstance(params, Mapping) else None
+        if not isinstance(thread_id, str):
+            return False
+        client.threads.discard(thread_id)
+        owners = self._thread_clients.get(thread_id)
+        if owners is None:
+            return False
+        owners.pop(client, None)
+        if owners:
+            client.send({"id": message["id"], "result": {"status": "unsubscribed"}})
+            return True
+        del self._thread_clients[thread_id]
+        return False
+
+    async def _drop_client(self, client: _BrokerClient) -> None:
+        self._clients.pop(client, None)
+        client.writer.close()
+        for upstream_id, pending in list(self._server_requests.items()):
+            if pending is client:
+                del self._server_requests[upstream_id]
+                await self._send_upstream_error(upstream_id, "broker client disconnected")
+        for thread_id in client.threads:
+            owners = self._thread_clients.get(thread_id)
+            if owners is None:
+                continue
+            owners.pop(client, None)
+            if not owners and not self._closed:
+                del self._thread_clients[thread_id]
+                await self._unsubscribe_upstream(thread_id)
+
+    async def _unsubscribe_upstream(self, thread_id: str) -> None:
+        upstream_id = self._route(_Route(None, None, "thread/unsubscribe"))
+        with suppress(AppServerError):
+            await self._transport.send(
+                {
+                    "id": upstream_id,
+                    "method": "thread/unsubscribe",
+                    "params": {"threadId": thread_id},
+                }
+            )
+
+    async def _read_upstream(self) -> None:
+        try:
+            while (message := await self._transport.receive()) is not None:
+                if "id" in message and "method" not in message:
+                    await self._from_upstream_response(message)
+                elif "id" in message:
+                    await self._from_upstream_request(message)
+                else:
+                    for client in self._recipients(message):
+                        client.send(message)
+        except Exception as exc:
+            self._fail_routes(exc)
+            raise
+        finally:
+            # Clients see EOF and fail (or reconnect) the same way as on a lost app-server.
+            for client in list(self._clients):
+                client.writer.close()
+        self._fail_routes(AppServerClosedError("app-server closed the broker connection"))
+
+    async def _from_upstream_response(self, message: JsonObject) -> None:
+        route = self._routes.pop(cast(int, message["id"]), None)
+        if route is None:
+            return
+        if route.client is None:
+            if route.future is not None and not route.future.done():
+                error = message.get("error")
+                if isinstance(error, Mapping):
+                    route.future.set_exception(
+                        AppServerRpcError(
+                            int(error.get("code", -32603)),
+                            str(error.get("message", "")),
+                            error.get("data"),
+                        )
+                    )
+                else:
+                    route.future.set_result(message.get("result"))
+            return
+        if route.method in _THREAD_LOADING_METHODS:
+            await self._claim_thread(route.client, message.get("result"))
+        route.client.send({**message, "id": route.client_id})
+
+    async def _from_upstream_request(self, message: JsonObject) -> None:
+        if _message_thread_id(message) is None:
+            clients = list(self._clients)
+            reason = "no broker client is connected"
+        else:
+            # Approvals and tool calls for a thread must never reach another client.
+            clients = self._owners(message)
+            reason = "no broker client owns the thread"
+        if not clients:
+            await self._send_upstream_error(message["id"], reason)
+            return
+        self._server_requests[message["id"]] = clients[0]
+        clients[0].send(message)
+
+    async def _claim_thread(self, client: _BrokerClient, result: object) -> None:
+        thread = result.get("thread") if isinstance(result, Mapping) else None
+        thread_id = thread.get("id") if isinstance(thread, Mapping) else None
+        if not isinstance(thread_id, str):
+            return
+        if client.connected:
+            client.threads.add(thread_id)
+            self._thread_clients.setdefault(thread_id, {})[client] = None
+        elif thread_id not in self._thread_clients and not self._closed:
+            # The client left before its thread loaded; nobody else would release it.
+            await self._unsubscribe_upstream(thread_id)
+
+    def _owners(self, message: JsonObject) -> list[_BrokerClient]:
+        thread_id = _message_thread_id(message)
+        if thread_id is None:
+            return []
+        return list(self._thread_clients.get(thread_id, ()))
+
+    def _recipients(self, message: JsonObject) -> list[_BrokerClient]:
+        """Return a notification's thread owners, or every client if it names no thread.
+
+        A thread nobody owns belongs to a client that already left, so its
+        notifications are dropped rather than leaked to the other clients.
+        """
+        if _message_thread_id(message) is None:
+            return list(self._clients)
+        return self._owners(message)
+
+    async def _send_upstream_error(self, request_id: object, reason: str) -> None:
+        with suppress(AppServerError):
+            await self._transport.send(
+                {"id": request_id, "error": {"code": -32603, "message": reason}}
+            )
+
+    def _fail_routes(self, exc: BaseException) -> None:
+        for route in self._routes.values():
+            if route.future is not None and not route.future.done():
+                route.future.set_exception(exc)
+        self._routes.clear()
+
+
+def _message_thread_id(message: JsonObject) -> str | None:
+    params: Any = message.get("params")
+    if not isinstance(params, Mapping):
+        return None
+    thread_id = params.get("threadId")
+    if isinstance(thread_id, str):
+        return thread_id
+    thread = params.get("thread")
+    nested = thread.get("id") if isinstance(thread, Mapping) else None
+    return nested if isinstance(nested, str) else None
@@ -0,0 +1,35 @@
+"""Deadlines that bound every app-server request made inside a scope."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_DEADLINE: ContextVar[float | None] = ContextVar("codex_app_server_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """Fail app-server requests made in this block once `seconds` have elapsed.
+
+    The deadline covers every request made in the block, including the ones issued by
+    helpers such as `thread.run_text()`, and is inherited by tasks started inside it.
+    Nested scopes can only shorten it. It works the same with the sync clients.
+    """
+    if seconds < 0:
+        raise ValueError("deadline seconds must not be negative")
+    expires_at = time.monotonic() + seconds
+    current = _DEADLINE.get()
+    token = _DEADLINE.set(expires_at if current is None else min(current, expires_at))
+    try:
+        yield
+    finally:
+        _DEADLINE.reset(token)
+
+
+def remaining_seconds() -> float | None:
+    """Seconds left before the innermost active `deadline()`, or None outside one."""
+    expires_at = _DEADLINE.get()
+    return None if expires_at is None else expires_at - time.monotonic()
@@ -0,0 +1,141 @@
+"""Compact events for the high-volume delta notifications of a turn."""
+
+from __future__ import annotations
+
+import dataclasses
+from dataclasses import dataclass
+from typing import ClassVar, Self, cast
+
+from pydantic import BaseModel
+
+from codex.app_server._types import JsonObject
+from codex.protocol import types as protocol
+
+
+@dataclass(frozen=True, slots=True)
+class DeltaEvent:
+    """Immutable stand-in for a protocol delta notification, built straight from JSON.
+
+    A delta notification validated by pydantic is three model instances (envelope,
+    method, and params); a `DeltaEvent` is one slotted object. Fields use the protocol
+    names, and `params` returns the event itself, so `event.params.delta` and
+    `event.method` read the same as on the protocol model. `to_model()` builds that
+    model when one is needed.
+    """
+
+    method: ClassVar[str]
+    model: ClassVar[type[BaseModel]]
+
+    threadId: str
+    turnId: str
+    itemId: str
+    delta: str
+    emittedAtMs: int | None
+
+    @property
+    def params(self) -> Self:
+        return self
+
+    @classmethod
+    def from_message(cls, message: JsonObject) -> Self | None:
+        """Build an event from a decoded notification, or return None if it has another shape."""
+        fields = _delta_fields(message)
+        return None if fields is None else cls(*fields)
+
+    def to_model(self) -> BaseModel:
+        """Return the protocol notification model this event stands in for."""
+        params = {
+            field.name: getattr(self, field.name)
+            for field in dataclasses.fields(self)
+            if field.name != "emittedAtMs"
+        }
+        return self.model.model_validate(
+            {"emittedAtMs": self.emittedAtMs, "method": self.method, "params": params}
+        )
+
+    def merge(self, other: DeltaEvent) -> Self | None:
+        """Return one event carrying both deltas if `other` continues the same stream."""
+        if type(other) is not type(self) or _stream_key(other) != _stream_key(self):
+            return None
+        return dataclasses.replace(self, delta=self.delta + other.delta)
+
+
+@dataclass(frozen=True, slots=True)
+class AgentMessageDeltaEvent(DeltaEvent):
+    """Compact `item/agentMessage/delta` notification."""
+
+    method: ClassVar[str] = "item/agentMessage/delta"
+    model: ClassVar[type[BaseModel]] = protocol.ItemAgentMessageDeltaNotification
+
+
+@dataclass(frozen=True, slots=True)
+class CommandOutputDeltaEvent(DeltaEvent):
+    """Compact `item/commandExecution/outputDelta` notification."""
+
+    method: ClassVar[str] = "item/commandExecution/outputDelta"
+    model: ClassVar[type[BaseModel]] = protocol.ItemCommandExecutionOutputDeltaNotification
+
+
+@dataclass(frozen=True, slots=True)
+class ReasoningTextDeltaEvent(DeltaEvent):
+    """Compact `item/reasoning/textDelta` notification."""
+
+    method: ClassVar[str] = "item/reasoning/textDelta"
+    model: ClassVar[type[BaseModel]] = protocol.ItemReasoningTextDeltaNotification
+
+    contentIndex: int
+
+    @classmethod
+    def from_message(cls, message: JsonObject) -> Self | None:
+        fields = _delta_fields(message)
+        if fields is None:
+            return None
+        content_index = cast(JsonObject, message["params"]).get("contentIndex")
+        return cls(*fields, content_index) if type(content_index) is int else None
+
+
+_EVENT_TYPES: dict[str, type[DeltaEvent]] = {
+    event_type.method: event_type
+    for event_type in (AgentMessageDeltaEvent, CommandOutputDeltaEvent, ReasoningTextDeltaEvent)
+}
+COMPACT_DELTA_METHODS = frozenset(_EVENT_TYPES)
+
+
+def compact_delta_event(message: JsonObject) -> DeltaEvent | None:
+    """Return the compact event for a delta notification, or None to use the protocol model.
+
+    Payloads that need coercion or are malformed return None, so validating the protocol
+    model still decides whether they are accepted.
+    """
+    method = message.get("method")
+    event_type = _EVENT_TYPES.get(method) if isinstance(method, str) else None
+    return None if event_type is None else event_type.from_message(message)
+
+
+def _delta_fields(message: JsonObject) -> tuple[str, str, str, str, int | None] | None:
+    params = message.get("params")
+    emitted_at_ms = message.get("emittedAtMs")
+    if not isinstance(params, dict) or (
+        emitted_at_ms is not None and type(emitted_at_ms) is not int
+    ):
+        return None
+    thread_id = params.get("threadId")
+    turn_id = params.get("turnId")
+    item_id = params.get("itemId")
+    delta = params.get("delta")
+    if (
+        type(thread_id) is not str
+        or type(turn_id) is not str
+        or type(item_id) is not str
+        or type(delta) is not str
+    ):
+        return None
+    return thread_id, turn_id, item_id, delta, emitted_at_ms
+
+
+def _stream_key(event: DeltaEvent) -> tuple[object, ...]:
+    return tuple(
+        getattr(event, field.name)
+        for field in dataclasses.fields(event)
+        if field.name not in ("delta", "emittedAtMs")
+    )
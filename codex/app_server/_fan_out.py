@@ -0,0 +1,145 @@
+"""Concurrent fan-out of independent turns across threads and connections."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator, Iterable, Iterator, Sequence
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from codex.app_server._payloads import TurnInput
+from codex.app_server.errors import AppServerRpcError
+from codex.app_server.options import AppServerThreadStartOptions, AppServerTurnOptions
+
+if TYPE_CHECKING:
+    from codex.app_server._async_client import AsyncAppServerClient
+    from codex.app_server._async_threads import AsyncAppServerThread
+
+
+@dataclass(frozen=True, slots=True)
+class MappedTurn:
+    """Outcome of one input passed to `AsyncAppServerClient.map_turns()`."""
+
+    index: int
+    """Position of the input in the `inputs` iterable."""
+    input: TurnInput
+    thread_id: str | None
+    """Thread the turn ran on, or None when the thread could not be started."""
+    final_text: str | None
+    """Final assistant message text, or None when the turn failed."""
+    error: Exception | None
+    """Why the thread or turn failed, or None on success."""
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+async def map_turns(
+    clients: Sequence[AsyncAppServerClient],
+    inputs: Iterable[TurnInput],
+    *,
+    concurrency: int,
+    thread_options: AppServerThreadStartOptions | None,
+    turn_options: AppServerTurnOptions | None,
+    reuse_threads: bool,
+    ordered: bool,
+) -> AsyncGenerator[MappedTurn]:
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    pending = enumerate(inputs)
+    results: asyncio.Queue[MappedTurn | None] = asyncio.Queue()
+    # In input order, a result waits in `held` until every earlier one is yielded. Workers
+    # take a slot per input and it is only returned on yield, so `held` stays below
+    # `concurrency` even when one early turn is much slower than the rest.
+    slots = asyncio.Semaphore(concurrency) if ordered else None
+    workers = [
+        asyncio.create_task(
+            _run_worker(
+                clients[index % len(clients)],
+                pending,
+                results,
+                slots,
+                thread_options=thread_options,
+                turn_options=turn_options,
+                reuse_threads=reuse_threads,
+            )
+        )
+        for index in range(concurrency)
+    ]
+    try:
+        running = len(workers)
+        held: dict[int, MappedTurn] = {}
+        next_index = 0
+        while running:
+            result = await results.get()
+            if result is None:
+                running -= 1
+                continue
+            if not ordered:
+                yield result
+                continue
+            held[result.index] = result
+            while next_index in held:
+                if slots is not None:
+                    slots.release()
+                yield held.pop(next_index)
+                next_index += 1
+        # A worker that raised (rather than recording a per-input error) ends the run.
+        for worker in workers:
+            worker.result()
+    finally:
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+async def _run_worker(
+    client: AsyncAppServerClient,
+    pending: Iterator[tuple[int, TurnInput]],
+    results: asyncio.Queue[MappedTurn | None],
+    slots: asyncio.Semaphore | None,
+    *,
+    thread_options: AppServerThreadStartOptions | None,
+    turn_options: AppServerTurnOptions | None,
+    reuse_threads: bool,
+) -> None:
+    thread: AsyncAppServerThread | None = None
+    try:
+        while True:
+            if slots is not None:
+                await slots.acquire()
+            # Workers share one iterator, so each input is claimed by exactly one of them.
+            claimed = next(pending, None)
+            if claimed is None:
+                if slots is not None:
+                    slots.release()
+                return
+            index, input = claimed
+            if thread is None:
+                try:
+                    thread = await client.start_thread(thread_options)
+                except Exception as exc:
+                    results.put_nowait(MappedTurn(index, input, None, None, exc))
+                    continue
+            try:
+                text = await thread.run_text(input, turn_options)
+            except Exception as exc:
+                results.put_nowait(MappedTurn(index, input, thread.id, None, exc))
+            else:
+                results.put_nowait(MappedTurn(index, input, thread.id, text, None))
+            finally:
+                if not reuse_threads:
+                    await _release(thread)
+                    thread = None
+    finally:
+        if thread is not None:
+            await _release(thread)
+        results.put_nowait(None)
+
+
+async def _release(thread: AsyncAppServerThread) -> None:
+    # Unsubscribe so the server can unload the thread instead of keeping every one loaded.
+    with suppress(AppServerRpcError):
+        await thread.unsubscribe()
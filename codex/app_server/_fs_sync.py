@@ -0,0 +1,230 @@
+"""Copy a local directory tree to the app-server host with concurrent uploads."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Protocol
+
+from codex.app_server._uploads import UploadSource
+
+_MANIFEST_VERSION = 1
+
+
+class _FsClientLike(Protocol):
+    async def create_directory(self, *, path: str, recursive: bool | None = True) -> object: ...
+
+    async def upload(self, *, path: str, source: UploadSource, chunk_size: int) -> int: ...
+
+
+@dataclass(frozen=True, slots=True)
+class FsSyncResult:
+    """Outcome of `AsyncFsClient.sync_tree()`."""
+
+    files_written: int
+    files_skipped: int
+    """Files whose content matched the manifest, so they were not sent."""
+    directories_created: int
+    bytes_written: int
+    seconds: float
+    """Wall-clock time of the whole sync, including hashing."""
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_written / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclass(slots=True)
+class _FileState:
+    size: int
+    mtime_ns: int
+    sha256: str
+
+
+async def sync_tree(
+    fs: _FsClientLike,
+    local_dir: str | os.PathLike[str],
+    remote_dir: str,
+    *,
+    manifest: str | os.PathLike[str] | None,
+    concurrency: int,
+    chunk_size: int,
+) -> FsSyncResult:
+    """Upload every file under `local_dir` that changed since the last sync to `remote_dir`.
+
+    The tree is listed in a worker thread, then `concurrency` workers hash and upload
+    files in parallel. A directory is created, once, by the first file that needs it,
+    so writes into one directory start while others are still being created. With a
+    manifest, a file is skipped when its SHA-256 matches the one recorded after the
+    last upload to the same `remote_dir`; files whose size and mtime are unchanged are
+    not even re-read. Without one, every file is uploaded and nothing is hashed. The
+    manifest is saved even when the sync fails part way, so a retry resumes where it
+    stopped.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    started = time.perf_counter()
+    root = Path(local_dir)
+    if not root.is_dir():
+        raise NotADirectoryError(f"{root} is not a directory")
+    manifest_path = None if manifest is None else Path(manifest)
+    known_files, known_dirs = _load_manifest(manifest_path, remote_dir)
+    files: dict[str, _FileState] = {}
+    visited: set[str] = set()
+    directories: set[str] = set()
+    creating: dict[str, asyncio.Future[object]] = {}
+    written = skipped = created = sent = 0
+
+    async def ensure_directory(relative: str) -> None:
+        nonlocal created
+        if relative in directories:
+            return
+        first = relative not in creating
+        if first:
+            creating[relative] = asyncio.ensure_future(
+                fs.create_directory(path=_remote_path(remote_dir, relative), recursive=True)
+            )
+        await creating[relative]
+        if first:
+            directories.add(relative)
+            created += 1
+
+    async def sync_file(relative: str, path: Path) -> None:
+        nonlocal skipped
+        visited.add(relative)
+        if manifest_path is None:
+            await upload(relative, path)
+            return
+        known = known_files.get(relative)
+        state = await asyncio.to_thread(_file_state, path, known)
+        if known is not None and known.sha256 == state.sha256:
+            files[relative] = state
+            skipped += 1
+            return
+        await upload(relative, path)
+        files[relative] = state
+
+    async def upload(relative: str, path: Path) -> None:
+        nonlocal written, sent
+        parent = relative.rpartition("/")[0]
+        if parent not in known_dirs:
+            await ensure_directory(parent)
+        size = await fs.upload(
+            path=_remote_path(remote_dir, relative), source=path, chunk_size=chunk_size
+        )
+        sent += size
+        written += 1
+
+    async def work(jobs: Iterator[tuple[str, Path | None]]) -> None:
+        for relative, path in jobs:
+            if path is None:
+                await ensure_directory(relative)
+            else:
+                await sync_file(relative, path)
+
+    jobs = iter(await asyncio.to_thread(_walk, root, skip=manifest_path, known_dirs=known_dirs))
+    workers = [asyncio.create_task(work(jobs)) for _ in range(concurrency)]
+    complete = False
+    try:
+        await asyncio.gather(*workers)
+        complete = True
+    finally:
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, *creating.values(), return_exceptions=True)
+        if manifest_path is not None:
+            if not complete:
+                # Keep what the last sync recorded for files this one never reached.
+                unvisited = {k: v for k, v in known_files.items() if k not in visited}
+                files = unvisited | files
+            _save_manifest(manifest_path, remote_dir, files, directories | known_dirs)
+    return FsSyncResult(
+        files_written=written,
+        files_skipped=skipped,
+        directories_created=created,
+        bytes_written=sent,
+        seconds=time.perf_counter() - started,
+    )
+
+
+def _walk(root: Path, *, skip: Path | None, known_dirs: set[str]) -> list[tuple[str, Path | None]]:
+    """List (relative path, file) for each file, and (relative dir, None) for new empty dirs."""
+    return list(_iter_tree(root, skip=skip, known_dirs=known_dirs))
+
+
+def _iter_tree(
+    root: Path, *, skip: Path | None, known_dirs: set[str]
+) -> Iterator[tuple[str, Path | None]]:
+    skip = None if skip is None else skip.resolve()
+    for current, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        relative_dir = Path(current).relative_to(root).as_posix()
+        relative_dir = "" if relative_dir == "." else relative_dir
+        if not dirnames and not filenames and relative_dir not in known_dirs:
+            yield relative_dir, None
+        for name in sorted(filenames):
+            path = Path(current, name)
+            if skip is not None and path.resolve() == skip:
+                continue
+            yield f"{relative_dir}/{name}" if relative_dir else name, path
+
+
+def _remote_path(remote_dir: str, relative: str) -> str:
+    if not relative:
+        return remote_dir
+    if "\\" in remote_dir and "/" not in remote_dir:
+        return remote_dir.rstrip("\\") + "\\" + relative.replace("/", "\\")
+    return f"{remote_dir.rstrip('/')}/{relative}"
+
+
+def _file_state(path: Path, known: _FileState | None) -> _FileState:
+    # A file whose size and mtime match the manifest keeps its recorded hash unread.
+    stat = path.stat()
+    if known is not None and (known.size, known.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+        return known
+    return _FileState(stat.st_size, stat.st_mtime_ns, _sha256(path))
+
+
+def _sha256(path: Path) -> str:
+    with path.open("rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+
+def _load_manifest(path: Path | None, remote_dir: str) -> tuple[dict[str, _FileState], set[str]]:
+    if path is None or not path.exists():
+        return {}, set()
+    try:
+        data: Any = json.loads(path.read_text("utf-8"))
+        if data.get("version") != _MANIFEST_VERSION or data.get("remote_dir") != remote_dir:
+            return {}, set()
+        files = {
+            relative: _FileState(entry["size"], entry["mtime_ns"], entry["sha256"])
+            for relative, entry in data["files"].items()
+        }
+        return files, set(data["directories"])
+    except (ValueError, KeyError, TypeError, AttributeError):
+        # A corrupt manifest only costs a full upload.
+        return {}, set()
+
+
+def _save_manifest(
+    path: Path, remote_dir: str, files: dict[str, _FileState], directories: set[str]
+) -> None:
+    data = {
+        "version": _MANIFEST_VERSION,
+        "remote_dir": remote_dir,
+        "directories": sorted(directories),
+        "files": {
+            relative: {"size": state.size, "mtime_ns": state.mtime_ns, "sha256": state.sha256}
+            for relative, state in sorted(files.items())
+        },
+    }
+    temporary = path.with_name(f"{path.name}.tmp")
+    temporary.write_text(json.dumps(data, indent=1), "utf-8")
+    os.replace(temporary, path)
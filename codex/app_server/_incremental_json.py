@@ -0,0 +1,243 @@
+"""Incremental parsing of JSON text that arrives in chunks, such as structured output deltas."""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Collection, Sequence
+from dataclasses import dataclass
+
+from codex.protocol import types as protocol
+
+type JsonPath = tuple[str | int, ...]
+
+# Characters that change parser state outside strings, and inside them.
+_STRUCTURAL = re.compile(r'[{}\[\],:"]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+WILDCARD = "*"
+
+
+@dataclass(slots=True)
+class _Frame:
+    closer: str
+    key: str | int | None
+    expects_key: bool = False
+
+
+class IncrementalJsonParser:
+    """Scan JSON text chunk by chunk and return values as soon as they are complete.
+
+    `feed()` returns the values that completed at `path`, a sequence of object keys
+    and array indexes in which `"*"` matches any key or index. For example
+    `("records", "*")` yields each element of the top-level `records` array once its
+    closing delimiter arrives. Only those values are handed to `json.loads`; the
+    rest of the document is scanned, not parsed. `partial()` returns the document
+    so far with every unfinished container closed and unfinished scalars left out.
+    """
+
+    def __init__(self, path: Sequence[str | int] = (WILDCARD,)) -> None:
+        if not path:
+            raise ValueError("path must name at least one key or index")
+        self.path: JsonPath = tuple(path)
+        self._chunks: list[str] = []
+        self._length = 0
+        self._stack: list[_Frame] = []
+        self._in_string = False
+        self._escape = False
+        self._key_parts: list[str] | None = None
+        # (chunk index, offset, stack depth) where the watched value's text starts.
+        self._capture: tuple[int, int, int] | None = None
+        self._safe_end = 0
+        self._safe_closers = ""
+
+    def feed(self, chunk: str) -> list[object]:
+        """Consume `chunk` and return the values at `path` that it completed, in order.
+
+        Raises `ValueError` when a completed value is not valid JSON; the parser cannot
+        be fed again after that.
+        """
+        completed: list[object] = []
+        if not chunk:
+            return completed
+        chunk_index = len(self._chunks)
+        base = self._length
+        self._chunks.append(chunk)
+        self._length += len(chunk)
+        pos = 0
+        end = len(chunk)
+        while pos < end:
+            if self._in_string:
+                pos = self._scan_string(chunk, pos, base)
+                continue
+            match = _STRUCTURAL.search(chunk, pos)
+            if match is None:
+                break
+            char = match.group()
+            index = match.start()
+            pos = index + 1
+            frame = self._stack[-1] if self._stack else None
+            if char == '"':
+                self._in_string = True
+                expects_key = frame is not None and frame.expects_key
+                self._key_parts = [] if expects_key else None
+            elif char == "{" or char == "[":
+                if char == "[":
+                    self._stack.append(_Frame("]", 0))
+                    self._open_slot(chunk_index, pos)
+                else:
+                    self._stack.append(_Frame("}", None, expects_key=True))
+                self._mark_safe(base + pos)
+            elif frame is None:
+                continue
+            elif char == ":":
+                frame.expects_key = False
+                self._open_slot(chunk_index, pos)
+            elif char == ",":
+                self._close_slot(chunk_index, index, completed)
+                self._mark_safe(base + index)
+                if isinstance(frame.key, int):
+                    frame.key += 1
+                    self._open_slot(chunk_index, pos)
+                else:
+                    frame.expects_key = True
+            else:
+                self._close_slot(chunk_index, index, completed)
+                self._stack.pop()
+                self._mark_safe(base + pos)
+        return completed
+
+    def partial(self) -> object | None:
+        """Return the value parsed so far, or None before the first container opens."""
+        if not self._safe_end:
+            return None
+        text = "".join(self._chunks)
+        try:
+            value: object = json.loads(text[: self._safe_end] + self._safe_closers)
+        except ValueError:
+            return None
+        return value
+
+    @property
+    def text(self) -> str:
+        """All text fed so far."""
+        return "".join(self._chunks)
+
+    def _scan_string(self, chunk: str, pos: int, base: int) -> int:
+        key_parts = self._key_parts
+        if self._escape:
+            self._escape = False
+            if key_parts is not None:
+                key_parts.append(chunk[pos])
+            return pos + 1
+        match = _STRING_SPECIAL.search(chunk, pos)
+        if match is None:
+            if key_parts is not None:
+                key_parts.append(chunk[pos:])
+            return len(chunk)
+        if match.group() == "\\":
+            self._escape = True
+            if key_parts is not None:
+                key_parts.append(chunk[pos : match.end()])
+            return match.end()
+        self._in_string = False
+        if key_parts is not None:
+            key_parts.append(chunk[pos : match.start()])
+            self._stack[-1].key = json.loads('"' + "".join(key_parts) + '"')
+            self._key_parts = None
+        else:
+            self._mark_safe(base + match.end())
+        return match.end()
+
+    def _open_slot(self, chunk_index: int, offset: int) -> None:
+        if self._capture is not None or len(self._stack) != len(self.path):
+            return
+        for frame, expected in zip(self._stack, self.path, strict=True):
+            if expected != WILDCARD and frame.key != expected:
+                return
+        self._capture = (chunk_index, offset, len(self._stack))
+
+    def _close_slot(self, chunk_index: int, offset: int, completed: list[object]) -> None:
+        capture = self._capture
+        if capture is None or capture[2] != len(self._stack):
+            return
+        self._capture = None
+        start_index, start_offset, _ = capture
+        if start_index == chunk_index:
+            text = self._chunks[chunk_index][start_offset:offset]
+        else:
+            text = "".join(
+                [
+                    self._chunks[start_index][start_offset:],
+                    *self._chunks[start_index + 1 : chunk_index],
+                    self._chunks[chunk_index][:offset],
+                ]
+            )
+        if text.strip():
+            completed.append(json.loads(text))
+
+    def _mark_safe(self, offset: int) -> None:
+        self._safe_end = offset
+        self._safe_closers = "".join(frame.closer for frame in reversed(self._stack))
+
+
+class _MessageJsonFeed:
+    """Incremental parse of one turn's agent-message deltas, restarted for each new message.
+
+    Messages in `skip_items`, such as commentary, are not parsed. A message that turns
+    out not to be JSON, for example prose like "Checking [files, tests] now", stops
+    being parsed at the first invalid value, and the values it yielded so far are kept.
+    """
+
+    def __init__(
+        self, path: JsonPath, item_id: str | None, text: str, skip_items: Collection[str]
+    ) -> None:
+        self.path = path
+        self._item_id = item_id
+        self._skip_items = skip_items
+        self._parser = IncrementalJsonParser(path)
+        self._invalid = False
+        self._pending: list[object] = []
+        self._emitted = 0
+        if item_id not in skip_items:
+            self._feed(text)
+
+    def feed(self, item_id: str, delta: str) -> None:
+        if item_id != self._item_id:
+            self._item_id = item_id
+            self._parser = IncrementalJsonParser(self.path)
+            self._invalid = False
+            self._pending = []
+            self._emitted = 0
+        if not self._invalid and item_id not in self._skip_items:
+            self._feed(delta)
+
+    def _feed(self, text: str) -> None:
+        try:
+            self._pending.extend(self._parser.feed(text))
+        except ValueError:
+            self._invalid = True
+
+    def partial(self) -> object | None:
+        return None if self._invalid else self._parser.partial()
+
+    def drain(self) -> list[object]:
+        values, self._pending = self._pending, []
+        self._emitted += len(values)
+        return values
+
+    def finish(self, message: protocol.AgentMessageThreadItem | None) -> list[object]:
+        """Return the values in the completed message that `drain()` has not returned yet.
+
+        The completed item's text is authoritative, so values are taken from it rather
+        than from the deltas; this also covers messages that streamed no deltas.
+        """
+        if message is None or message.id in self._skip_items:
+            return self.drain()
+        emitted = self._emitted if message.id == self._item_id else 0
+        try:
+            values = IncrementalJsonParser(self.path).feed(message.text)
+        except ValueError:
+            return self.drain()
+        self._pending = []
+        self._emitted = len(values)
+        return values[emitted:]
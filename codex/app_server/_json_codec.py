@@ -0,0 +1,105 @@
+"""Pluggable JSON encoding for app-server transports."""
+
+from __future__ import annotations
+
+import importlib
+import json
+from typing import Any, Literal, Protocol, runtime_checkable
+
+from codex.app_server._types import JsonObject
+from codex.app_server.errors import AppServerConnectionError
+
+type JsonCodecName = Literal["auto", "stdlib", "orjson", "msgspec"]
+type JsonPayload = bytes | bytearray | memoryview | str
+
+
+@runtime_checkable
+class JsonCodec(Protocol):
+    """Encode and decode single app-server JSON messages.
+
+    `encode` returns one compact UTF-8 JSON document without a trailing newline.
+    `decode` accepts UTF-8 text or any bytes-like buffer, which may be a `memoryview`
+    into the transport's read buffer that is only valid during the call, and raises
+    `ValueError` on malformed input.
+    """
+
+    def encode(self, message: JsonObject) -> bytes: ...
+
+    def decode(self, payload: JsonPayload) -> object: ...
+
+
+class StdlibJsonCodec:
+    """Codec backed by the standard-library `json` module."""
+
+    def __init__(self) -> None:
+        self._encoder = json.JSONEncoder(separators=(",", ":"))
+        self._decoder = json.JSONDecoder()
+
+    def encode(self, message: JsonObject) -> bytes:
+        return self._encoder.encode(message).encode("utf-8")
+
+    def decode(self, payload: JsonPayload) -> object:
+        text = payload if isinstance(payload, str) else str(payload, "utf-8")
+        return self._decoder.decode(text)
+
+
+class OrjsonCodec:
+    """Codec backed by the optional `orjson` package."""
+
+    def __init__(self) -> None:
+        self._orjson = _load_optional_module("orjson")
+
+    def encode(self, message: JsonObject) -> bytes:
+        encoded: bytes = self._orjson.dumps(message)
+        return encoded
+
+    def decode(self, payload: JsonPayload) -> object:
+        # orjson.JSONDecodeError subclasses ValueError.
+        return self._orjson.loads(payload)
+
+
+class MsgspecJsonCodec:
+    """Codec backed by the optional `msgspec` package."""
+
+    def __init__(self) -> None:
+        msgspec = _load_optional_module("msgspec")
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+        self._decode_error: type[Exception] = msgspec.DecodeError
+
+    def encode(self, message: JsonObject) -> bytes:
+        encoded: bytes = self._encoder.encode(message)
+        return encoded
+
+    def decode(self, payload: JsonPayload) -> object:
+        try:
+            return self._decoder.decode(payload)
+        except self._decode_error as exc:
+            raise ValueError(str(exc)) from exc
+
+
+def resolve_json_codec(codec: JsonCodecName | JsonCodec) -> JsonCodec:
+    """Return the codec for an option value; "auto" prefers orjson, then msgspec."""
+    if not isinstance(codec, str):
+        return codec
+    if codec == "stdlib":
+        return StdlibJsonCodec()
+    if codec == "orjson":
+        return OrjsonCodec()
+    if codec == "msgspec":
+        return MsgspecJsonCodec()
+    for candidate in (OrjsonCodec, MsgspecJsonCodec):
+        try:
+            return candidate()
+        except AppServerConnectionError:
+            continue
+    return StdlibJsonCodec()
+
+
+def _load_optional_module(name: str) -> Any:
+    try:
+        return importlib.import_module(name)
+    except ImportError as exc:
+        raise AppServerConnectionError(
+            f"json_codec={name!r} requires the optional `{name}` package; install {name}"
+        ) from exc
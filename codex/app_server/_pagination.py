@@ -0,0 +1,71 @@
+"""Walk cursor-paginated app-server list methods page by page."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+from pydantic import BaseModel
+
+DEFAULT_PREFETCH = 1
+
+
+async def iter_pages[PageT: BaseModel](
+    fetch: Callable[[str | None], Awaitable[PageT]],
+    *,
+    cursor: str | None = None,
+    prefetch: int = DEFAULT_PREFETCH,
+) -> AsyncIterator[PageT]:
+    """Yield `fetch(cursor)` pages, following each page's next cursor until it is empty.
+
+    Each cursor comes from the previous page, so requests are still made one at a time.
+    With `prefetch` above 0, a task fetches up to that many pages ahead of the one the
+    caller is handling, so the round trip overlaps the caller's work instead of
+    following it. Closing the iterator early cancels the fetch in flight.
+    """
+    if prefetch < 0:
+        raise ValueError("prefetch must be >= 0")
+    if prefetch == 0:
+        while True:
+            page = await fetch(cursor)
+            yield page
+            cursor = next_cursor(page)
+            if cursor is None:
+                return
+    pages: asyncio.Queue[PageT | BaseException | None] = asyncio.Queue()
+    ahead = asyncio.Semaphore(prefetch)
+
+    async def produce(cursor: str | None) -> None:
+        try:
+            while True:
+                await ahead.acquire()
+                page = await fetch(cursor)
+                pages.put_nowait(page)
+                cursor = next_cursor(page)
+                if cursor is None:
+                    break
+        except Exception as exc:
+            pages.put_nowait(exc)
+            return
+        pages.put_nowait(None)
+
+    producer = asyncio.create_task(produce(cursor))
+    try:
+        while (item := await pages.get()) is not None:
+            if isinstance(item, BaseException):
+                raise item
+            ahead.release()
+            yield item
+    finally:
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+
+
+def next_cursor(page: BaseModel) -> str | None:
+    """Return the cursor for the page after `page`, or None on the last page.
+
+    Protocol responses name it `nextCursor` and SDK result models `next_cursor`; an empty
+    string is treated as the end as well, so a server echoing "" cannot loop forever.
+    """
+    cursor = getattr(page, "nextCursor", None) or getattr(page, "next_cursor", None)
+    return cursor if isinstance(cursor, str) and cursor else None
@@ -2,21 +2,24 @@ from __future__ import annotations
 
 from collections.abc import Awaitable, Callable, Mapping
 from functools import lru_cache
-from typing import get_args
+from typing import Any, cast, get_args
 
-from pydantic import BaseModel, ValidationError
+from pydantic import BaseModel, RootModel, ValidationError
 
+from codex.app_server._delta_events import AgentMessageDeltaEvent, DeltaEvent
+from codex.app_server._trusted_models import model_builder
 from codex.app_server._types import JsonObject
 from codex.app_server.errors import AppServerProtocolError
 from codex.app_server.models import GenericNotification, GenericServerRequest
+from codex.app_server.options import ProtocolValidationMode
 from codex.protocol import types as protocol
 
 type RequestHandler[RequestT: BaseModel] = Callable[[RequestT], object | Awaitable[object]]
-type Notification = protocol.ServerNotificationValue | GenericNotification
+type Notification = protocol.ServerNotificationValue | GenericNotification | DeltaEvent
 type ServerRequest = protocol.ServerRequestValue | GenericServerRequest
 
 
-def method_name(message: BaseModel) -> str:
+def method_name(message: BaseModel | DeltaEvent) -> str:
     if isinstance(message, GenericNotification | GenericServerRequest):
         return message.method
     method = getattr(message, "method", None)
@@ -47,11 +50,14 @@ def parse_result[ModelT: BaseModel](
     result_model: type[ModelT],
     *,
     method: str | None = None,
+    validation: ProtocolValidationMode = "full",
 ) -> ModelT:
     if isinstance(result, result_model):
         return result
     payload = {} if result is None else result
     try:
+        if validation != "full":
+            return model_builder(result_model, validation)(payload)
         return result_model.model_validate(payload)
     except ValidationError as exc:
         method_context = f" for app-server method {method!r}" if method is not None else ""
@@ -60,7 +66,7 @@ def parse_result[ModelT: BaseModel](
         ) from exc
 
 
-def extract_thread_id(notification: BaseModel) -> str | None:
+def extract_thread_id(notification: BaseModel | DeltaEvent) -> str | None:
     params = getattr(notification, "params", None)
     if params is None:
         return None
@@ -68,7 +74,7 @@ def extract_thread_id(notification: BaseModel) -> str | None:
     return thread_id if isinstance(thread_id, str) else None
 
 
-def extract_turn_id(notification: BaseModel) -> str | None:
+def extract_turn_id(notification: BaseModel | DeltaEvent) -> str | None:
     params = getattr(notification, "params", None)
     if params is None:
         return None
@@ -81,34 +87,65 @@ def extract_turn_id(notification: BaseModel) -> str | None:
     return None
 
 
-def extract_item(notification: BaseModel) -> protocol.ThreadItem | None:
+def extract_item(notification: BaseModel | DeltaEvent) -> protocol.ThreadItem | None:
     params = getattr(notification, "params", None)
     item = getattr(params, "item", None) if params is not None else None
     return item if isinstance(item, protocol.ThreadItem) else None
 
 
-def extract_turn(notification: BaseModel) -> protocol.Turn | None:
+def extract_turn(notification: BaseModel | DeltaEvent) -> protocol.Turn | None:
     params = getattr(notification, "params", None)
     turn = getattr(params, "turn", None) if params is not None else None
     return turn if isinstance(turn, protocol.Turn) else None
 
 
-def extract_text_delta(notification: BaseModel) -> str | None:
-    if isinstance(notification, protocol.ItemAgentMessageDeltaNotification):
+def extract_text_delta(notification: BaseModel | DeltaEvent) -> str | None:
+    if isinstance(
+        notification, AgentMessageDeltaEvent | protocol.ItemAgentMessageDeltaNotification
+    ):
         return notification.params.delta
     return None
 
 
-def extract_token_usage(notification: BaseModel) -> protocol.ThreadTokenUsage | None:
+def extract_token_usage(notification: BaseModel | DeltaEvent) -> protocol.ThreadTokenUsage | None:
     if isinstance(notification, protocol.ThreadTokenUsageUpdatedNotificationModel):
         return notification.params.tokenUsage
     return None
 
 
-def parse_notification(message: JsonObject, *, strict: bool) -> Notification:
+def merge_delta_notifications(
+    previous: BaseModel | DeltaEvent, current: BaseModel | DeltaEvent
+) -> Notification | None:
+    """Merge two consecutive text deltas for the same stream, or return `None`."""
+    if isinstance(previous, DeltaEvent):
+        return previous.merge(current) if isinstance(current, DeltaEvent) else None
+    if type(previous) is not type(current):
+        return None
+    previous_params = getattr(previous, "params", None)
+    current_params = getattr(current, "params", None)
+    if not isinstance(previous_params, BaseModel) or not isinstance(current_params, BaseModel):
+        return None
+    previous_delta = getattr(previous_params, "delta", None)
+    current_delta = getattr(current_params, "delta", None)
+    if not isinstance(previous_delta, str) or not isinstance(current_delta, str):
+        return None
+    if previous_params.model_dump(exclude={"delta"}) != current_params.model_dump(
+        exclude={"delta"}
+    ):
+        return None
+    merged_params = previous_params.model_copy(update={"delta": previous_delta + current_delta})
+    return cast(Notification, previous.model_copy(update={"params": merged_params}))
+
+
+def parse_notification(
+    message: JsonObject, *, strict: bool, validation: ProtocolValidationMode = "full"
+) -> Notification:
     method = message.get("method")
     try:
-        return protocol.ServerNotification.model_validate(message).root
+        return cast(
+            Notification,
+            _validate_by_method(protocol.ServerNotification, method, message, validation),
+        )
     except ValidationError as exc:
         if (
             strict
@@ -124,10 +161,15 @@ def parse_notification(message: JsonObject, *, strict: bool) -> Notification:
         raise AppServerProtocolError(_notification_error_message(message)) from exc
 
 
-def parse_server_request(message: JsonObject, *, strict: bool) -> ServerRequest:
+def parse_server_request(
+    message: JsonObject, *, strict: bool, validation: ProtocolValidationMode = "full"
+) -> ServerRequest:
     method = message.get("method")
     try:
-        return protocol.ServerRequest.model_validate(message).root
+        return cast(
+            ServerRequest,
+            _validate_by_method(protocol.ServerRequest, method, message, validation),
+        )
     except ValidationError as exc:
         if (
             strict
@@ -148,6 +190,42 @@ def parse_server_request(message: JsonObject, *, strict: bool) -> ServerRequest:
         return GenericServerRequest(id=raw_id, method=method, params=params_payload)
 
 
+def _validate_by_method(
+    root_model: type[RootModel[Any]],
+    method: object,
+    message: JsonObject,
+    validation: ProtocolValidationMode = "full",
+) -> BaseModel:
+    model = _method_models(root_model).get(method) if isinstance(method, str) else None
+    if model is None:
+        return cast(BaseModel, root_model.model_validate(message).root)
+    if validation != "full":
+        return model_builder(model, validation)(message)
+    return model.model_validate(message)
+
+
+def _build_method_models(*, root_model: type[BaseModel]) -> dict[str, type[BaseModel]]:
+    root_field = getattr(root_model, "model_fields", {}).get("root")
+    if root_field is None:
+        return {}
+    annotation = _unwrap_type_alias(root_field.annotation)
+    models: dict[str, type[BaseModel]] = {}
+    ambiguous: set[str] = set()
+    for candidate in get_args(annotation):
+        if not isinstance(candidate, type) or not issubclass(candidate, BaseModel):
+            continue
+        method = _candidate_method_literal(candidate)
+        if method is None:
+            continue
+        if method in models:
+            ambiguous.add(method)
+        models[method] = candidate
+    # Methods shared by several variants keep validating through the full union.
+    for method in ambiguous:
+        del models[method]
+    return models
+
+
 def _build_known_methods(*, root_model: type[BaseModel]) -> frozenset[str]:
     root_field = getattr(root_model, "model_fields", {}).get("root")
     if root_field is None:
@@ -193,6 +271,11 @@ def _known_methods(root_model: type[BaseModel]) -> frozenset[str]:
     return _build_known_methods(root_model=root_model)
 
 
+@lru_cache(maxsize=2)
+def _method_models(root_model: type[BaseModel]) -> dict[str, type[BaseModel]]:
+    return _build_method_models(root_model=root_model)
+
+
 def _notification_error_message(message: JsonObject) -> str:
     method = message.get("method")
     if isinstance(method, str):
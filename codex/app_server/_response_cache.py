@@ -0,0 +1,164 @@
+"""Client-side cache for app-server catalog reads that rarely change."""
+
+from __future__ import annotations
+
+import copy
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Collection, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic import BaseModel
+
+from codex.app_server._payloads import serialize_value
+from codex.app_server.options import AppServerCacheOptions
+
+type _CacheKey = tuple[str, str]
+
+# Params that ask the server to bypass its own caches; the SDK cache is bypassed too.
+_REFRESH_PARAMS = ("forceRefetch", "forceRefresh", "forceReload")
+_ALL: frozenset[str] = frozenset()
+# Requests that change what cached methods return, mapped to the methods they affect.
+# `_ALL` drops every entry, since config and account changes reach every catalog.
+_WRITE_INVALIDATIONS: dict[str, frozenset[str]] = {
+    "account/logout": _ALL,
+    "config/batchWrite": _ALL,
+    "config/mcpServer/reload": _ALL,
+    "config/value/write": _ALL,
+    "externalAgentConfig/import": _ALL,
+    "plugin/install": _ALL,
+    "plugin/uninstall": _ALL,
+    "skills/config/write": frozenset({"skills/list"}),
+    "skills/extraRoots/set": frozenset({"skills/list"}),
+    # Skills are files on disk, which commands and filesystem writes can add or change.
+    "command/exec": frozenset({"skills/list"}),
+    "fs/copy": frozenset({"skills/list"}),
+    "fs/createDirectory": frozenset({"skills/list"}),
+    "fs/remove": frozenset({"skills/list"}),
+    "fs/writeFile": frozenset({"skills/list"}),
+}
+_NOTIFICATION_INVALIDATIONS: dict[str, frozenset[str]] = {
+    "account/updated": frozenset({"app/list", "model/list"}),
+    "app/list/updated": frozenset({"app/list"}),
+    "externalAgentConfig/import/completed": _ALL,
+    "skills/changed": frozenset({"skills/list"}),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class AppServerCacheStats:
+    """Snapshot of the response cache on one app-server connection."""
+
+    hits: int
+    """Requests answered from the cache without a round trip."""
+    misses: int
+    """Cacheable requests sent to the server, including expired and refreshed entries."""
+    evictions: int
+    """Entries dropped to stay within `maxsize`."""
+    invalidations: int
+    """Entries dropped by writes, notifications, reconnects, or `invalidate_cache()`."""
+    size: int
+    """Entries currently cached."""
+
+
+@dataclass(slots=True)
+class _Entry:
+    expires_at: float
+    result: object
+
+
+class _ResponseCache:
+    """Least-recently-used map from a request's method and params to its raw result.
+
+    Results are stored as decoded JSON and deep-copied on the way in and out, so a
+    caller mutating a returned value, or a "trusted" model sharing its lists, cannot
+    change what later hits see. Each invalidation bumps a generation counter, and a
+    response is only stored if no invalidation happened while it was in flight, so a
+    read that raced a write never caches the value from before the write.
+    """
+
+    def __init__(self, options: AppServerCacheOptions) -> None:
+        self._ttl = options.ttl
+        self._maxsize = options.maxsize
+        self._entries: OrderedDict[_CacheKey, _Entry] = OrderedDict()
+        self.generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    @property
+    def stats(self) -> AppServerCacheStats:
+        return AppServerCacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            invalidations=self._invalidations,
+            size=len(self._entries),
+        )
+
+    def key(
+        self, method: str, params: BaseModel | Mapping[str, Any] | None
+    ) -> tuple[_CacheKey, bool] | None:
+        """Return a request's cache key and whether it asks for a refresh, or None if uncached.
+
+        Refresh flags such as `skills/list` `forceReload` are left out of the key, so a
+        forced request misses and replaces the entry that ordinary requests read.
+        """
+        if method not in self._ttl:
+            return None
+        payload = {} if params is None else serialize_value(params)
+        if not isinstance(payload, dict):
+            return None
+        refresh = any(payload.pop(name, None) is True for name in _REFRESH_PARAMS)
+        return (method, json.dumps(payload, sort_keys=True, separators=(",", ":"))), refresh
+
+    def get(self, key: _CacheKey, *, refresh: bool = False) -> object | None:
+        """Return a copy of the live result cached under `key`, or None on a miss."""
+        entry = self._entries.get(key)
+        if refresh or entry is None or entry.expires_at <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return copy.deepcopy(entry.result)
+
+    def put(self, key: _CacheKey, result: object, generation: int) -> None:
+        if generation != self.generation:
+            return
+        ttl = self._ttl[key[0]]
+        self._entries[key] = _Entry(time.monotonic() + ttl, copy.deepcopy(result))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def invalidate(self, methods: Collection[str] | None = None) -> int:
+        """Drop entries for `methods`, or every entry when None; return how many were dropped."""
+        self.generation += 1
+        if methods is None:
+            dropped = len(self._entries)
+            self._entries.clear()
+        else:
+            stale = [key for key in self._entries if key[0] in methods]
+            for key in stale:
+                del self._entries[key]
+            dropped = len(stale)
+        self._invalidations += dropped
+        return dropped
+
+    def invalidate_for_request(self, method: str) -> None:
+        """Invalidate the entries a write request may have changed."""
+        methods = _WRITE_INVALIDATIONS.get(method)
+        if methods is not None:
+            self.invalidate(methods or None)
+
+    def invalidate_for_notification(self, method: str) -> None:
+        """Invalidate the entries a server notification reports as changed."""
+        methods = _NOTIFICATION_INVALIDATIONS.get(method)
+        if methods is not None:
+            self.invalidate(methods or None)
@@ -1,37 +1,176 @@
 from __future__ import annotations
 
 import asyncio
+import contextvars
+import copy
 import inspect
+import json
+import math
+import random
+import time
+from collections import deque
 from collections.abc import Awaitable, Callable, Collection, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
 from dataclasses import dataclass
 from typing import Any, TypeVar, cast
 
 from pydantic import BaseModel, ValidationError
 
+from codex.app_server._deadline import remaining_seconds
+from codex.app_server._delta_events import DeltaEvent, compact_delta_event
 from codex.app_server._payloads import serialize_value
 from codex.app_server._protocol_helpers import (
     Notification,
     RequestHandler,
+    merge_delta_notifications,
     method_name,
     parse_notification,
     parse_result,
     parse_server_request,
     request_id,
 )
+from codex.app_server._response_cache import AppServerCacheStats, _ResponseCache
 from codex.app_server.errors import (
     AppServerClosedError,
+    AppServerConnectionError,
     AppServerProtocolError,
     AppServerRpcError,
+    AppServerTimeoutError,
 )
 from codex.app_server.models import InitializeResult
-from codex.app_server.options import AppServerInitializeOptions
+from codex.app_server.options import (
+    AppServerInitializeOptions,
+    AppServerReconnectOptions,
+    NotificationOverflowPolicy,
+    ProtocolValidationMode,
+)
 from codex.app_server.transports import AsyncMessageTransport, JsonObject
 from codex.protocol import types as protocol
 
+_T = TypeVar("_T")
 _ModelT = TypeVar("_ModelT", bound=BaseModel)
 _RequestT = TypeVar("_RequestT", bound=BaseModel)
 _NotificationPredicate = Callable[[Notification], bool]
 _SubscriptionMessage = Notification | Exception | None
+_NotificationScope = tuple[str, str | None]
+
+# Scoped subscriptions receive these for every turn on their thread, not just their own.
+_THREAD_WIDE_METHODS = frozenset({"thread/tokenUsage/updated"})
+# Requests whose result loads a thread on this connection, and ones that release it.
+_THREAD_LOADING_METHODS = frozenset({"thread/start", "thread/resume", "thread/fork"})
+_THREAD_RELEASING_METHODS = frozenset({"thread/unsubscribe", "thread/archive"})
+# Most recent turns fetched per thread when catching turn streams up after a reconnect.
+_CATCH_UP_TURNS = 10
+# Notifications that end a turn; a full turn stream still delivers them.
+_TERMINAL_METHODS = frozenset({"turn/completed", "error"})
+
+
+def _method_of(message: _SubscriptionMessage) -> str | None:
+    method = getattr(message, "method", None)
+    method = getattr(method, "root", method)
+    return method if isinstance(method, str) else None
+
+
+class _NotificationQueue:
+    """Per-subscription buffer with an optional bound and overflow policy.
+
+    Control messages (close sentinels and reader failures) bypass the bound so
+    shutdown can never block on, or be dropped by, a full subscriber. The lossy
+    policies hold every other notification to `maxsize`, except the methods in
+    `keep`: turn streams keep their terminal notifications so a lagging consumer
+    still sees the turn end, and those may go past the bound.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 0,
+        overflow: NotificationOverflowPolicy = "block",
+        keep: frozenset[str] = frozenset(),
+    ) -> None:
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.keep = keep
+        self.dropped = 0
+        self.coalesced = 0
+        self._items: deque[_SubscriptionMessage] = deque()
+        self._readable = asyncio.Event()
+        self._writable = asyncio.Event()
+        self._closed = False
+
+    def empty(self) -> bool:
+        return not self._items
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    async def put(self, notification: Notification) -> None:
+        if self._closed:
+            return
+        if self.maxsize > 0 and len(self._items) >= self.maxsize:
+            if self.overflow == "block":
+                while len(self._items) >= self.maxsize and not self._closed:
+                    self._writable.clear()
+                    await self._writable.wait()
+                if self._closed:
+                    return
+            elif self.overflow == "coalesce" and self._coalesce_into_tail(notification):
+                self.coalesced += 1
+                return
+            elif self.overflow == "drop_newest" or not self._drop_oldest():
+                if not self._kept(notification):
+                    self.dropped += 1
+                    return
+        self._append(notification)
+
+    def put_control(self, message: Exception | None) -> None:
+        self._append(message)
+
+    async def get(self) -> _SubscriptionMessage:
+        while not self._items:
+            self._readable.clear()
+            await self._readable.wait()
+        return self.get_nowait()
+
+    def get_nowait(self) -> _SubscriptionMessage:
+        if not self._items:
+            raise asyncio.QueueEmpty
+        message = self._items.popleft()
+        self._writable.set()
+        return message
+
+    def close(self) -> None:
+        self._closed = True
+        self._items.clear()
+        self._writable.set()
+
+    def _append(self, message: _SubscriptionMessage) -> None:
+        self._items.append(message)
+        self._readable.set()
+
+    def _kept(self, message: _SubscriptionMessage) -> bool:
+        return message is None or isinstance(message, Exception) or _method_of(message) in self.keep
+
+    def _drop_oldest(self) -> bool:
+        # Kept messages are at most a few per stream, so this stops within the first few.
+        for index, message in enumerate(self._items):
+            if not self._kept(message):
+                del self._items[index]
+                self.dropped += 1
+                return True
+        return False
+
+    def _coalesce_into_tail(self, notification: Notification) -> bool:
+        if not self._items:
+            return False
+        tail = self._items[-1]
+        if tail is None or isinstance(tail, Exception):
+            return False
+        merged = merge_delta_notifications(tail, notification)
+        if merged is None:
+            return False
+        self._items[-1] = merged
+        return True
 
 
 class _NotificationSink:
@@ -39,22 +178,168 @@ class _NotificationSink:
         self,
         methods: set[str] | None = None,
         predicate: _NotificationPredicate | None = None,
+        *,
+        scope: _NotificationScope | None = None,
+        maxsize: int = 0,
+        overflow: NotificationOverflowPolicy = "block",
+        compact_deltas: bool = False,
     ) -> None:
         self.methods = methods
         self.predicate = predicate
-        self.queue: asyncio.Queue[_SubscriptionMessage] = asyncio.Queue()
+        self.scope = scope
+        self.compact_deltas = compact_deltas
+        # Scoped sinks are turn streams, which must see their turn end.
+        keep = _TERMINAL_METHODS if scope is not None else frozenset[str]()
+        self.queue = _NotificationQueue(maxsize, overflow, keep)
 
-    def matches(self, method: str, notification: Notification) -> bool:
-        if self.methods is not None and method not in self.methods:
-            return False
+    def accepts_method(self, method: object) -> bool:
+        return self.methods is None or (isinstance(method, str) and method in self.methods)
+
+    def accepts(self, notification: Notification) -> bool:
         return self.predicate is None or self.predicate(notification)
 
 
+class _NotificationRouter:
+    """Index of notification sinks by method and by `(threadId, turnId)` scope.
+
+    Routing works on the raw JSON message, so only the sinks that can match are
+    visited and a message nobody listens for is never validated. Scoped sinks are
+    indexed by thread and turn; unscoped sinks are indexed by method. Predicates
+    are still applied to the routed candidates as an escape hatch.
+    """
+
+    def __init__(self) -> None:
+        self._sinks: dict[_NotificationSink, None] = {}
+        self._any_method: list[_NotificationSink] = []
+        self._by_method: dict[str, list[_NotificationSink]] = {}
+        self._by_scope: dict[str, dict[str | None, list[_NotificationSink]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._sinks)
+
+    def sinks(self) -> list[_NotificationSink]:
+        return list(self._sinks)
+
+    def add(self, sink: _NotificationSink) -> None:
+        self._sinks[sink] = None
+        for bucket in self._buckets(sink, create=True):
+            bucket.append(sink)
+
+    def remove(self, sink: _NotificationSink) -> None:
+        if sink not in self._sinks:
+            return
+        del self._sinks[sink]
+        for bucket in self._buckets(sink, create=False):
+            bucket.remove(sink)
+        self._prune(sink)
+
+    def rescope(self, sink: _NotificationSink, scope: _NotificationScope | None) -> None:
+        registered = sink in self._sinks
+        self.remove(sink)
+        sink.scope = scope
+        if registered:
+            self.add(sink)
+
+    def turn_scopes(self) -> list[tuple[str, str]]:
+        """Return the `(threadId, turnId)` pairs that sinks currently follow."""
+        return [
+            (thread_id, turn_id)
+            for thread_id, turns in self._by_scope.items()
+            for turn_id in turns
+            if turn_id is not None
+        ]
+
+    def clear(self) -> None:
+        self._sinks.clear()
+        self._any_method.clear()
+        self._by_method.clear()
+        self._by_scope.clear()
+
+    def route(self, message: JsonObject) -> list[_NotificationSink]:
+        method = message.get("method")
+        candidates: list[_NotificationSink] = []
+        if isinstance(method, str):
+            candidates.extend(self._by_method.get(method, ()))
+        candidates.extend(self._any_method)
+        if not self._by_scope:
+            return candidates
+        params = message.get("params")
+        if not isinstance(params, dict):
+            return candidates
+        thread_id = params.get("threadId")
+        turns = self._by_scope.get(thread_id) if isinstance(thread_id, str) else None
+        if not turns:
+            return candidates
+        if method in _THREAD_WIDE_METHODS:
+            scoped = [sink for bucket in turns.values() for sink in bucket]
+        else:
+            scoped = list(turns.get(None, ()))
+            turn_id = _raw_turn_id(params)
+            if turn_id is not None:
+                scoped.extend(turns.get(turn_id, ()))
+        candidates.extend(sink for sink in scoped if sink.accepts_method(method))
+        return candidates
+
+    def _buckets(self, sink: _NotificationSink, *, create: bool) -> list[list[_NotificationSink]]:
+        if sink.scope is not None:
+            thread_id, turn_id = sink.scope
+            turns = (
+                self._by_scope.setdefault(thread_id, {})
+                if create
+                else self._by_scope.get(thread_id, {})
+            )
+            bucket = turns.setdefault(turn_id, []) if create else turns.get(turn_id)
+            return [] if bucket is None else [bucket]
+        if sink.methods is None:
+            return [self._any_method]
+        if create:
+            return [self._by_method.setdefault(method, []) for method in sink.methods]
+        return [self._by_method[method] for method in sink.methods if method in self._by_method]
+
+    def _prune(self, sink: _NotificationSink) -> None:
+        if sink.scope is not None:
+            thread_id, turn_id = sink.scope
+            turns = self._by_scope.get(thread_id)
+            if turns is not None and not turns.get(turn_id, True):
+                del turns[turn_id]
+                if not turns:
+                    del self._by_scope[thread_id]
+        elif sink.methods is not None:
+            for method in sink.methods:
+                if not self._by_method.get(method, True):
+                    del self._by_method[method]
+
+
+def _raw_turn_id(params: dict[str, Any]) -> str | None:
+    turn_id = params.get("turnId")
+    if isinstance(turn_id, str):
+        return turn_id
+    turn = params.get("turn")
+    if isinstance(turn, dict):
+        nested = turn.get("id")
+        return nested if isinstance(nested, str) else None
+    return None
+
+
 @dataclass(slots=True)
 class _AsyncNotificationSubscription:
     sink: _NotificationSink
-    queue: asyncio.Queue[_SubscriptionMessage]
-    close_callback: Callable[[], None]
+    queue: _NotificationQueue
+    router: _NotificationRouter
+
+    @property
+    def dropped(self) -> int:
+        """Number of notifications discarded because the subscription was full."""
+        return self.queue.dropped
+
+    @property
+    def coalesced(self) -> int:
+        """Number of delta notifications merged into an already-buffered delta."""
+        return self.queue.coalesced
+
+    def has_buffered(self) -> bool:
+        """Return whether `next()` can complete without waiting for the connection."""
+        return not self.queue.empty()
 
     async def next(self) -> Notification:
         message = await self.queue.get()
@@ -65,14 +350,53 @@ class _AsyncNotificationSubscription:
         return message
 
     async def close(self) -> None:
-        self.close_callback()
-        while not self.queue.empty():
-            self.queue.get_nowait()
-        await self.queue.put(None)
+        self.router.remove(self.sink)
+        self.queue.close()
+        self.queue.put_control(None)
 
     def update_predicate(self, predicate: _NotificationPredicate | None) -> None:
         self.sink.predicate = predicate
 
+    def update_scope(self, thread_id: str, turn_id: str | None = None) -> None:
+        """Route by `(threadId, turnId)` from now on, replacing any predicate."""
+        self.sink.predicate = None
+        self.router.rescope(self.sink, (thread_id, turn_id))
+
+
+@dataclass(frozen=True, slots=True)
+class AppServerStartupTimings:
+    """Wall-clock seconds spent bringing an app-server connection up."""
+
+    transport_seconds: float
+    """Spawning the app-server process, or opening the websocket."""
+    initialize_seconds: float
+    """The `initialize` request and `initialized` notification handshake."""
+
+
+@dataclass(frozen=True, slots=True)
+class AppServerRequestStats:
+    """Snapshot of request outcomes on one app-server connection."""
+
+    sent: int
+    """Requests issued so far, including ones still pending."""
+    failed: int
+    """Requests that ended with an RPC or connection error."""
+    timed_out: int
+    """Requests abandoned after their timeout or `deadline()` expired."""
+    pending: int
+    """Requests currently waiting for a response."""
+    coalesced: int = 0
+    """Calls that shared an identical in-flight request instead of sending their own."""
+
+
+@dataclass(slots=True)
+class _Flight:
+    """One outgoing request shared by every identical call made while it is in flight."""
+
+    task: asyncio.Task[object]
+    waiters: int = 0
+    shared: bool = False
+
 
 @dataclass(slots=True)
 class _RegisteredHandler:
@@ -85,20 +409,59 @@ class _AsyncSession:
         self,
         transport: AsyncMessageTransport,
         initialize_options: AppServerInitializeOptions | None = None,
+        *,
+        reconnect: AppServerReconnectOptions | None = None,
     ) -> None:
         self._transport = transport
         self._initialize_options = initialize_options or AppServerInitializeOptions()
+        self._reconnect = reconnect
         self._started = False
         self._closed = False
         self._next_request_id = 0
         self._pending: dict[int | str, asyncio.Future[object]] = {}
         self._request_handlers: dict[str, _RegisteredHandler] = {}
-        self._notification_sinks: list[_NotificationSink] = []
+        self._request_tasks: set[asyncio.Task[None]] = set()
+        self._request_limits: dict[str, asyncio.Semaphore] = {
+            method: asyncio.Semaphore(limit)
+            for method, limit in self._initialize_options.server_request_concurrency.items()
+        }
+        self._blocking_executor: ThreadPoolExecutor | None = None
+        self._router = _NotificationRouter()
         self._reader_task: asyncio.Task[None] | None = None
         self._reader_error: Exception | None = None
         self._reader_error_reported = False
         self._strict_protocol = self._initialize_options.strict_protocol
+        self._validation: ProtocolValidationMode = (
+            "full" if self._strict_protocol else self._initialize_options.validation
+        )
         self._initialize_result: InitializeResult | None = None
+        self.startup_timings: AppServerStartupTimings | None = None
+        # Reconnect state: requests that may be resent, threads to resume (which pools
+        # also release on checkin), and the event new requests wait on while a
+        # reconnected session is being restored.
+        self._replayable: dict[int | str, JsonObject] = {}
+        self._loaded_threads: dict[str, None] = {}
+        self._resumed: asyncio.Event | None = None
+        self._resume_task: asyncio.Task[None] | None = None
+        self._resume_error: Exception | None = None
+        self.reconnects = 0
+        self._requests_sent = 0
+        self._requests_failed = 0
+        self._requests_timed_out = 0
+        self._requests_coalesced = 0
+        self._coalesce_methods = self._initialize_options.coalesce_methods
+        self._flights: dict[tuple[str, str], _Flight] = {}
+        cache_options = self._initialize_options.cache
+        self._cache = None if cache_options is None else _ResponseCache(cache_options)
+
+    @property
+    def connected(self) -> bool:
+        return (
+            self._started
+            and not self._closed
+            and self._reader_task is not None
+            and not self._reader_task.done()
+        )
 
     async def start(self) -> InitializeResult:
         if self._closed:
@@ -107,7 +470,9 @@ class _AsyncSession:
             if self._initialize_result is None:
                 raise AppServerClosedError("app-server client initialization state is inconsistent")
             return self._initialize_result
+        started = time.perf_counter()
         await self._transport.start()
+        transport_ready = time.perf_counter()
         self._reader_task = asyncio.create_task(self._reader_loop())
         try:
             result = await self.request_typed(
@@ -121,6 +486,10 @@ class _AsyncSession:
             if close_error is not None and close_error is not exc:
                 exc.add_note(f"Cleanup after start failure also failed: {close_error!r}")
             raise
+        self.startup_timings = AppServerStartupTimings(
+            transport_seconds=transport_ready - started,
+            initialize_seconds=time.perf_counter() - transport_ready,
+        )
         self._initialize_result = result
         self._started = True
         return result
@@ -137,6 +506,14 @@ class _AsyncSession:
             reader_error = reader_result[0]
             if isinstance(reader_error, Exception):
                 close_error = reader_error
+        if self._resume_task is not None:
+            self._resume_task.cancel()
+            await asyncio.gather(self._resume_task, return_exceptions=True)
+            self._resume_task = None
+        if self._resumed is not None:
+            self._resumed.set()
+            self._resumed = None
+        await self._cancel_request_tasks()
         self._fail_pending(AppServerClosedError("app-server client closed"))
         try:
             await self._transport.close()
@@ -147,9 +524,9 @@ class _AsyncSession:
             self._started = False
             self._initialize_result = None
             self._reader_task = None
-            for sink in list(self._notification_sinks):
-                await sink.queue.put(None)
-            self._notification_sinks.clear()
+            for sink in self._router.sinks():
+                sink.queue.put_control(None)
+            self._router.clear()
         if close_error is not None:
             raise close_error
 
@@ -164,6 +541,7 @@ class _AsyncSession:
         self, method: str, params: BaseModel | Mapping[str, Any] | None = None
     ) -> None:
         await self._ensure_started_or_starting()
+        await self._wait_until_resumed()
         message: JsonObject = {"method": method}
         if params is not None:
             serialized = serialize_value(params)
@@ -174,12 +552,172 @@ class _AsyncSession:
             message["params"] = cast(JsonObject, serialized)
         await self._transport.send(message)
 
+    @property
+    def request_stats(self) -> AppServerRequestStats:
+        return AppServerRequestStats(
+            sent=self._requests_sent,
+            failed=self._requests_failed,
+            timed_out=self._requests_timed_out,
+            pending=len(self._pending),
+            coalesced=self._requests_coalesced,
+        )
+
+    @property
+    def cache_stats(self) -> AppServerCacheStats | None:
+        return None if self._cache is None else self._cache.stats
+
+    def invalidate_cache(self, methods: Collection[str] | None = None) -> int:
+        return 0 if self._cache is None else self._cache.invalidate(methods)
+
     async def request(
         self,
         method: str,
         params: BaseModel | Mapping[str, Any] | None = None,
+        *,
+        timeout: float | None = None,
     ) -> object:
+        """Send a request and wait for its result.
+
+        `timeout` replaces `AppServerInitializeOptions.request_timeout` for this call,
+        `math.inf` waits without a limit, and an enclosing `deadline()` caps both. On expiry the pending entry is dropped,
+        `cancel_request_method` is notified when configured, and `AppServerTimeoutError`
+        is raised.
+        """
+        limit = self._time_limit(timeout)
+        if limit is not None and limit <= 0:
+            self._requests_timed_out += 1
+            raise AppServerTimeoutError(method, 0.0)
         await self._ensure_started_or_starting()
+        cache = self._cache
+        if cache is not None:
+            return await self._cached_request(cache, method, params, limit)
+        return await self._dispatch(method, params, limit)
+
+    async def _cached_request(
+        self,
+        cache: _ResponseCache,
+        method: str,
+        params: BaseModel | Mapping[str, Any] | None,
+        limit: float | None,
+    ) -> object:
+        lookup = cache.key(method, params)
+        if lookup is None:
+            # Invalidate before and after a write, so reads that overlap it are not kept.
+            cache.invalidate_for_request(method)
+            try:
+                return await self._dispatch(method, params, limit)
+            finally:
+                cache.invalidate_for_request(method)
+        key, refresh = lookup
+        cached = cache.get(key, refresh=refresh)
+        if cached is not None:
+            return cached
+        generation = cache.generation
+        result = await self._dispatch(method, params, limit)
+        cache.put(key, result, generation)
+        return result
+
+    async def _dispatch(
+        self,
+        method: str,
+        params: BaseModel | Mapping[str, Any] | None,
+        limit: float | None,
+    ) -> object:
+        if method in self._coalesce_methods:
+            return await self._coalesced_request(method, params, limit)
+        # A call that may write must not be followed by reads joining ones sent before it.
+        self._flights.clear()
+        return await self._request(method, params, limit)
+
+    async def _coalesced_request(
+        self,
+        method: str,
+        params: BaseModel | Mapping[str, Any] | None,
+        limit: float | None,
+    ) -> object:
+        """Join an identical request already in flight, or send one that later calls can join.
+
+        The shared request has no time limit of its own; each caller waits for it under
+        its own timeout or deadline. It is abandoned, like an uncoalesced request, only
+        once every caller has timed out or been cancelled. When it was shared, every
+        caller gets its own copy of the result.
+        """
+        payload = {} if params is None else serialize_value(params)
+        key = (method, json.dumps(payload, sort_keys=True, separators=(",", ":")))
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(self._request(method, params, None)))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._land(key, flight))
+        else:
+            flight.shared = True
+            self._requests_coalesced += 1
+        flight.waiters += 1
+        scope = asyncio.timeout(limit)
+        try:
+            async with scope:
+                result = await asyncio.shield(flight.task)
+        except TimeoutError as exc:
+            if not scope.expired():
+                raise
+            self._requests_timed_out += 1
+            raise AppServerTimeoutError(method, cast(float, limit)) from exc
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                self._land(key, flight)
+                flight.task.cancel()
+        return copy.deepcopy(result) if flight.shared else result
+
+    def _land(self, key: tuple[str, str], flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    async def _request(
+        self,
+        method: str,
+        params: BaseModel | Mapping[str, Any] | None,
+        limit: float | None,
+    ) -> object:
+        self._requests_sent += 1
+        self._forget_released_thread(method, params)
+        scope = asyncio.timeout(limit)
+        try:
+            async with scope:
+                await self._wait_until_resumed()
+                if self._reconnect is None:
+                    result = await self._send_request(method, params)
+                else:
+                    replayable = method in self._reconnect.replay_methods
+                    result = await self._send_request(method, params, replayable=replayable)
+        except TimeoutError as exc:
+            if not scope.expired():
+                self._requests_failed += 1
+                raise
+            self._requests_timed_out += 1
+            raise AppServerTimeoutError(method, cast(float, limit)) from exc
+        except Exception:
+            self._requests_failed += 1
+            raise
+        self._track_loaded_thread(method, result)
+        return result
+
+    def _time_limit(self, timeout: float | None) -> float | None:
+        limit = self._initialize_options.request_timeout if timeout is None else timeout
+        if limit == math.inf:
+            limit = None
+        remaining = remaining_seconds()
+        if remaining is None:
+            return limit
+        return remaining if limit is None else min(limit, remaining)
+
+    async def _send_request(
+        self,
+        method: str,
+        params: BaseModel | Mapping[str, Any] | None,
+        *,
+        replayable: bool = False,
+    ) -> object:
         request_id_value = self._next_request_id
         self._next_request_id += 1
         loop = asyncio.get_running_loop()
@@ -193,16 +731,46 @@ class _AsyncSession:
                     f"Request params must serialize to an object, got {type(serialized).__name__}"
                 )
             message["params"] = cast(JsonObject, serialized)
-        await self._transport.send(message)
-        return await self._await_future(future)
+        if replayable:
+            self._replayable[request_id_value] = message
+        try:
+            await self._transport.send(message)
+        except AppServerConnectionError:
+            if not replayable:
+                raise
+            # The reader notices the drop too; the request is resent once it reconnects.
+        try:
+            return await self._await_future(future)
+        finally:
+            self._replayable.pop(request_id_value, None)
+            if not future.done():
+                # Abandoned by a timeout or cancellation; a late response is ignored.
+                self._pending.pop(request_id_value, None)
+                future.cancel()
+                self._notify_request_cancelled(request_id_value)
+
+    def _notify_request_cancelled(self, request_id_value: int) -> None:
+        method = self._initialize_options.cancel_request_method
+        if method is None or self._closed:
+            return
+        task = asyncio.ensure_future(self._send_cancel_notification(method, request_id_value))
+        self._request_tasks.add(task)
+        task.add_done_callback(self._request_tasks.discard)
+
+    async def _send_cancel_notification(self, method: str, request_id_value: int) -> None:
+        with suppress(AppServerConnectionError):
+            await self._transport.send({"method": method, "params": {"id": request_id_value}})
 
     async def request_typed(
         self,
         method: str,
         params: BaseModel | Mapping[str, Any] | None,
         result_model: type[_ModelT],
+        *,
+        timeout: float | None = None,
     ) -> _ModelT:
-        return parse_result(await self.request(method, params), result_model, method=method)
+        result = await self.request(method, params, timeout=timeout)
+        return parse_result(result, result_model, method=method, validation=self._validation)
 
     def on_request(
         self,
@@ -221,10 +789,34 @@ class _AsyncSession:
         methods: Collection[str] | None = None,
         *,
         predicate: _NotificationPredicate | None = None,
+        scope: _NotificationScope | None = None,
+        maxsize: int | None = None,
+        overflow: NotificationOverflowPolicy | None = None,
+        compact_deltas: bool | None = None,
     ) -> _AsyncNotificationSubscription:
-        sink = _NotificationSink(None if methods is None else set(methods), predicate=predicate)
-        self._notification_sinks.append(sink)
-        return _AsyncNotificationSubscription(sink, sink.queue, lambda: self._remove_sink(sink))
+        """Register a notification sink.
+
+        `scope` is a `(threadId, turnId)` pair (`turnId` may be `None` for the whole
+        thread) and is the cheap way to follow one turn; `predicate` is applied on top
+        of method and scope routing for anything the index cannot express. With
+        `compact_deltas`, delta notifications arrive as `DeltaEvent`s.
+        """
+        if maxsize is None:
+            maxsize = self._initialize_options.notification_queue_maxsize
+        if overflow is None:
+            overflow = self._initialize_options.notification_overflow
+        if compact_deltas is None:
+            compact_deltas = self._initialize_options.compact_deltas
+        sink = _NotificationSink(
+            None if methods is None else set(methods),
+            predicate=predicate,
+            scope=scope,
+            maxsize=maxsize,
+            overflow=overflow,
+            compact_deltas=compact_deltas,
+        )
+        self._router.add(sink)
+        return _AsyncNotificationSubscription(sink, sink.queue, self._router)
 
     async def _ensure_started_or_starting(self) -> None:
         if self._closed:
@@ -237,26 +829,186 @@ class _AsyncSession:
     async def _reader_loop(self) -> None:
         try:
             while True:
-                message = await self._transport.receive()
-                if message is None:
-                    raise AppServerClosedError("app-server closed the transport")
-                if "id" in message and "method" not in message:
-                    self._handle_response(message)
-                    continue
-                if "id" in message and "method" in message:
-                    await self._handle_server_request(message)
-                    continue
-                if "method" in message:
-                    await self._broadcast_notification(message)
-                    continue
-                raise AppServerProtocolError(f"Unsupported app-server message: {message}")
+                try:
+                    await self._read_messages()
+                except AppServerConnectionError as exc:
+                    await self._reconnect_after(exc)
         except asyncio.CancelledError:
             raise
         except Exception as exc:
             self._reader_error = exc
             self._fail_pending(exc)
-            for sink in list(self._notification_sinks):
-                await sink.queue.put(exc)
+            for sink in self._router.sinks():
+                sink.queue.put_control(exc)
+
+    async def _read_messages(self) -> None:
+        while True:
+            message = await self._transport.receive()
+            if message is None:
+                raise AppServerClosedError("app-server closed the transport")
+            if "id" in message and "method" not in message:
+                self._handle_response(message)
+                continue
+            if "id" in message and "method" in message:
+                self._dispatch_server_request(message)
+                continue
+            if "method" in message:
+                if self._cache is not None:
+                    self._cache.invalidate_for_notification(cast(str, message["method"]))
+                await self._broadcast_notification(message)
+                continue
+            raise AppServerProtocolError(f"Unsupported app-server message: {message}")
+
+    async def _reconnect_after(self, exc: AppServerConnectionError) -> None:
+        """Reopen the transport after `exc`, or re-raise it when the session cannot recover.
+
+        Pending requests outside `replay_methods` fail with `exc` right away, since the
+        server may already have acted on them. The rest stay pending and are resent by
+        `_restore_session`, which runs alongside the reader once the transport is back.
+        """
+        reconnect = self._reconnect
+        if reconnect is None or not self._started or self._closed:
+            raise exc
+        if self._resume_error is not None:
+            raise self._resume_error
+        if self._resumed is None:
+            self._resumed = asyncio.Event()
+        for pending_id, future in list(self._pending.items()):
+            if pending_id not in self._replayable:
+                del self._pending[pending_id]
+                if not future.done():
+                    future.set_exception(exc)
+        await self._cancel_request_tasks()
+        try:
+            await self._transport.close()
+        except Exception:
+            pass
+        last_error: Exception = exc
+        for attempt in range(reconnect.max_attempts):
+            await asyncio.sleep(reconnect.backoff(attempt, random.uniform(-1.0, 1.0)))
+            try:
+                await self._transport.start()
+            except AppServerConnectionError as error:
+                last_error = error
+                continue
+            self.reconnects += 1
+            if self._cache is not None:
+                # The server may have restarted with a different config.
+                self._cache.invalidate()
+            self._resume_task = asyncio.create_task(self._restore_session(reconnect))
+            return
+        exc.add_note(f"Reconnecting failed after {reconnect.max_attempts} attempts: {last_error!r}")
+        raise exc
+
+    async def _restore_session(self, reconnect: AppServerReconnectOptions) -> None:
+        try:
+            await self._send_request("initialize", self._initialize_options.to_params())
+            await self._transport.send({"method": "initialized", "params": {}})
+            if reconnect.resume_threads:
+                await self._resume_threads()
+            for pending_id, message in list(self._replayable.items()):
+                if pending_id in self._pending:
+                    await self._transport.send(message)
+        except AppServerConnectionError:
+            # Dropped again; the reader reconnects and starts a fresh restore.
+            return
+        except Exception as exc:
+            # The server rejected the handshake, so the session cannot be trusted again.
+            self._resume_error = exc
+            try:
+                await self._transport.close()
+            except Exception:
+                pass
+            return
+        resumed, self._resumed = self._resumed, None
+        if resumed is not None:
+            resumed.set()
+
+    async def _resume_threads(self) -> None:
+        turn_scopes = self._router.turn_scopes()
+        thread_ids = dict.fromkeys([*self._loaded_threads, *(scope[0] for scope in turn_scopes)])
+        for thread_id in thread_ids:
+            try:
+                await self._send_request(
+                    "thread/resume", {"threadId": thread_id, "excludeTurns": True}
+                )
+            except AppServerRpcError:
+                # The thread is gone (archived or expired); its streams fail on their own.
+                self._loaded_threads.pop(thread_id, None)
+        for thread_id, turn_id in turn_scopes:
+            await self._catch_up_turn(thread_id, turn_id)
+
+    async def _catch_up_turn(self, thread_id: str, turn_id: str) -> None:
+        """Replay a turn's persisted items, and its completion, to the streams following it.
+
+        Items may arrive twice when they completed before the drop; turn streams key
+        items by id, so the duplicate replaces the earlier copy.
+        """
+        result = await self._send_request(
+            "thread/turns/list",
+            {"threadId": thread_id, "itemsView": "full", "limit": _CATCH_UP_TURNS},
+        )
+        turns = result.get("data") if isinstance(result, dict) else None
+        for turn in turns if isinstance(turns, list) else ():
+            if not isinstance(turn, dict) or turn.get("id") != turn_id:
+                continue
+            completed_at_ms = int(time.time() * 1000)
+            for item in turn.get("items") or ():
+                await self._broadcast_notification(
+                    {
+                        "method": "item/completed",
+                        "params": {
+                            "threadId": thread_id,
+                            "turnId": turn_id,
+                            "item": item,
+                            "completedAtMs": completed_at_ms,
+                        },
+                    }
+                )
+            if turn.get("status") != "inProgress":
+                await self._broadcast_notification(
+                    {"method": "turn/completed", "params": {"threadId": thread_id, "turn": turn}}
+                )
+            return
+
+    async def _wait_until_resumed(self) -> None:
+        while (resumed := self._resumed) is not None:
+            if self._closed:
+                raise AppServerClosedError("app-server client is closed")
+            reader_task = self._reader_task
+            if reader_task is None or reader_task.done():
+                raise self._reader_failure()
+            waiter = asyncio.ensure_future(resumed.wait())
+            try:
+                await asyncio.wait(
+                    {waiter, cast(asyncio.Future[Any], reader_task)},
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+            finally:
+                waiter.cancel()
+
+    def loaded_thread_ids(self) -> list[str]:
+        """Return the threads this connection has started, resumed, or forked and not released."""
+        return list(self._loaded_threads)
+
+    def _track_loaded_thread(self, method: str, result: object) -> None:
+        if method in _THREAD_LOADING_METHODS and isinstance(result, dict):
+            thread = result.get("thread")
+            thread_id = thread.get("id") if isinstance(thread, dict) else None
+            if isinstance(thread_id, str):
+                self._loaded_threads[thread_id] = None
+
+    def _forget_released_thread(
+        self,
+        method: str,
+        params: BaseModel | Mapping[str, Any] | None,
+    ) -> None:
+        # Forget the thread before sending, so a release that fails is not retried forever.
+        if method in _THREAD_RELEASING_METHODS:
+            serialized = serialize_value(params)
+            thread_id = serialized.get("threadId") if isinstance(serialized, dict) else None
+            if isinstance(thread_id, str):
+                self._loaded_threads.pop(thread_id, None)
 
     async def _await_future(self, future: asyncio.Future[object]) -> object:
         while True:
@@ -333,14 +1085,68 @@ class _AsyncSession:
         future.set_result(response.result)
 
     async def _broadcast_notification(self, message: JsonObject) -> None:
-        notification = parse_notification(message, strict=self._strict_protocol)
-        notification_method = method_name(notification)
-        for sink in list(self._notification_sinks):
-            if sink.matches(notification_method, notification):
-                await sink.queue.put(notification)
-
-    async def _handle_server_request(self, message: JsonObject) -> None:
-        request = parse_server_request(message, strict=self._strict_protocol)
+        sinks = self._router.route(message)
+        if not sinks and not self._strict_protocol:
+            # Nobody listens for this message; skip model validation entirely.
+            return
+        compact: DeltaEvent | None = None
+        if not self._strict_protocol and any(sink.compact_deltas for sink in sinks):
+            compact = compact_delta_event(message)
+        notification: Notification | None = None
+        if compact is None or not all(sink.compact_deltas for sink in sinks):
+            notification = parse_notification(
+                message, strict=self._strict_protocol, validation=self._validation
+            )
+        for sink in sinks:
+            event = compact if compact is not None and sink.compact_deltas else notification
+            if event is not None and sink.accepts(event):
+                await sink.queue.put(event)
+
+    async def run_blocking(self, func: Callable[[], _T]) -> _T:
+        """Run a synchronous callable on the bounded request-handler thread pool."""
+        if self._blocking_executor is None:
+            self._blocking_executor = ThreadPoolExecutor(
+                max_workers=self._initialize_options.sync_handler_workers,
+                thread_name_prefix="codex-request-handler",
+            )
+        context = contextvars.copy_context()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._blocking_executor, context.run, func)
+
+    def _dispatch_server_request(self, message: JsonObject) -> None:
+        # Parse on the reader so malformed requests still fail the connection, then
+        # run the handler off the reader so slow handlers never stall other traffic.
+        request = parse_server_request(
+            message, strict=self._strict_protocol, validation=self._validation
+        )
+        task = asyncio.create_task(self._respond_to_server_request(request))
+        self._request_tasks.add(task)
+        task.add_done_callback(self._request_tasks.discard)
+
+    async def _cancel_request_tasks(self) -> None:
+        tasks = list(self._request_tasks)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._request_tasks.clear()
+        if self._blocking_executor is not None:
+            self._blocking_executor.shutdown(wait=False, cancel_futures=True)
+            self._blocking_executor = None
+
+    async def _respond_to_server_request(self, request: BaseModel) -> None:
+        limit = self._request_limits.get(method_name(request))
+        try:
+            if limit is None:
+                await self._run_server_request(request)
+                return
+            async with limit:
+                await self._run_server_request(request)
+        except AppServerConnectionError:
+            # The connection went away while the handler ran; the reader reports it.
+            return
+
+    async def _run_server_request(self, request: BaseModel) -> None:
         request_method = method_name(request)
         request_id_value = request_id(request)
         registered = self._request_handlers.get(request_method)
@@ -363,7 +1169,7 @@ class _AsyncSession:
                     registered.request_model,
                     method=request_method,
                 )
-            result = registered.handler(request_value)
+            result = await self._call_handler(registered.handler, request_value)
             if inspect.isawaitable(result):
                 result = await cast(Awaitable[object], result)
             response_result = {} if result is None else serialize_value(result)
@@ -376,16 +1182,21 @@ class _AsyncSession:
                 }
             )
 
+    async def _call_handler(
+        self,
+        handler: RequestHandler[BaseModel],
+        request: BaseModel,
+    ) -> object:
+        if inspect.iscoroutinefunction(handler):
+            return handler(request)
+        return await self.run_blocking(lambda: handler(request))
+
     def _fail_pending(self, exc: Exception) -> None:
         for future in self._pending.values():
             if not future.done():
                 future.set_exception(exc)
         self._pending.clear()
 
-    def _remove_sink(self, sink: _NotificationSink) -> None:
-        if sink in self._notification_sinks:
-            self._notification_sinks.remove(sink)
-
 
 def _jsonrpc_error_from_exception(exc: Exception) -> JsonObject:
     if isinstance(exc, AppServerRpcError):
@@ -4,8 +4,9 @@ from __future__ import annotations
 
 import asyncio
 import concurrent.futures
+import os
 import time
-from collections.abc import Callable, Collection, Coroutine, Mapping
+from collections.abc import Awaitable, Callable, Collection, Coroutine, Iterator, Mapping
 from contextlib import suppress
 from threading import Thread
 from typing import Any, TypeVar, cast
@@ -13,7 +14,10 @@ from typing import Any, TypeVar, cast
 from pydantic import BaseModel
 
 from codex.app_server._async_client import AsyncAppServerClient, AsyncRpcClient
+from codex.app_server._pagination import DEFAULT_PREFETCH, iter_pages
 from codex.app_server._protocol_helpers import RequestHandler
+from codex.app_server._response_cache import AppServerCacheStats
+from codex.app_server._session import AppServerRequestStats, AppServerStartupTimings
 from codex.app_server._sync_services import (
     _AccountClient,
     _AppsClient,
@@ -37,6 +41,7 @@ from codex.app_server._sync_threads import (
 from codex.app_server.options import (
     AppServerInitializeOptions,
     AppServerProcessOptions,
+    AppServerSocketOptions,
     AppServerThreadListOptions,
     AppServerThreadResumeOptions,
     AppServerThreadStartOptions,
@@ -196,16 +201,23 @@ class RpcClient(_SyncRunner):
         self,
         method: str,
         params: BaseModel | Mapping[str, object] | None = None,
+        *,
+        timeout: float | None = None,
     ) -> object:
-        return self._run(self._async_rpc.request(method, params))
+        """Send a raw request; `timeout` overrides the connection's `request_timeout`."""
+        return self._run(self._async_rpc.request(method, params, timeout=timeout))
 
     def request_typed(
         self,
         method: str,
         params: BaseModel | Mapping[str, object] | None,
         result_model: type[_ModelT],
+        *,
+        timeout: float | None = None,
     ) -> _ModelT:
-        return self._run(self._async_rpc.request_typed(method, params, result_model))
+        return self._run(
+            self._async_rpc.request_typed(method, params, result_model, timeout=timeout)
+        )
 
     def notify(
         self,
@@ -288,6 +300,43 @@ class AppServerClient(_SyncRunner):
                 loop.close()
         return cls(async_client, loop)
 
+    @classmethod
+    def connect_unix_socket(
+        cls,
+        path: str | os.PathLike[str],
+        socket_options: AppServerSocketOptions | None = None,
+        initialize_options: AppServerInitializeOptions | None = None,
+    ) -> AppServerClient:
+        loop = _LoopThread()
+        async_client: AsyncAppServerClient | None = None
+        try:
+            async_client = loop.run(
+                AsyncAppServerClient.connect_unix_socket(path, socket_options, initialize_options)
+            )
+        finally:
+            if async_client is None:
+                loop.close()
+        return cls(async_client, loop)
+
+    @classmethod
+    def connect_tcp(
+        cls,
+        host: str,
+        port: int,
+        socket_options: AppServerSocketOptions | None = None,
+        initialize_options: AppServerInitializeOptions | None = None,
+    ) -> AppServerClient:
+        loop = _LoopThread()
+        async_client: AsyncAppServerClient | None = None
+        try:
+            async_client = loop.run(
+                AsyncAppServerClient.connect_tcp(host, port, socket_options, initialize_options)
+            )
+        finally:
+            if async_client is None:
+                loop.close()
+        return cls(async_client, loop)
+
     def __enter__(self) -> AppServerClient:
         return self
 
@@ -306,11 +355,38 @@ class AppServerClient(_SyncRunner):
         if interrupted and exc_type is None:
             raise KeyboardInterrupt
 
+    @property
+    def connected(self) -> bool:
+        """Whether the session is initialized and its connection is still being read."""
+        return self._async_client.connected
+
+    @property
+    def request_stats(self) -> AppServerRequestStats:
+        """Counts of requests sent, failed, timed out, and still pending on this connection."""
+        return self._async_client.request_stats
+
+    @property
+    def cache_stats(self) -> AppServerCacheStats | None:
+        """Hit, miss, and eviction counts of the response cache, or None when it is off."""
+        return self._async_client.cache_stats
+
+    def invalidate_cache(self, methods: str | Collection[str] | None = None) -> int:
+        """Drop cached results for `methods`, or all of them, and return how many were dropped."""
+        return self._async_client.invalidate_cache(methods)
+
+    @property
+    def startup_timings(self) -> AppServerStartupTimings | None:
+        """Transport and handshake durations from `start()`, or None before it completes."""
+        return self._async_client.startup_timings
+
     def close(self) -> None:
         interrupted = self._loop.shutdown(self._async_client.close())
         if interrupted:
             raise KeyboardInterrupt
 
+    def _release_threads(self) -> None:
+        self._run(self._async_client._release_threads())
+
     def start_thread(
         self,
         options: AppServerThreadStartOptions | None = None,
@@ -352,6 +428,29 @@ class AppServerClient(_SyncRunner):
     ) -> protocol.ThreadListResponse:
         return self._run(self._async_client.list_threads_page(options))
 
+    def iter_threads(
+        self,
+        options: AppServerThreadListOptions | None = None,
+        *,
+        page_size: int | None = None,
+        prefetch: int = DEFAULT_PREFETCH,
+    ) -> Iterator[protocol.Thread]:
+        """Yield every thread matching `options`; see `AsyncAppServerClient.iter_threads()`.
+
+        Pages keep being prefetched on the client loop while the caller handles one.
+        """
+        options = options or AppServerThreadListOptions()
+        if page_size is not None:
+            options = options.model_copy(update={"limit": page_size})
+
+        def fetch(cursor: str | None) -> Awaitable[protocol.ThreadListResponse]:
+            return self._async_client.list_threads_page(
+                options.model_copy(update={"cursor": cursor})
+            )
+
+        for page in self._iterate(iter_pages(fetch, cursor=options.cursor, prefetch=prefetch)):
+            yield from page.data
+
     def loaded_thread_ids(self) -> list[str]:
         return self._run(self._async_client.loaded_thread_ids())
 
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
-from collections.abc import Callable, Coroutine, Mapping, Sequence
+import os
+from collections.abc import Awaitable, Callable, Coroutine, Iterator, Mapping, Sequence
 from typing import Any, Protocol
 
+from codex.app_server._fs_sync import FsSyncResult
+from codex.app_server._pagination import DEFAULT_PREFETCH, iter_pages
 from codex.app_server._sync_support import _SyncRunner
+from codex.app_server._uploads import DEFAULT_UPLOAD_CHUNK_SIZE, UploadProgress, UploadSource
 from codex.app_server.models import (
     AccountCancelLoginResult,
     AccountRateLimitsResult,
@@ -117,6 +121,26 @@ class _AsyncFsClientLike(Protocol):
         encoding: str = "utf-8",
     ) -> protocol.FsWriteFileResponse: ...
 
+    async def upload(
+        self,
+        *,
+        path: str,
+        source: UploadSource,
+        chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE,
+        progress: UploadProgress | None = None,
+        sandbox_policy: protocol.SandboxPolicy | None = None,
+    ) -> int: ...
+
+    async def sync_tree(
+        self,
+        *,
+        local_dir: str | os.PathLike[str],
+        remote_dir: str,
+        manifest: str | os.PathLike[str] | None = None,
+        concurrency: int = 8,
+        chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE,
+    ) -> FsSyncResult: ...
+
 
 class _AsyncEnvironmentClientLike(Protocol):
     async def info(self, *, environment_id: str) -> protocol.EnvironmentInfoResponse: ...
@@ -333,6 +357,24 @@ class _ModelsClient(_SyncRunner):
             )
         )
 
+    def iter_all(
+        self,
+        *,
+        cursor: str | None = None,
+        include_hidden: bool | None = None,
+        page_size: int | None = None,
+        prefetch: int = DEFAULT_PREFETCH,
+    ) -> Iterator[ModelInfo]:
+        """Yield models across every page, prefetching up to `prefetch` pages ahead."""
+
+        def fetch(cursor: str | None) -> Awaitable[ModelListResult]:
+            return self._async_client.list_page(
+                cursor=cursor, include_hidden=include_hidden, limit=page_size
+            )
+
+        for page in self._iterate(iter_pages(fetch, cursor=cursor, prefetch=prefetch)):
+            yield from page.data
+
 
 class _AppsClient(_SyncRunner):
     def __init__(
@@ -377,6 +419,28 @@ class _AppsClient(_SyncRunner):
             )
         )
 
+    def iter_all(
+        self,
+        *,
+        cursor: str | None = None,
+        force_refetch: bool | None = None,
+        page_size: int | None = None,
+        thread_id: str | None = None,
+        prefetch: int = DEFAULT_PREFETCH,
+    ) -> Iterator[protocol.AppInfo]:
+        """Yield apps across every page, prefetching up to `prefetch` pages ahead."""
+
+        def fetch(cursor: str | None) -> Awaitable[AppListResult]:
+            return self._async_client.list_page(
+                cursor=cursor,
+                force_refetch=force_refetch,
+                limit=page_size,
+                thread_id=thread_id,
+            )
+
+        for page in self._iterate(iter_pages(fetch, cursor=cursor, prefetch=prefetch)):
+            yield from page.data
+
 
 class _SkillsClient(_SyncRunner):
     def __init__(
@@ -466,6 +530,49 @@ class _FsClient(_SyncRunner):
     ) -> protocol.FsWriteFileResponse:
         return self._run(self._async_client.write_file(path=path, data=data, encoding=encoding))
 
+    def upload(
+        self,
+        *,
+        path: str,
+        source: UploadSource,
+        chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE,
+        progress: UploadProgress | None = None,
+        sandbox_policy: protocol.SandboxPolicy | None = None,
+    ) -> int:
+        """Write `source` to `path` in bounded chunks; see `AsyncFsClient.upload()`.
+
+        `progress` is called on the client's event-loop thread.
+        """
+        return self._run(
+            self._async_client.upload(
+                path=path,
+                source=source,
+                chunk_size=chunk_size,
+                progress=progress,
+                sandbox_policy=sandbox_policy,
+            )
+        )
+
+    def sync_tree(
+        self,
+        *,
+        local_dir: str | os.PathLike[str],
+        remote_dir: str,
+        manifest: str | os.PathLike[str] | None = None,
+        concurrency: int = 8,
+        chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE,
+    ) -> FsSyncResult:
+        """Copy the files under `local_dir` into `remote_dir`; see `AsyncFsClient.sync_tree()`."""
+        return self._run(
+            self._async_client.sync_tree(
+                local_dir=local_dir,
+                remote_dir=remote_dir,
+                manifest=manifest,
+                concurrency=concurrency,
+                chunk_size=chunk_size,
+            )
+        )
+
 
 class _EnvironmentClient(_SyncRunner):
     def __init__(
@@ -661,6 +768,21 @@ class _McpServersClient(_SyncRunner):
     ) -> McpServerStatusListResult:
         return self._run(self._async_client.list_page(cursor=cursor, limit=limit))
 
+    def iter_all(
+        self,
+        *,
+        cursor: str | None = None,
+        page_size: int | None = None,
+        prefetch: int = DEFAULT_PREFETCH,
+    ) -> Iterator[McpServerStatus]:
+        """Yield MCP server statuses across every page, prefetching up to `prefetch` pages."""
+
+        def fetch(cursor: str | None) -> Awaitable[McpServerStatusListResult]:
+            return self._async_client.list_page(cursor=cursor, limit=page_size)
+
+        for page in self._iterate(iter_pages(fetch, cursor=cursor, prefetch=prefetch)):
+            yield from page.data
+
     # Backward-compatible aliases; prefer list()/list_page().
     list_status = list
     list_status_page = list_page
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Callable, Coroutine
+from collections.abc import AsyncIterator, Callable, Coroutine, Iterator
 from typing import Any, TypeVar, cast
 
 _T = TypeVar("_T")
@@ -12,3 +12,23 @@ class _SyncRunner:
 
     def _run(self, coro: Coroutine[Any, Any, _T]) -> _T:
         return cast(_T, self._runner(coro))
+
+    def _iterate(self, iterator: AsyncIterator[_T]) -> Iterator[_T]:
+        """Drive an async iterator on the client loop, one round trip per value."""
+        try:
+            while True:
+                done, value = self._run(_next_value(iterator))
+                if done:
+                    return
+                yield cast(_T, value)
+        finally:
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                self._run(aclose())
+
+
+async def _next_value[ValueT](iterator: AsyncIterator[ValueT]) -> tuple[bool, ValueT | None]:
+    try:
+        return False, await anext(iterator)
+    except StopAsyncIteration:
+        return True, None
@@ -2,27 +2,41 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable, Collection, Coroutine, Mapping, Sequence
-from typing import Any, Protocol, TypeVar
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable, Collection, Coroutine, Iterator, Mapping, Sequence
+from typing import Any, Protocol, TypeVar, overload
 
 from pydantic import BaseModel
 
+from codex.app_server._incremental_json import _MessageJsonFeed
+from codex.app_server._pagination import DEFAULT_PREFETCH, iter_pages
 from codex.app_server._payloads import TurnInput
 from codex.app_server._protocol_helpers import Notification
 from codex.app_server._session import _AsyncNotificationSubscription
 from codex.app_server._sync_support import _SyncRunner
+from codex.app_server.errors import AppServerTurnError
 from codex.app_server.models import EmptyResult, TurnIdResult
-from codex.app_server.options import AppServerThreadForkOptions, AppServerTurnOptions
+from codex.app_server.options import (
+    AppServerThreadForkOptions,
+    AppServerTurnOptions,
+    NotificationOverflowPolicy,
+)
 from codex.protocol import types as protocol
 
 _ModelT = TypeVar("_ModelT", bound=BaseModel)
 DEFAULT_REVIEW_DELIVERY = protocol.ReviewDelivery("inline")
+# Upper bound on notifications `next()` pulls per loop-thread round trip.
+_SYNC_PREFETCH_ITEMS = 256
 
 
 class _AsyncEventsClientLike(Protocol):
     def subscribe(
         self,
         methods: Collection[str] | None = None,
+        *,
+        maxsize: int | None = None,
+        overflow: NotificationOverflowPolicy | None = None,
     ) -> _AsyncNotificationSubscription: ...
 
     def subscribe_command_exec_output(self, process_id: str) -> _AsyncNotificationSubscription: ...
@@ -39,7 +53,11 @@ class _AsyncTurnStreamLike(Protocol):
     usage: protocol.ThreadTokenUsage | None
     text_deltas: tuple[str, ...]
 
-    async def __anext__(self) -> Notification: ...
+    async def _receive(self) -> Notification: ...
+
+    def _receive_ready(self) -> bool: ...
+
+    def _accept(self, notification: Notification) -> Notification: ...
 
     async def wait(self) -> object: ...
 
@@ -47,6 +65,10 @@ class _AsyncTurnStreamLike(Protocol):
 
     def final_model(self, model_type: type[_ModelT]) -> _ModelT: ...
 
+    def partial_json(self) -> object | None: ...
+
+    def _structured_output_feed(self, path: Sequence[str | int]) -> _MessageJsonFeed: ...
+
     def raise_for_terminal_status(self) -> None: ...
 
     async def steer(
@@ -181,6 +203,97 @@ class _AsyncThreadLike(Protocol):
     async def unsubscribe(self) -> EmptyResult: ...
 
 
+async def _next_batch(
+    next_item: Callable[[], Awaitable[Notification]],
+    has_buffered: Callable[[], bool],
+    max_items: int,
+    max_latency: float,
+) -> tuple[list[Notification], BaseException | None]:
+    # Wait for one notification, then take whatever else is ready (waiting up to
+    # `max_latency` for more). An error after the first item is returned rather than
+    # raised so the caller can deliver the batch before surfacing it.
+    batch = [await next_item()]
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_latency
+    while len(batch) < max_items:
+        try:
+            if has_buffered():
+                batch.append(await next_item())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            batch.append(await asyncio.wait_for(next_item(), remaining))
+        except TimeoutError:
+            break
+        except Exception as exc:
+            return batch, exc
+    return batch, None
+
+
+class _SyncNotificationBuffer:
+    """Consumer-side buffer refilled from the loop thread one batch per round trip."""
+
+    def __init__(
+        self,
+        run: Callable[[Coroutine[Any, Any, Any]], Any],
+        next_item: Callable[[], Awaitable[Notification]],
+        has_buffered: Callable[[], bool],
+    ) -> None:
+        self._run = run
+        self._next_item = next_item
+        self._has_buffered = has_buffered
+        self._items: deque[Notification] = deque()
+        self._pending_error: BaseException | None = None
+        self._exhausted = False
+
+    def next(self) -> Notification:
+        if not self._items:
+            self._fill(_SYNC_PREFETCH_ITEMS, 0.0)
+        return self._items.popleft()
+
+    def batches(self, max_items: int, max_latency: float) -> Iterator[list[Notification]]:
+        if max_items < 1:
+            raise ValueError("max_items must be at least 1")
+        if max_latency < 0:
+            raise ValueError("max_latency must not be negative")
+        while True:
+            if not self._items:
+                try:
+                    self._fill(max_items, max_latency)
+                except StopAsyncIteration:
+                    return
+            count = min(max_items, len(self._items))
+            yield [self._items.popleft() for _ in range(count)]
+
+    def take_buffered(self) -> list[Notification]:
+        items = list(self._items)
+        self._items.clear()
+        return items
+
+    def clear(self) -> None:
+        self._items.clear()
+
+    def _fill(self, max_items: int, max_latency: float) -> None:
+        if self._exhausted:
+            raise StopAsyncIteration
+        error, self._pending_error = self._pending_error, None
+        if error is not None:
+            raise error
+        try:
+            batch, error = self._run(
+                _next_batch(self._next_item, self._has_buffered, max_items, max_latency)
+            )
+        except StopAsyncIteration:
+            self._exhausted = True
+            raise
+        self._items.extend(batch)
+        if isinstance(error, StopAsyncIteration):
+            self._exhausted = True
+        else:
+            self._pending_error = error
+
+
 class NotificationSubscription(_SyncRunner):
     """Synchronous iterator over connection-wide app-server notifications."""
 
@@ -191,10 +304,25 @@ class NotificationSubscription(_SyncRunner):
     ) -> None:
         super().__init__(run_awaitable)
         self._async_subscription = async_subscription
+        self._buffer = _SyncNotificationBuffer(
+            self._run,
+            async_subscription.next,
+            async_subscription.has_buffered,
+        )
 
     def __iter__(self) -> NotificationSubscription:
         return self
 
+    @property
+    def dropped(self) -> int:
+        """Number of notifications discarded because the subscription was full."""
+        return self._async_subscription.dropped
+
+    @property
+    def coalesced(self) -> int:
+        """Number of delta notifications merged into an already-buffered delta."""
+        return self._async_subscription.coalesced
+
     def __next__(self) -> Notification:
         try:
             return self.next()
@@ -202,9 +330,22 @@ class NotificationSubscription(_SyncRunner):
             raise StopIteration from exc
 
     def next(self) -> Notification:
-        return self._run(self._async_subscription.next())
+        return self._buffer.next()
+
+    def iter_batches(
+        self,
+        max_items: int = 100,
+        max_latency: float = 0.05,
+    ) -> Iterator[list[Notification]]:
+        """Yield lists of up to `max_items` notifications until the subscription closes.
+
+        Each batch waits for its first notification, then for at most `max_latency`
+        seconds more while filling up.
+        """
+        return self._buffer.batches(max_items, max_latency)
 
     def close(self) -> None:
+        self._buffer.clear()
         self._run(self._async_subscription.close())
 
 
@@ -219,9 +360,15 @@ class EventsClient(_SyncRunner):
         super().__init__(run_awaitable)
         self._async_events = async_events
 
-    def subscribe(self, methods: Collection[str] | None = None) -> NotificationSubscription:
+    def subscribe(
+        self,
+        methods: Collection[str] | None = None,
+        *,
+        maxsize: int | None = None,
+        overflow: NotificationOverflowPolicy | None = None,
+    ) -> NotificationSubscription:
         return NotificationSubscription(
-            self._async_events.subscribe(methods),
+            self._async_events.subscribe(methods, maxsize=maxsize, overflow=overflow),
             self._run,
         )
 
@@ -250,16 +397,55 @@ class TurnStream(_SyncRunner):
     ) -> None:
         super().__init__(run_awaitable)
         self._async_stream = async_stream
+        # Notifications are prefetched raw and applied to the async stream's state one
+        # at a time as they are handed out, so state never runs ahead of the caller.
+        self._buffer = _SyncNotificationBuffer(
+            self._run,
+            async_stream._receive,
+            async_stream._receive_ready,
+        )
 
     def __iter__(self) -> TurnStream:
         return self
 
     def __next__(self) -> Notification:
         try:
-            return self._run(self._async_stream.__anext__())
+            return self._next()
         except StopAsyncIteration as exc:
             raise StopIteration from exc
 
+    def _next(self) -> Notification:
+        return self._accept(self._buffer.next())
+
+    def _accept(self, notification: Notification) -> Notification:
+        try:
+            return self._async_stream._accept(notification)
+        except AppServerTurnError:
+            self.close()
+            raise
+
+    def iter_batches(
+        self,
+        max_items: int = 100,
+        max_latency: float = 0.05,
+    ) -> Iterator[list[Notification]]:
+        """Yield lists of up to `max_items` notifications until the turn finishes.
+
+        Each batch waits for its first notification, then for at most `max_latency`
+        seconds more while filling up. Aggregated state such as `final_text` already
+        reflects every notification in a batch when it is yielded.
+        """
+        for batch in self._buffer.batches(max_items, max_latency):
+            accepted: list[Notification] = []
+            try:
+                for notification in batch:
+                    accepted.append(self._accept(notification))
+            except AppServerTurnError:
+                if accepted:
+                    yield accepted
+                raise
+            yield accepted
+
     @property
     def initial_turn(self) -> protocol.Turn:
         return self._async_stream.initial_turn
@@ -294,7 +480,44 @@ class TurnStream(_SyncRunner):
     def final_model(self, model_type: type[_ModelT]) -> _ModelT:
         return self._async_stream.final_model(model_type)
 
+    def partial_json(self) -> object | None:
+        return self._async_stream.partial_json()
+
+    @overload
+    def iter_json_items(
+        self, path: Sequence[str | int], model: None = None
+    ) -> Iterator[object]: ...
+
+    @overload
+    def iter_json_items(
+        self, path: Sequence[str | int], model: type[_ModelT]
+    ) -> Iterator[_ModelT]: ...
+
+    def iter_json_items(
+        self, path: Sequence[str | int], model: type[_ModelT] | None = None
+    ) -> Iterator[object]:
+        """Consume the stream and yield each JSON value at `path` as soon as it completes.
+
+        See `AsyncTurnStream.iter_json_items()`. Notifications are pulled in batches, so
+        values completed by one batch are yielded together.
+        """
+        feed = self._async_stream._structured_output_feed(path)
+        try:
+            while True:
+                for value in feed.drain():
+                    yield value if model is None else model.model_validate(value)
+                try:
+                    self._next()
+                except StopAsyncIteration:
+                    break
+            for value in feed.finish(self.final_message):
+                yield value if model is None else model.model_validate(value)
+        finally:
+            self.close()
+
     def wait(self) -> TurnStream:
+        for notification in self._buffer.take_buffered():
+            self._accept(notification)
         self._run(self._async_stream.wait())
         return self
 
@@ -323,6 +546,7 @@ class TurnStream(_SyncRunner):
         return self._run(self._async_stream.interrupt())
 
     def close(self) -> None:
+        self._buffer.clear()
         self._run(self._async_stream.close())
 
 
@@ -386,6 +610,29 @@ class AppServerThread(_SyncRunner):
             )
         )
 
+    def iter_items(
+        self,
+        *,
+        cursor: str | None = None,
+        page_size: int | None = None,
+        sort_direction: protocol.SortDirection | None = None,
+        turn_id: str | None = None,
+        prefetch: int = DEFAULT_PREFETCH,
+    ) -> Iterator[protocol.ThreadItem]:
+        """Yield every persisted item from `cursor` on, prefetching up to `prefetch` pages."""
+
+        def fetch(cursor: str | None) -> Awaitable[protocol.ThreadItemsListResponse]:
+            return self._async_thread.list_items_page(
+                cursor=cursor,
+                limit=page_size,
+                sort_direction=sort_direction,
+                turn_id=turn_id,
+            )
+
+        for page in self._iterate(iter_pages(fetch, cursor=cursor, prefetch=prefetch)):
+            for entry in page.data:
+                yield entry.item
+
     def list_turns(
         self,
         *,
@@ -420,6 +667,28 @@ class AppServerThread(_SyncRunner):
             )
         )
 
+    def iter_turns(
+        self,
+        *,
+        cursor: str | None = None,
+        items_view: protocol.TurnItemsView | None = None,
+        page_size: int | None = None,
+        sort_direction: protocol.SortDirection | None = None,
+        prefetch: int = DEFAULT_PREFETCH,
+    ) -> Iterator[protocol.Turn]:
+        """Yield every persisted turn from `cursor` on, prefetching up to `prefetch` pages."""
+
+        def fetch(cursor: str | None) -> Awaitable[protocol.ThreadTurnsListResponse]:
+            return self._async_thread.list_turns_page(
+                cursor=cursor,
+                items_view=items_view,
+                limit=page_size,
+                sort_direction=sort_direction,
+            )
+
+        for page in self._iterate(iter_pages(fetch, cursor=cursor, prefetch=prefetch)):
+            yield from page.data
+
     def search_occurrences(
         self,
         search_term: str,
@@ -450,6 +719,24 @@ class AppServerThread(_SyncRunner):
             )
         )
 
+    def iter_search_occurrences(
+        self,
+        search_term: str,
+        *,
+        cursor: str | None = None,
+        page_size: int | None = None,
+        prefetch: int = DEFAULT_PREFETCH,
+    ) -> Iterator[protocol.ThreadSearchOccurrence]:
+        """Yield every message occurrence of `search_term`, prefetching up to `prefetch` pages."""
+
+        def fetch(cursor: str | None) -> Awaitable[protocol.ThreadSearchOccurrencesResponse]:
+            return self._async_thread.search_occurrences_page(
+                search_term, cursor=cursor, limit=page_size
+            )
+
+        for page in self._iterate(iter_pages(fetch, cursor=cursor, prefetch=prefetch)):
+            yield from page.data
+
     def run(
         self,
         input: TurnInput,
@@ -0,0 +1,342 @@
+"""Fast paths for building protocol models from payloads sent by a trusted app-server."""
+
+from __future__ import annotations
+
+import copy
+import types
+from collections.abc import Callable
+from typing import Annotated, Any, Literal, Union, cast, get_args, get_origin
+
+from pydantic import BaseModel, RootModel, TypeAdapter
+
+type _Builder = Callable[[Any], Any]
+type ModelBuildMode = Literal["lazy", "trusted"]
+
+_MISSING = object()
+_IMMUTABLE = (str, int, float, bool, tuple, frozenset)
+
+
+def model_builder[ModelT: BaseModel](
+    model: type[ModelT], mode: ModelBuildMode
+) -> Callable[[object], ModelT]:
+    """Return a function that builds `model` from a JSON payload.
+
+    Pydantic validates a plain union by trying each variant in turn, which dominates the
+    cost of item payloads such as `ThreadItem`. Both modes instead match each union value
+    to the variant named by its literal tag field (`type`, `method`, ...), and values
+    without a unique tag fall back to validating the whole union.
+
+    In "lazy" mode the chosen variant is validated as usual. In "trusted" mode it is
+    assembled from the payload without validation. Payloads with no unions inside, such
+    as text deltas, are validated directly in both modes, since pydantic-core does that
+    faster than Python can copy their fields.
+    """
+    return cast(Callable[[object], ModelT], _builder(model, construct=False, mode=mode))
+
+
+_BUILDERS: dict[tuple[type[BaseModel], bool, ModelBuildMode], _Builder] = {}
+
+
+def _builder(model: type[BaseModel], *, construct: bool, mode: ModelBuildMode) -> _Builder:
+    key = (model, construct, mode)
+    builder = _BUILDERS.get(key)
+    if builder is None:
+        if _needs_validation(model):
+            builder = model.model_validate
+        elif construct:
+            builder = _ConstructPlan(model, mode).build
+        elif _contains_model_union(model, set()):
+            builder = _ResolvePlan(model, mode).build
+        else:
+            builder = model.model_validate
+        _BUILDERS[key] = builder
+    return builder
+
+
+class _ResolvePlan:
+    """Validate a model after replacing its union values with already-built variants."""
+
+    __slots__ = ("_fields", "_mode", "_model", "_root")
+
+    def __init__(self, model: type[BaseModel], mode: ModelBuildMode) -> None:
+        self._model = model
+        self._mode = mode
+        self._root = issubclass(model, RootModel)
+        self._fields: tuple[tuple[str, _Builder], ...] | None = None
+
+    def build(self, payload: object) -> BaseModel:
+        fields = self._fields
+        if fields is None:
+            # Compiled on first use so self-referencing models resolve through the cache.
+            self._fields = fields = tuple(
+                (field.alias or name, converter)
+                for name, field in self._model.model_fields.items()
+                if _contains_union(field.annotation, set())
+                and (converter := _converter(field.annotation, construct=False, mode=self._mode))
+                is not None
+            )
+        if self._root:
+            if not fields or payload is None:
+                return self._model.model_validate(payload)
+            return _instantiate(self._model, {"root": fields[0][1](payload)}, {"root"})
+        if not isinstance(payload, dict):
+            return self._model.model_validate(payload)
+        updates = {
+            key: converter(value)
+            for key, converter in fields
+            if (value := payload.get(key)) is not None
+        }
+        return self._model.model_validate({**payload, **updates} if updates else payload)
+
+
+class _ConstructPlan:
+    """Assemble a model from a trusted payload without validating its values."""
+
+    __slots__ = ("_fields", "_mode", "_model", "_root")
+
+    def __init__(self, model: type[BaseModel], mode: ModelBuildMode) -> None:
+        self._model = model
+        self._mode = mode
+        self._root = issubclass(model, RootModel)
+        self._fields: (
+            tuple[tuple[str, str, _Builder | None, Callable[[], object] | None], ...] | None
+        ) = None
+
+    def build(self, payload: object) -> BaseModel:
+        fields = self._fields
+        if fields is None:
+            self._fields = fields = self._compile()
+        if self._root:
+            converter = fields[0][2]
+            root = payload if converter is None or payload is None else converter(payload)
+            return _instantiate(self._model, {"root": root}, {"root"})
+        if not isinstance(payload, dict):
+            return self._model.model_validate(payload)
+        values: dict[str, object] = {}
+        fields_set: set[str] = set()
+        for name, key, converter, default in fields:
+            value = payload.get(key, _MISSING)
+            if value is _MISSING:
+                if default is None:
+                    return self._model.model_validate(payload)
+                values[name] = default()
+                continue
+            values[name] = value if converter is None or value is None else converter(value)
+            fields_set.add(name)
+        return _instantiate(self._model, values, fields_set)
+
+    def _compile(self) -> tuple[tuple[str, str, _Builder | None, Callable[[], object] | None], ...]:
+        fields = []
+        for name, field in self._model.model_fields.items():
+            default: Callable[[], object] | None = None
+            if field.default_factory is not None:
+                default = cast(Callable[[], object], field.default_factory)
+            elif not field.is_required():
+                default = _default_factory(field.get_default())
+            converter = _converter(field.annotation, construct=True, mode=self._mode)
+            fields.append((name, field.alias or name, converter, default))
+        return tuple(fields)
+
+
+def _default_factory(value: object) -> Callable[[], object]:
+    shared = value.root if isinstance(value, RootModel) else value
+    if shared is None or isinstance(shared, _IMMUTABLE):
+        # Scalars, and root models that wrap one such as `source="agent"`, are shared.
+        return lambda: value
+    return lambda: copy.deepcopy(value)
+
+
+def _instantiate(
+    model: type[BaseModel], values: dict[str, object], fields_set: set[str]
+) -> BaseModel:
+    # What `BaseModel.model_construct()` does, without its per-call field bookkeeping.
+    instance = model.__new__(model)
+    object.__setattr__(instance, "__dict__", values)
+    object.__setattr__(instance, "__pydantic_fields_set__", fields_set)
+    object.__setattr__(instance, "__pydantic_extra__", None)
+    object.__setattr__(instance, "__pydantic_private__", None)
+    return instance
+
+
+def _needs_validation(model: type[BaseModel]) -> bool:
+    decorators = model.__pydantic_decorators__
+    if decorators.field_validators or decorators.model_validators or decorators.validators:
+        return True
+    if model.model_config.get("extra") == "allow" or model.__private_attributes__:
+        return True
+    return any(
+        field.validation_alias is not None and field.validation_alias != field.alias
+        for field in model.model_fields.values()
+    )
+
+
+def _converter(annotation: Any, *, construct: bool, mode: ModelBuildMode) -> _Builder | None:
+    """Return a function that builds `annotation` from JSON, or None when JSON already is it."""
+    annotation = _unwrap(annotation)
+    origin = get_origin(annotation)
+    if origin is Union or origin is types.UnionType:
+        return _union_converter(get_args(annotation), construct=construct, mode=mode)
+    if origin is list:
+        args = get_args(annotation)
+        item = _converter(args[0], construct=construct, mode=mode) if args else None
+        return None if item is None else _list_converter(item)
+    if origin is dict:
+        args = get_args(annotation)
+        value = _converter(args[1], construct=construct, mode=mode) if len(args) == 2 else None
+        return None if value is None else _dict_converter(value)
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        tags = _literal_values(annotation) if construct else None
+        if tags is not None and issubclass(annotation, RootModel):
+            return _tag_converter(annotation, tags)
+        return _builder(annotation, construct=construct, mode=mode)
+    return None
+
+
+def _tag_converter(model: type[BaseModel], values: tuple[object, ...]) -> _Builder:
+    # Tag models such as `ThreadItem.type` are built constantly; share one instance per value.
+    instances = {value: _instantiate(model, {"root": value}, {"root"}) for value in values}
+
+    def convert(value: object) -> object:
+        instance = instances.get(value) if isinstance(value, str | int | bool) else None
+        return model.model_validate(value) if instance is None else instance
+
+    return convert
+
+
+def _list_converter(item: _Builder) -> _Builder:
+    def convert(value: object) -> object:
+        if not isinstance(value, list):
+            return value
+        return [entry if entry is None else item(entry) for entry in value]
+
+    return convert
+
+
+def _dict_converter(item: _Builder) -> _Builder:
+    def convert(value: object) -> object:
+        if not isinstance(value, dict):
+            return value
+        return {key: entry if entry is None else item(entry) for key, entry in value.items()}
+
+    return convert
+
+
+def _union_converter(
+    arms: tuple[Any, ...], *, construct: bool, mode: ModelBuildMode
+) -> _Builder | None:
+    arms = tuple(arm for arm in arms if arm is not type(None))
+    if len(arms) == 1:
+        return _converter(arms[0], construct=construct, mode=mode)
+    variants = [arm for arm in map(_unwrap, arms) if _is_object_model(arm)]
+    pick = _variant_picker(variants) if len(variants) > 1 else None
+    if pick is None and not construct:
+        return None
+    adapter: list[TypeAdapter[Any]] = []
+
+    def validate(value: object) -> object:
+        if not adapter:
+            adapter.append(TypeAdapter(cast(Any, Union[arms])))  # noqa: UP007
+        return adapter[0].validate_python(value)
+
+    if pick is None:
+        return validate
+    # Variants are the leaves of the payload, so "trusted" skips validating them.
+    builders = {
+        variant: _builder(variant, construct=mode == "trusted", mode=mode) for variant in variants
+    }
+
+    def convert(value: object) -> object:
+        model = pick(value) if isinstance(value, dict) else None
+        return validate(value) if model is None else builders[model](value)
+
+    return convert
+
+
+def _variant_picker(
+    models: list[type[BaseModel]],
+) -> Callable[[dict[Any, Any]], type[BaseModel] | None] | None:
+    """Return a lookup from a payload's tag value to its variant, if one field tags them all."""
+    tags = [_literal_fields(model) for model in models]
+    for key in sorted(set.intersection(*(set(fields) for fields in tags))):
+        by_value = {
+            value: model
+            for model, fields in zip(models, tags, strict=True)
+            for value in fields[key]
+        }
+        if sum(len(fields[key]) for fields in tags) == len(by_value):
+            return _tag_lookup(key, by_value)
+    return None
+
+
+def _tag_lookup(
+    key: str, by_value: dict[object, type[BaseModel]]
+) -> Callable[[dict[Any, Any]], type[BaseModel] | None]:
+    def by_tag(value: dict[Any, Any]) -> type[BaseModel] | None:
+        tag = value.get(key)
+        return by_value.get(tag) if isinstance(tag, str | int | bool) else None
+
+    return by_tag
+
+
+def _literal_fields(model: type[BaseModel]) -> dict[str, tuple[object, ...]]:
+    fields: dict[str, tuple[object, ...]] = {}
+    for name, field in model.model_fields.items():
+        if not field.is_required():
+            continue
+        values = _literal_values(field.annotation)
+        if values is not None:
+            fields[field.alias or name] = values
+    return fields
+
+
+def _literal_values(annotation: Any) -> tuple[object, ...] | None:
+    annotation = _unwrap(annotation)
+    if isinstance(annotation, type) and issubclass(annotation, RootModel):
+        annotation = _unwrap(annotation.model_fields["root"].annotation)
+    is_union = get_origin(annotation) in (Union, types.UnionType)
+    values: list[object] = []
+    for arm in get_args(annotation) if is_union else (annotation,):
+        arm = _unwrap(arm)
+        if get_origin(arm) is not Literal:
+            return None
+        values.extend(get_args(arm))
+    return tuple(values)
+
+
+def _contains_model_union(model: type[BaseModel], seen: set[type[BaseModel]]) -> bool:
+    if model in seen:
+        return False
+    seen.add(model)
+    return any(_contains_union(field.annotation, seen) for field in model.model_fields.values())
+
+
+def _contains_union(annotation: Any, seen: set[type[BaseModel]]) -> bool:
+    annotation = _unwrap(annotation)
+    origin = get_origin(annotation)
+    if origin is Union or origin is types.UnionType:
+        arms = [arm for arm in map(_unwrap, get_args(annotation)) if arm is not type(None)]
+        if sum(_is_object_model(arm) for arm in arms) > 1:
+            return True
+        return any(_contains_union(arm, seen) for arm in arms)
+    if origin is list or origin is dict:
+        return any(_contains_union(arg, seen) for arg in get_args(annotation))
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return _contains_model_union(annotation, seen)
+    return False
+
+
+def _is_object_model(annotation: Any) -> bool:
+    return (
+        isinstance(annotation, type)
+        and issubclass(annotation, BaseModel)
+        and not issubclass(annotation, RootModel)
+    )
+
+
+def _unwrap(annotation: Any) -> Any:
+    while True:
+        annotation = getattr(annotation, "__value__", annotation)
+        annotation = getattr(annotation, "__supertype__", annotation)
+        if get_origin(annotation) is not Annotated:
+            return annotation
+        annotation = get_args(annotation)[0]
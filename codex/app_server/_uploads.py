@@ -0,0 +1,105 @@
+"""Read upload sources in bounded chunks and base64-encode them one chunk at a time."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import mmap
+import os
+from collections.abc import AsyncGenerator, AsyncIterable, AsyncIterator, Callable, Iterable
+from typing import BinaryIO
+
+DEFAULT_UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+type UploadSource = (
+    str
+    | os.PathLike[str]
+    | bytes
+    | bytearray
+    | memoryview
+    | BinaryIO
+    | Iterable[bytes]
+    | AsyncIterable[bytes]
+)
+type UploadProgress = Callable[[int, int | None], object]
+"""Called with the bytes uploaded so far and the total, or None when it is not known."""
+
+
+def source_size(source: UploadSource) -> int | None:
+    """Return the number of bytes `source` holds, when that is known before reading it."""
+    if isinstance(source, str | os.PathLike):
+        return os.stat(source).st_size
+    if isinstance(source, bytes | bytearray | memoryview):
+        return memoryview(source).nbytes
+    return None
+
+
+async def encoded_chunks(source: UploadSource, chunk_size: int) -> AsyncGenerator[tuple[str, int]]:
+    """Yield the base64 text and raw size of consecutive chunks of at most `chunk_size` bytes.
+
+    Only one chunk is held, raw and encoded, at a time. Local paths are memory-mapped,
+    file objects are read `chunk_size` bytes at a time, and iterables are split or
+    joined into chunks of exactly `chunk_size` bytes. Each chunk is read and encoded
+    in a worker thread, so page faults, blocking reads and encoding stay off the loop.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be > 0")
+    if isinstance(source, str | os.PathLike):
+        with open(source, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for start in range(0, len(mapped), chunk_size):
+                    yield await asyncio.to_thread(_encode_mapped, mapped, start, chunk_size)
+        return
+    if isinstance(source, bytes | bytearray | memoryview):
+        with memoryview(source).cast("B") as view:
+            for start in range(0, len(view), chunk_size):
+                yield await asyncio.to_thread(_encode_view, view, start, chunk_size)
+        return
+    read = getattr(source, "read", None)
+    if read is not None:
+        while encoded := await asyncio.to_thread(_read_encoded, read, chunk_size):
+            yield encoded
+        return
+    async for chunk in _rechunk(_aiter(source), chunk_size):
+        yield await asyncio.to_thread(_encode, chunk)
+
+
+def _encode(chunk: bytes | memoryview) -> tuple[str, int]:
+    return base64.b64encode(chunk).decode("ascii"), len(chunk)
+
+
+def _encode_mapped(mapped: mmap.mmap, start: int, chunk_size: int) -> tuple[str, int]:
+    # Slicing copies the chunk out of the mapping, so closing it never meets an exported view.
+    return _encode(mapped[start : start + chunk_size])
+
+
+def _encode_view(view: memoryview, start: int, chunk_size: int) -> tuple[str, int]:
+    with view[start : start + chunk_size] as chunk:
+        return _encode(chunk)
+
+
+def _read_encoded(read: Callable[[int], bytes], chunk_size: int) -> tuple[str, int] | None:
+    chunk = read(chunk_size)
+    return _encode(chunk) if chunk else None
+
+
+async def _aiter(source: Iterable[bytes] | AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    if isinstance(source, AsyncIterable):
+        async for chunk in source:
+            yield chunk
+    else:
+        for chunk in source:
+            yield chunk
+
+
+async def _rechunk(chunks: AsyncIterator[bytes], chunk_size: int) -> AsyncIterator[bytes]:
+    pending = bytearray()
+    async for chunk in chunks:
+        pending += chunk
+        while len(pending) >= chunk_size:
+            yield bytes(pending[:chunk_size])
+            del pending[:chunk_size]
+    if pending:
+        yield bytes(pending)
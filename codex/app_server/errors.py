@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from typing import TYPE_CHECKING, Any
 
 from codex.errors import CodexError
@@ -13,13 +14,33 @@ class AppServerError(CodexError):
 
 
 class AppServerConnectionError(AppServerError):
-    """Raised when the app-server transport cannot be started or used."""
+    """Raised when the app-server transport cannot be started or used.
+
+    `stderr_tail` holds the last stderr lines of a stdio app-server that exited, and is
+    appended to the message; it is empty for other failures.
+    """
+
+    def __init__(self, message: str, *, stderr_tail: Sequence[str] = ()) -> None:
+        self.stderr_tail = tuple(stderr_tail)
+        if self.stderr_tail:
+            message = f"{message}\napp-server stderr (last {len(self.stderr_tail)} lines):\n"
+            message += "\n".join(self.stderr_tail)
+        super().__init__(message)
 
 
 class AppServerClosedError(AppServerConnectionError):
     """Raised when the app-server connection has already been closed."""
 
 
+class AppServerTimeoutError(AppServerError, TimeoutError):
+    """Raised when a request gets no response within its timeout or `deadline()`."""
+
+    def __init__(self, method: str, timeout: float) -> None:
+        super().__init__(f"app-server request {method!r} timed out after {timeout:g}s")
+        self.method = method
+        self.timeout = timeout
+
+
 class AppServerProtocolError(AppServerError):
     """Raised when a received app-server message is malformed."""
 
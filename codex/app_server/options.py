@@ -2,16 +2,20 @@
 
 from __future__ import annotations
 
-from collections.abc import Mapping, Sequence
-from typing import cast
+from collections.abc import Callable, Mapping, Sequence
+from typing import Literal, cast
 
-from pydantic import BaseModel, ConfigDict, Field, field_serializer
+from pydantic import BaseModel, ConfigDict, Field, PositiveFloat, PositiveInt, field_serializer
 from pydantic.alias_generators import to_camel
 
 from codex._config_types import CodexConfig
+from codex.app_server._json_codec import JsonCodec, JsonCodecName
 from codex.output_schema import OutputSchemaInput, normalize_output_schema
 from codex.protocol import types as protocol
 
+type NotificationOverflowPolicy = Literal["block", "drop_oldest", "drop_newest", "coalesce"]
+type ProtocolValidationMode = Literal["full", "lazy", "trusted"]
+
 
 class _AppServerOptionsModel(BaseModel):
     model_config = ConfigDict(
@@ -40,6 +44,50 @@ class AppServerClientInfo(_AppServerOptionsModel):
     )
 
 
+DEFAULT_CACHE_TTL: Mapping[str, float] = {
+    "app/list": 60.0,
+    "config/read": 30.0,
+    "model/list": 300.0,
+    "skills/list": 60.0,
+}
+# Read-only methods that are safe to pass as `coalesce_methods`.
+DEFAULT_COALESCE_METHODS: frozenset[str] = frozenset(
+    {
+        "account/rateLimits/read",
+        "account/read",
+        "app/list",
+        "config/read",
+        "model/list",
+        "skills/list",
+        "thread/list",
+        "thread/loaded/list",
+        "thread/read",
+    }
+)
+
+
+class AppServerCacheOptions(_AppServerOptionsModel):
+    """Client-side cache for catalog reads whose results rarely change.
+
+    Cached results are dropped when they expire, when a write on the same connection
+    may change them (config writes, MCP server reloads, skill config or skill file
+    writes), when app-server reports a change with a notification such as
+    `skills/changed`, and after a reconnect.
+    """
+
+    ttl: dict[str, PositiveFloat] = Field(
+        default_factory=lambda: dict(DEFAULT_CACHE_TTL),
+        description=(
+            "Seconds a result stays cached, keyed by request method. Only these methods "
+            "are cached, separately for each distinct params object."
+        ),
+    )
+    maxsize: PositiveInt = Field(
+        default=128,
+        description="Most results kept; the least recently used one is dropped first.",
+    )
+
+
 class AppServerInitializeOptions(_AppServerOptionsModel):
     """Handshake options for a single app-server connection."""
 
@@ -73,6 +121,98 @@ class AppServerInitializeOptions(_AppServerOptionsModel):
             "When false, unknown protocol messages can fall back to generic models."
         ),
     )
+    validation: ProtocolValidationMode = Field(
+        default="full",
+        exclude=True,
+        description=(
+            "SDK-only. How responses, notifications, and server requests become models. "
+            "'full' validates every payload. 'lazy' picks each union member such as a thread "
+            "item by its type tag instead of trying every variant, then validates it. "
+            "'trusted' also builds those members without validation, for a local app-server "
+            "whose output is trusted. strict_protocol=True always uses 'full'."
+        ),
+    )
+    notification_queue_maxsize: int = Field(
+        default=0,
+        ge=0,
+        exclude=True,
+        description=(
+            "SDK-only. Default per-subscription notification buffer size, including turn "
+            "streams. 0 keeps subscriptions unbounded."
+        ),
+    )
+    notification_overflow: NotificationOverflowPolicy = Field(
+        default="block",
+        exclude=True,
+        description=(
+            "SDK-only. What a full subscription does with new notifications: 'block' the "
+            "connection reader, 'drop_oldest', 'drop_newest', or 'coalesce' consecutive "
+            "text deltas (falling back to dropping the oldest)."
+        ),
+    )
+    compact_deltas: bool = Field(
+        default=False,
+        exclude=True,
+        description=(
+            "SDK-only. Deliver agent message, reasoning text, and command output deltas as "
+            "slotted DeltaEvent objects instead of protocol models, for every subscription "
+            "including turn streams. Ignored when strict_protocol=True."
+        ),
+    )
+    coalesce_methods: frozenset[str] = Field(
+        default=frozenset(),
+        exclude=True,
+        description=(
+            "SDK-only. Read-only request methods, such as thread/read or model/list, whose "
+            "identical concurrent calls share one request and its result. Any other request "
+            "stops later calls from joining reads already in flight. Pass "
+            "DEFAULT_COALESCE_METHODS to coalesce the common catalog and thread reads."
+        ),
+    )
+    cache: AppServerCacheOptions | None = Field(
+        default=None,
+        exclude=True,
+        description=(
+            "SDK-only. Cache the results of slow-changing reads such as model/list and "
+            "config/read for this connection. None sends every request."
+        ),
+    )
+    server_request_concurrency: dict[str, PositiveInt] = Field(
+        default_factory=dict,
+        exclude=True,
+        description=(
+            "SDK-only. Maximum number of in-flight handler calls per server-request method, "
+            "for example {'item/tool/call': 4}. Methods not listed are unbounded."
+        ),
+    )
+    sync_handler_workers: int = Field(
+        default=8,
+        ge=1,
+        exclude=True,
+        description=(
+            "SDK-only. Size of the thread pool that runs synchronous server-request handlers "
+            "and synchronous dynamic tools."
+        ),
+    )
+    request_timeout: float | None = Field(
+        default=None,
+        gt=0,
+        exclude=True,
+        description=(
+            "SDK-only. Default seconds each request waits for its response before raising "
+            "AppServerTimeoutError. None waits until the connection fails. A per-call "
+            "timeout replaces it; an enclosing deadline() can shorten either."
+        ),
+    )
+    cancel_request_method: str | None = Field(
+        default=None,
+        exclude=True,
+        description=(
+            "SDK-only. Notification sent with {'id': <request id>} when a request times out "
+            "or is cancelled, for servers that support JSON-RPC cancellation (for example "
+            "'$/cancelRequest'). codex app-server defines none yet, so None sends nothing."
+        ),
+    )
 
     def to_params(self) -> dict[str, object]:
         """Build the JSON-RPC `initialize` params object."""
@@ -96,6 +236,8 @@ class AppServerInitializeOptions(_AppServerOptionsModel):
 class AppServerProcessOptions(_AppServerOptionsModel):
     """Process launch options for stdio-based app-server connections."""
 
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     codex_path_override: str | None = Field(
         default=None,
         description="Override the codex binary path used for the stdio subprocess.",
@@ -116,6 +258,140 @@ class AppServerProcessOptions(_AppServerOptionsModel):
         default=None,
         description="Additional environment variables merged into the child process environment.",
     )
+    stderr_tail_lines: int = Field(
+        default=200,
+        ge=0,
+        exclude=True,
+        description=(
+            "SDK-only. Number of most recent stderr lines kept in memory and attached to the "
+            "connection error raised when the child process exits. 0 keeps none."
+        ),
+    )
+    stderr_callback: Callable[[str], object] | None = Field(
+        default=None,
+        exclude=True,
+        description=(
+            "SDK-only. Called with each stderr line, subject to stderr_rate_limit. "
+            "May be sync or async; exceptions are logged and ignored."
+        ),
+    )
+    stderr_log_level: int | None = Field(
+        default=None,
+        exclude=True,
+        description=(
+            "SDK-only. Forward stderr lines to the 'codex.app_server.stderr' logger at this level, "
+            "subject to stderr_rate_limit. None disables logging."
+        ),
+    )
+    stderr_rate_limit: float | None = Field(
+        default=100.0,
+        gt=0,
+        exclude=True,
+        description=(
+            "SDK-only. Maximum stderr lines per second passed to stderr_callback and logging. "
+            "Lines over the limit are counted and reported when forwarding resumes. None "
+            "forwards all."
+        ),
+    )
+    max_message_bytes: int | None = Field(
+        default=None,
+        gt=0,
+        exclude=True,
+        description=(
+            "SDK-only. Largest stdout message accepted from the child process, in bytes. "
+            "None accepts messages of any size."
+        ),
+    )
+    json_codec: JsonCodecName | JsonCodec = Field(
+        default="auto",
+        exclude=True,
+        description=(
+            "SDK-only. JSON codec for messages on the stdio pipes: 'orjson' or 'msgspec' when installed, "
+            "'stdlib', a custom JsonCodec, or 'auto' to use the fastest installed codec."
+        ),
+    )
+
+
+DEFAULT_REPLAY_METHODS: frozenset[str] = frozenset(
+    {
+        "account/rateLimits/read",
+        "account/read",
+        "app/list",
+        "config/read",
+        "configRequirements/read",
+        "environment/info",
+        "fs/getMetadata",
+        "fs/readDirectory",
+        "fs/readFile",
+        "mcpServerStatus/list",
+        "model/list",
+        "skills/list",
+        "thread/items/list",
+        "thread/list",
+        "thread/loaded/list",
+        "thread/read",
+        "thread/searchOccurrences",
+        "thread/turns/list",
+    }
+)
+
+
+class AppServerReconnectOptions(_AppServerOptionsModel):
+    """Reconnect policy for websocket app-server sessions that outlive network drops.
+
+    After a lost connection the session reconnects with exponential backoff, repeats
+    the `initialize` handshake, resumes loaded threads, resends pending requests for
+    `replay_methods`, and catches in-flight turn streams up from `thread/turns/list`.
+    """
+
+    max_attempts: int = Field(
+        default=5,
+        ge=1,
+        description=(
+            "Connection attempts after each drop before pending requests and "
+            "streams fail with the connection error."
+        ),
+    )
+    initial_backoff: float = Field(
+        default=0.5,
+        ge=0,
+        description="Seconds to wait before the first reconnect attempt.",
+    )
+    max_backoff: float = Field(
+        default=30.0,
+        ge=0,
+        description="Upper bound, in seconds, for the wait between reconnect attempts.",
+    )
+    backoff_multiplier: float = Field(
+        default=2.0,
+        ge=1,
+        description="Factor applied to the wait after each failed attempt.",
+    )
+    jitter: float = Field(
+        default=0.1,
+        ge=0,
+        le=1,
+        description="Random fraction of each wait added or removed to spread out reconnects.",
+    )
+    replay_methods: frozenset[str] = Field(
+        default=DEFAULT_REPLAY_METHODS,
+        description=(
+            "Idempotent request methods resent after reconnecting. Pending requests for "
+            "other methods fail with the connection error, since they may have run."
+        ),
+    )
+    resume_threads: bool = Field(
+        default=True,
+        description=(
+            "Send thread/resume for every thread this connection started, resumed, or "
+            "forked, and catch up in-flight turn streams from thread/turns/list."
+        ),
+    )
+
+    def backoff(self, attempt: int, jitter: float) -> float:
+        """Return the wait before reconnect `attempt` (0-based); `jitter` is in [-1, 1]."""
+        delay = min(self.initial_backoff * self.backoff_multiplier**attempt, self.max_backoff)
+        return max(0.0, delay * (1 + self.jitter * jitter))
 
 
 class AppServerWebSocketOptions(_AppServerOptionsModel):
@@ -127,6 +403,8 @@ class AppServerWebSocketOptions(_AppServerOptionsModel):
     are rejected so validation stays centralized.
     """
 
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     bearer_token: str | None = Field(
         default=None,
         description="Adds an Authorization: Bearer header to the websocket handshake.",
@@ -158,6 +436,22 @@ class AppServerWebSocketOptions(_AppServerOptionsModel):
             "Set to None to disable the websockets receive size limit."
         ),
     )
+    json_codec: JsonCodecName | JsonCodec = Field(
+        default="auto",
+        exclude=True,
+        description=(
+            "SDK-only. JSON codec for websocket messages: 'orjson' or 'msgspec' when installed, "
+            "'stdlib', a custom JsonCodec, or 'auto' to use the fastest installed codec."
+        ),
+    )
+    reconnect: AppServerReconnectOptions | None = Field(
+        default=None,
+        exclude=True,
+        description=(
+            "SDK-only. Reconnect and resume the session after the websocket drops. "
+            "None fails pending requests and streams on the first connection error."
+        ),
+    )
 
     def to_connect_kwargs(self) -> dict[str, object]:
         headers = {} if self.headers is None else dict(self.headers)
@@ -182,6 +476,45 @@ class AppServerWebSocketOptions(_AppServerOptionsModel):
         return kwargs
 
 
+class AppServerSocketOptions(_AppServerOptionsModel):
+    """Connection options for Unix domain socket and TCP app-server sessions.
+
+    Both carry the same newline-delimited JSON-RPC stream as stdio, typically to an
+    `AppServerBroker` that shares one app-server process between many clients.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    connect_timeout: float | None = Field(
+        default=10.0,
+        gt=0,
+        description="Seconds to wait for the socket connection. None waits indefinitely.",
+    )
+    max_message_bytes: int | None = Field(
+        default=None,
+        gt=0,
+        description=(
+            "Largest message accepted from the socket, in bytes. None accepts messages of any size."
+        ),
+    )
+    json_codec: JsonCodecName | JsonCodec = Field(
+        default="auto",
+        exclude=True,
+        description=(
+            "SDK-only. JSON codec for socket messages: 'orjson' or 'msgspec' when installed, "
+            "'stdlib', a custom JsonCodec, or 'auto' to use the fastest installed codec."
+        ),
+    )
+    reconnect: AppServerReconnectOptions | None = Field(
+        default=None,
+        exclude=True,
+        description=(
+            "SDK-only. Reconnect and resume the session after the socket drops, for "
+            "example while a broker restarts. None fails pending requests and streams."
+        ),
+    )
+
+
 class AppServerTurnOptions(_AppServerOptionsModel):
     """High-level options for starting a turn on an app-server thread.
 
@@ -261,6 +594,22 @@ class AppServerTurnOptions(_AppServerOptionsModel):
         default=None,
         description="Sent as turn/start summary.",
     )
+    retain_text_deltas: bool = Field(
+        default=True,
+        exclude=True,
+        description=(
+            "SDK-only. Keep every agent text delta for TurnStream.text_deltas. Disable when "
+            "only the final text is needed to avoid holding a second copy of the output."
+        ),
+    )
+    compact_deltas: bool | None = Field(
+        default=None,
+        exclude=True,
+        description=(
+            "SDK-only. Yield delta notifications as DeltaEvent objects from this turn's "
+            "stream. None uses AppServerInitializeOptions.compact_deltas."
+        ),
+    )
 
     @field_serializer("output_schema", when_used="unless-none")
     def _serialize_output_schema(self, value: OutputSchemaInput) -> object:
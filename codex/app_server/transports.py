@@ -1,24 +1,39 @@
 from __future__ import annotations
 
+import abc
 import asyncio
-import json
+import inspect
+import logging
 import os
 import shutil
-from collections.abc import Mapping
+import time
+from collections import deque
+from contextlib import suppress
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Protocol
+from typing import Any, Protocol, cast
 
 from codex._binary import bundled_app_server_path
 from codex._runtime import build_child_env, resolve_codex_path, serialize_config_overrides
+from codex.app_server._json_codec import JsonCodec, JsonPayload, resolve_json_codec
 from codex.app_server._types import JsonObject
 from codex.app_server.errors import (
     AppServerClosedError,
     AppServerConnectionError,
     AppServerProtocolError,
 )
-from codex.app_server.options import AppServerProcessOptions, AppServerWebSocketOptions
+from codex.app_server.options import (
+    AppServerProcessOptions,
+    AppServerSocketOptions,
+    AppServerWebSocketOptions,
+)
 
 STDIO_STREAM_LIMIT_BYTES = 4 * 1024 * 1024
+# Bytes requested from stdout per read; messages larger than this span several reads.
+_STDOUT_READ_BYTES = 256 * 1024
+# How long a closed stdout waits for the process exit status and final stderr lines.
+_EXIT_WAIT_SECONDS = 1.0
+_STDERR_LOGGER = logging.getLogger("codex.app_server.stderr")
 
 
 class AsyncMessageTransport(Protocol):
@@ -55,12 +70,159 @@ def _build_env(options: AppServerProcessOptions) -> dict[str, str]:
     )
 
 
-class AsyncStdioTransport:
+@dataclass(frozen=True, slots=True)
+class SendQueueStats:
+    """Snapshot of write coalescing on the stdio and socket transports."""
+
+    queued: int
+    """Messages accepted by `send()` whose write has not been drained yet."""
+    peak_queued: int
+    """Largest `queued` value seen on this transport."""
+    messages: int
+    """Messages written so far."""
+    batches: int
+    """`writelines()` calls so far; `messages / batches` is the average batch size."""
+
+
+@dataclass(slots=True)
+class _SendBatch:
+    done: asyncio.Future[None]
+    payloads: list[bytes] = field(default_factory=list)
+
+
+class _LineDelimitedTransport(abc.ABC):
+    """Newline-delimited JSON over a byte stream, shared by the stdio and socket transports.
+
+    Subclasses supply the stream pair through `_reader()` and `_writer()`. Messages are
+    framed in place by `_LineFramer`, and writes from one event-loop iteration are
+    coalesced into a single `writelines()` and drain.
+    """
+
+    _closed_message = "app-server transport is not connected"
+    _peer_closed_message = "app-server connection is closed"
+    _stream_name = "stream"
+
+    def __init__(self, codec: JsonCodec, *, max_message_bytes: int | None) -> None:
+        self._codec = codec
+        self._max_message_bytes = max_message_bytes
+        self._framer: _LineFramer | None = None
+        self._send_batch: _SendBatch | None = None
+        self._send_queued = 0
+        self._send_peak_queued = 0
+        self._sent_messages = 0
+        self._send_batches = 0
+
+    @property
+    def send_stats(self) -> SendQueueStats:
+        return SendQueueStats(
+            queued=self._send_queued,
+            peak_queued=self._send_peak_queued,
+            messages=self._sent_messages,
+            batches=self._send_batches,
+        )
+
+    @abc.abstractmethod
+    def _reader(self) -> asyncio.StreamReader | None: ...
+
+    @abc.abstractmethod
+    def _writer(self) -> asyncio.StreamWriter | None: ...
+
+    def _peer_closed_error(self) -> AppServerClosedError:
+        return AppServerClosedError(self._peer_closed_message)
+
+    async def _at_eof(self) -> None:  # noqa: B027
+        """Called when the reader hits EOF, before `receive()` returns None."""
+
+    async def send(self, message: JsonObject) -> None:
+        """Queue `message` and wait until it has been written and drained.
+
+        Messages sent during the same event-loop iteration are written in send order
+        with one `writelines()` call and drained once.
+        """
+        if self._writer() is None:
+            raise AppServerClosedError(self._closed_message)
+        payload = self._codec.encode(message) + b"\n"
+        batch = self._send_batch
+        if batch is None:
+            loop = asyncio.get_running_loop()
+            batch = self._send_batch = _SendBatch(loop.create_future())
+            loop.call_soon(self._write_batch, batch)
+        batch.payloads.append(payload)
+        self._send_queued += 1
+        self._send_peak_queued = max(self._send_peak_queued, self._send_queued)
+        # Shield so one cancelled sender does not fail the rest of its batch.
+        await asyncio.shield(batch.done)
+
+    def _write_batch(self, batch: _SendBatch) -> None:
+        self._send_batch = None
+        writer = self._writer()
+        if writer is None:
+            self._finish_batch(batch, AppServerClosedError(self._closed_message))
+            return
+        self._sent_messages += len(batch.payloads)
+        self._send_batches += 1
+        try:
+            writer.writelines(batch.payloads)
+        except Exception as exc:
+            self._finish_batch(batch, exc)
+            return
+        drain = asyncio.ensure_future(writer.drain())
+        drain.add_done_callback(lambda task: self._finish_drain(batch, task))
+
+    def _finish_drain(self, batch: _SendBatch, drain: asyncio.Future[None]) -> None:
+        self._finish_batch(batch, None if drain.cancelled() else drain.exception())
+
+    def _finish_batch(self, batch: _SendBatch, error: BaseException | None) -> None:
+        self._send_queued -= len(batch.payloads)
+        if batch.done.done():
+            return
+        if isinstance(error, BrokenPipeError | ConnectionResetError):
+            closed = self._peer_closed_error()
+            closed.__cause__ = error
+            error = closed
+        if error is None:
+            batch.done.set_result(None)
+        else:
+            batch.done.set_exception(error)
+        # Retrieved here so a batch whose senders were all cancelled does not log the error.
+        batch.done.exception()
+
+    async def receive(self) -> JsonObject | None:
+        reader = self._reader()
+        if reader is None:
+            raise AppServerClosedError(self._closed_message)
+        framer = self._framer
+        if framer is None or framer.stream is not reader:
+            framer = self._framer = _LineFramer(
+                reader,
+                max_line_bytes=self._max_message_bytes,
+                stream_name=self._stream_name,
+            )
+        try:
+            bounds = await framer.next_line()
+        except ConnectionResetError as exc:
+            raise self._peer_closed_error() from exc
+        if bounds is None:
+            await self._at_eof()
+            return None
+        with framer.view(*bounds) as line:
+            return _decode_message(self._codec, line, "Failed to decode app-server JSON message")
+
+
+class AsyncStdioTransport(_LineDelimitedTransport):
+    _closed_message = "app-server stdio transport is not running"
+    _peer_closed_message = "app-server stdin is closed"
+    _stream_name = "stdio stdout"
+
     def __init__(self, options: AppServerProcessOptions | None = None) -> None:
         self._options = options or AppServerProcessOptions()
+        super().__init__(
+            resolve_json_codec(self._options.json_codec),
+            max_message_bytes=self._options.max_message_bytes,
+        )
         self._process: asyncio.subprocess.Process | None = None
         self._stderr_task: asyncio.Task[None] | None = None
-        self._stderr_lines: list[str] = []
+        self._stderr = _StderrCapture(self._options)
 
     async def start(self) -> None:
         if self._process is not None:
@@ -96,41 +258,50 @@ class AsyncStdioTransport:
             line = await _readline_with_limit_error(stderr, stream_name="stderr")
             if line == b"":
                 break
-            self._stderr_lines.append(line.decode("utf-8", errors="replace").rstrip())
+            await self._stderr.add(line.decode("utf-8", errors="replace").rstrip())
 
-    async def send(self, message: JsonObject) -> None:
-        if self._process is None or self._process.stdin is None:
-            raise AppServerClosedError("app-server stdio transport is not running")
-        payload = json.dumps(message, separators=(",", ":")) + "\n"
-        try:
-            self._process.stdin.write(payload.encode("utf-8"))
-            await self._process.stdin.drain()
-        except (BrokenPipeError, ConnectionResetError) as exc:
-            raise AppServerClosedError("app-server stdin is closed") from exc
+    @property
+    def stderr_tail(self) -> tuple[str, ...]:
+        """The most recent app-server stderr lines, up to `stderr_tail_lines`."""
+        return tuple(self._stderr.tail)
 
-    async def receive(self) -> JsonObject | None:
-        if self._process is None or self._process.stdout is None:
-            raise AppServerClosedError("app-server stdio transport is not running")
-        line = await _readline_with_limit_error(self._process.stdout, stream_name="stdout")
-        if line == b"":
-            return None
+    def _reader(self) -> asyncio.StreamReader | None:
+        return None if self._process is None else self._process.stdout
+
+    def _writer(self) -> asyncio.StreamWriter | None:
+        return None if self._process is None else self._process.stdin
+
+    def _peer_closed_error(self) -> AppServerClosedError:
+        return AppServerClosedError(self._peer_closed_message, stderr_tail=self.stderr_tail)
+
+    async def _at_eof(self) -> None:
+        process = self._process
+        if process is not None:
+            await self._raise_if_exited_with_error(process)
+
+    async def _raise_if_exited_with_error(self, process: asyncio.subprocess.Process) -> None:
+        # stdout EOF normally means the process is exiting; give it a moment to report why.
         try:
-            parsed = json.loads(line)
-        except json.JSONDecodeError as exc:
-            raise AppServerProtocolError(
-                f"Failed to decode app-server JSON message: {line!r}"
-            ) from exc
-        if not isinstance(parsed, Mapping):
-            raise AppServerProtocolError(
-                f"Expected app-server message object, received {type(parsed).__name__}"
-            )
-        return dict(parsed)
+            returncode = await asyncio.wait_for(asyncio.shield(process.wait()), _EXIT_WAIT_SECONDS)
+        except TimeoutError:
+            return
+        if returncode == 0:
+            return
+        if self._stderr_task is not None:
+            # Let stderr drain so the tail includes the last words of the process.
+            with suppress(Exception):
+                await asyncio.wait_for(asyncio.shield(self._stderr_task), _EXIT_WAIT_SECONDS)
+        raise AppServerClosedError(
+            f"app-server exited with code {returncode}",
+            stderr_tail=self.stderr_tail,
+        )
 
     async def close(self) -> None:
         process = self._process
         if process is None:
             return
         self._process = None
+        self._framer = None
         if process.stdin is not None:
             process.stdin.close()
         if process.returncode is None:
@@ -145,6 +316,90 @@ class AsyncStdioTransport:
             self._stderr_task = None
 
 
+class _AsyncSocketTransport(_LineDelimitedTransport):
+    """Newline-delimited JSON over a stream socket to a shared app-server or broker."""
+
+    _closed_message = "app-server socket transport is not connected"
+    _peer_closed_message = "app-server socket connection is closed"
+
+    def __init__(self, options: AppServerSocketOptions | None) -> None:
+        self._options = options or AppServerSocketOptions()
+        super().__init__(
+            resolve_json_codec(self._options.json_codec),
+            max_message_bytes=self._options.max_message_bytes,
+        )
+        self._stream_reader: asyncio.StreamReader | None = None
+        self._stream_writer: asyncio.StreamWriter | None = None
+
+    @abc.abstractmethod
+    async def _open(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]: ...
+
+    @abc.abstractmethod
+    def _describe(self) -> str: ...
+
+    async def start(self) -> None:
+        if self._stream_writer is not None:
+            return
+        try:
+            reader, writer = await asyncio.wait_for(self._open(), self._options.connect_timeout)
+        except (OSError, TimeoutError) as exc:
+            raise AppServerConnectionError(
+                f"Failed to connect to {self._describe()}: {exc or 'timed out'}"
+            ) from exc
+        self._stream_reader = reader
+        self._stream_writer = writer
+
+    def _reader(self) -> asyncio.StreamReader | None:
+        return self._stream_reader
+
+    def _writer(self) -> asyncio.StreamWriter | None:
+        return self._stream_writer
+
+    async def close(self) -> None:
+        writer = self._stream_writer
+        if writer is None:
+            return
+        self._stream_reader = None
+        self._stream_writer = None
+        self._framer = None
+        writer.close()
+        with suppress(OSError):
+            await writer.wait_closed()
+
+
+class AsyncUnixSocketTransport(_AsyncSocketTransport):
+    """Connect to an app-server, or an `AppServerBroker`, listening on a Unix domain socket."""
+
+    _stream_name = "unix socket"
+
+    def __init__(self, path: str | os.PathLike[str], options: AppServerSocketOptions | None = None):
+        super().__init__(options)
+        self._path = os.fspath(path)
+
+    async def _open(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        return await asyncio.open_unix_connection(self._path, limit=STDIO_STREAM_LIMIT_BYTES)
+
+    def _describe(self) -> str:
+        return f"unix socket {self._path}"
+
+
+class AsyncTcpTransport(_AsyncSocketTransport):
+    """Connect to an app-server, or an `AppServerBroker`, over plain newline-delimited TCP."""
+
+    _stream_name = "tcp"
+
+    def __init__(self, host: str, port: int, options: AppServerSocketOptions | None = None):
+        super().__init__(options)
+        self._host = host
+        self._port = port
+
+    async def _open(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        return await asyncio.open_connection(self._host, self._port, limit=STDIO_STREAM_LIMIT_BYTES)
+
+    def _describe(self) -> str:
+        return f"tcp {self._host}:{self._port}"
+
+
 class AsyncWebSocketTransport:
     def __init__(
         self,
@@ -153,6 +408,7 @@ class AsyncWebSocketTransport:
     ) -> None:
         self._url = url
         self._options = options or AppServerWebSocketOptions()
+        self._codec = resolve_json_codec(self._options.json_codec)
         self._connection: Any | None = None
         self._connection_closed_ok_types: tuple[type[BaseException], ...] = ()
         self._connection_closed_error_types: tuple[type[BaseException], ...] = ()
@@ -175,7 +431,8 @@ class AsyncWebSocketTransport:
         if self._connection is None:
             raise AppServerClosedError("app-server websocket transport is not connected")
         try:
-            await self._connection.send(json.dumps(message, separators=(",", ":")))
+            # Encoded JSON is valid UTF-8, so send it as a text frame without a decode round trip.
+            await self._connection.send(self._codec.encode(message), text=True)
         except self._connection_closed_ok_types as exc:
             self._connection = None
             raise AppServerClosedError("app-server websocket connection is closed") from exc
@@ -202,17 +459,11 @@ class AsyncWebSocketTransport:
             raise AppServerConnectionError(f"app-server websocket receive failed: {exc}") from exc
         if not isinstance(payload, str):
             raise AppServerProtocolError("Expected websocket text frame from app-server")
-        try:
-            parsed = json.loads(payload)
-        except json.JSONDecodeError as exc:
-            raise AppServerProtocolError(
-                f"Failed to decode app-server websocket message: {payload!r}"
-            ) from exc
-        if not isinstance(parsed, Mapping):
-            raise AppServerProtocolError(
-                f"Expected app-server message object, received {type(parsed).__name__}"
-            )
-        return dict(parsed)
+        return _decode_message(
+            self._codec,
+            payload,
+            "Failed to decode app-server websocket message",
+        )
 
     async def close(self) -> None:
         if self._connection is None:
@@ -233,6 +484,139 @@ class AsyncWebSocketTransport:
         self._connection_closed_error_types = _exception_types(connection_closed_error)
 
 
+class _StderrCapture:
+    """Keep a bounded tail of app-server stderr and forward lines at a limited rate."""
+
+    def __init__(self, options: AppServerProcessOptions) -> None:
+        self.tail: deque[str] = deque(maxlen=options.stderr_tail_lines)
+        self._callback = options.stderr_callback
+        self._log_level = options.stderr_log_level
+        self._rate = options.stderr_rate_limit
+        self._allowance = self._rate or 0.0
+        self._refilled_at = time.monotonic()
+        self._suppressed = 0
+
+    async def add(self, line: str) -> None:
+        self.tail.append(line)
+        if self._callback is None and self._log_level is None:
+            return
+        if not self._take_token():
+            self._suppressed += 1
+            return
+        if self._suppressed:
+            suppressed, self._suppressed = self._suppressed, 0
+            await self._forward(f"[{suppressed} app-server stderr lines suppressed by rate limit]")
+        await self._forward(line)
+
+    def _take_token(self) -> bool:
+        if self._rate is None:
+            return True
+        now = time.monotonic()
+        self._allowance = min(self._rate, self._allowance + (now - self._refilled_at) * self._rate)
+        self._refilled_at = now
+        if self._allowance < 1:
+            return False
+        self._allowance -= 1
+        return True
+
+    async def _forward(self, line: str) -> None:
+        if self._log_level is not None:
+            _STDERR_LOGGER.log(self._log_level, "%s", line)
+        if self._callback is None:
+            return
+        try:
+            result = self._callback(line)
+            if inspect.isawaitable(result):
+                await result
+        except Exception:
+            _STDERR_LOGGER.exception("app-server stderr callback failed")
+
+
+class _LineFramer:
+    """Split a byte stream into newline-delimited messages held in one reusable buffer.
+
+    `next_line()` returns the bounds of the next message inside the buffer, and `view()`
+    exposes it as a `memoryview` so the JSON decoder reads it in place. Messages of any
+    size are accumulated across reads unless `max_line_bytes` caps them.
+    """
+
+    def __init__(
+        self,
+        stream: asyncio.StreamReader,
+        *,
+        max_line_bytes: int | None,
+        stream_name: str = "stdio stdout",
+    ) -> None:
+        self.stream = stream
+        self._max_line_bytes = max_line_bytes
+        self._stream_name = stream_name
+        self._buffer = bytearray()
+        self._start = 0
+        self._scanned = 0
+        self._eof = False
+
+    async def next_line(self) -> tuple[int, int] | None:
+        """Return `(start, end)` of the next message, excluding its newline, or None at EOF."""
+        while True:
+            newline = self._buffer.find(b"\n", self._scanned)
+            if newline >= 0:
+                start = self._start
+                self._start = self._scanned = newline + 1
+                self._check_size(newline - start)
+                return start, newline
+            self._scanned = len(self._buffer)
+            self._check_size(self._scanned - self._start)
+            if self._eof:
+                if self._start == self._scanned:
+                    return None
+                # Like readline(), hand back a trailing message without a final newline.
+                start = self._start
+                self._start = self._scanned
+                return start, self._scanned
+            self._compact()
+            chunk = await self.stream.read(_STDOUT_READ_BYTES)
+            if chunk:
+                self._buffer += chunk
+            else:
+                self._eof = True
+
+    def view(self, start: int, end: int) -> memoryview:
+        """Borrow a message in place; release the view before the next `next_line()`."""
+        return memoryview(self._buffer)[start:end]
+
+    def _compact(self) -> None:
+        if not self._start:
+            return
+        if len(self._buffer) > 4 * _STDOUT_READ_BYTES:
+            # Drop the capacity an oversized message left behind.
+            self._buffer = self._buffer[self._start :]
+        else:
+            del self._buffer[: self._start]
+        self._scanned -= self._start
+        self._start = 0
+
+    def _check_size(self, size: int) -> None:
+        if self._max_line_bytes is not None and size > self._max_line_bytes:
+            raise AppServerProtocolError(
+                f"app-server {self._stream_name} line exceeded configured limit of "
+                f"{self._max_line_bytes} bytes"
+            )
+
+
+def _decode_message(codec: JsonCodec, payload: JsonPayload, failure: str) -> JsonObject:
+    try:
+        parsed = codec.decode(payload)
+    except ValueError as exc:
+        preview = bytes(payload) if isinstance(payload, memoryview | bytearray) else payload
+        raise AppServerProtocolError(f"{failure}: {preview!r}") from exc
+    # Decoders build fresh dicts, so the message is returned without copying it.
+    if not isinstance(parsed, dict):
+        raise AppServerProtocolError(
+            f"Expected app-server message object, received {type(parsed).__name__}"
+        )
+    return cast(JsonObject, parsed)
+
+
 def _load_websockets_module() -> Any:
     try:
         import websockets
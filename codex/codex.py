@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import threading
+import time
 from collections.abc import Callable, Collection
+from concurrent.futures import Future
 from contextlib import suppress
+from dataclasses import dataclass
+from functools import partial
 from typing import TYPE_CHECKING, TypeVar
 
 from pydantic import BaseModel
@@ -24,6 +29,7 @@ from codex.options import (
 
 if TYPE_CHECKING:
     from codex.app_server import AppServerClient
+    from codex.pool import CodexPool
     from codex.thread import CodexTurnStream, Input, Thread
 
 _ModelT = TypeVar("_ModelT", bound=BaseModel)
@@ -32,11 +38,22 @@ _ModelT = TypeVar("_ModelT", bound=BaseModel)
 class Codex:
     """Main entrypoint for interacting with Codex threads."""
 
-    def __init__(self, options: CodexOptions | None = None) -> None:
+    def __init__(
+        self,
+        options: CodexOptions | None = None,
+        *,
+        pool: CodexPool | None = None,
+    ) -> None:
         self._options = options or CodexOptions()
+        self._pool = pool
         self._client: AppServerClient | None = None
         self._experimental_api_enabled = False
         self._closed = False
+        self._warmup: Future[tuple[AppServerClient, float | None]] | None = None
+        self._warmup_experimental = False
+        self._startup_phases: tuple[float | None, float] | None = None
+        if self._options.prewarm:
+            self.prewarm()
 
     def __enter__(self) -> Codex:
         return self
@@ -171,30 +188,63 @@ class Codex:
         if self._closed:
             return
         self._closed = True
+        warmup = self._warmup
+        self._warmup = None
+        if warmup is not None:
+            warmup.add_done_callback(self._release_warmup)
         client = self._client
         self._client = None
         if client is not None:
-            client.close()
+            self._release(client)
+
+    def prewarm(self, *, experimental_api: bool = False) -> None:
+        """Spawn and initialize the app-server in the background.
+
+        The first call that needs the connection waits for it to become ready instead of
+        starting it, and re-raises any startup error. Pass `experimental_api=True` when the
+        first thread or run uses dynamic tools; otherwise that call discards the warm
+        connection and starts a new one. Does nothing once a connection exists or is starting.
+        """
+        self._raise_if_closed()
+        if self._client is not None or self._warmup is not None:
+            return
+        warmup: Future[tuple[AppServerClient, float | None]] = Future()
+        self._warmup = warmup
+        self._warmup_experimental = experimental_api
+        threading.Thread(
+            target=_run_warmup,
+            args=(warmup, partial(self._connect, experimental_api)),
+            name="codex-prewarm",
+            daemon=True,
+        ).start()
+
+    @property
+    def startup_timings(self) -> CodexStartupTimings | None:
+        """Phase timings for this client's app-server connection, once it is ready."""
+        if self._client is None or self._startup_phases is None:
+            return None
+        timings = self._client.startup_timings
+        if timings is None:
+            return None
+        login_seconds, ready_wait_seconds = self._startup_phases
+        return CodexStartupTimings(
+            spawn_seconds=timings.transport_seconds,
+            handshake_seconds=timings.initialize_seconds,
+            login_seconds=login_seconds,
+            ready_wait_seconds=ready_wait_seconds,
+        )
 
     def _ensure_client(self, *, require_experimental: bool = False) -> AppServerClient:
         self._raise_if_closed()
         if self._client is None:
-            from codex.app_server import AppServerClient
-
-            client = AppServerClient.connect_stdio(
-                process_options=self._options.to_app_server_options(),
-                initialize_options=AppServerInitializeOptions(
-                    experimental_api=require_experimental,
-                ),
-            )
-            try:
-                if self._options.api_key is not None:
-                    client.account.login_api_key(api_key=self._options.api_key)
-            except AppServerError:
-                client.close()
-                raise
+            started = time.perf_counter()
+            connected = self._take_warmup(require_experimental)
+            if connected is None:
+                connected = self._connect(require_experimental)
+                self._experimental_api_enabled = require_experimental
+            client, login_seconds = connected
+            self._startup_phases = (login_seconds, time.perf_counter() - started)
             self._client = client
-            self._experimental_api_enabled = require_experimental
         elif require_experimental and not self._experimental_api_enabled:
             raise CodexError(
                 "Dynamic tools require experimentalApi on the underlying app-server connection. "
@@ -202,6 +252,91 @@ class Codex:
             )
         return self._client
 
+    def _take_warmup(
+        self,
+        require_experimental: bool,
+    ) -> tuple[AppServerClient, float | None] | None:
+        warmup = self._warmup
+        if warmup is None:
+            return None
+        self._warmup = None
+        client, login_seconds = warmup.result()
+        if require_experimental and not self._warmup_experimental:
+            # Nothing has used the warm connection yet, so swap it for one with experimentalApi.
+            self._release(client)
+            return None
+        self._experimental_api_enabled = self._warmup_experimental
+        return client, login_seconds
+
+    def _connect(self, experimental_api: bool) -> tuple[AppServerClient, float | None]:
+        if self._pool is not None:
+            return self._pool.checkout(self._options, experimental_api=experimental_api), None
+        return _connect_client(self._options, experimental_api=experimental_api)
+
+    def _release(self, client: AppServerClient) -> None:
+        if self._pool is not None:
+            self._pool.checkin(client)
+        else:
+            client.close()
+
+    def _release_warmup(self, warmup: Future[tuple[AppServerClient, float | None]]) -> None:
+        if warmup.exception() is None:
+            client, _ = warmup.result()
+            with suppress(Exception):
+                self._release(client)
+
     def _raise_if_closed(self) -> None:
         if self._closed:
             raise CodexError("Codex client is closed")
+
+
+@dataclass(frozen=True, slots=True)
+class CodexStartupTimings:
+    """Wall-clock seconds spent bringing up the app-server connection behind a `Codex`."""
+
+    spawn_seconds: float
+    """Starting the app-server process."""
+    handshake_seconds: float
+    """The `initialize` handshake."""
+    login_seconds: float | None
+    """API-key login, or None when no login ran (no `api_key`, or a pooled connection)."""
+    ready_wait_seconds: float
+    """How long the first call that needed the connection blocked waiting for it."""
+
+
+def _run_warmup(
+    warmup: Future[tuple[AppServerClient, float | None]],
+    connect: Callable[[], tuple[AppServerClient, float | None]],
+) -> None:
+    if not warmup.set_running_or_notify_cancel():
+        return
+    try:
+        warmup.set_result(connect())
+    except BaseException as exc:
+        warmup.set_exception(exc)
+
+
+def _connect_client(
+    options: CodexOptions,
+    *,
+    experimental_api: bool,
+) -> tuple[AppServerClient, float | None]:
+    """Spawn, initialize, and log in a stdio app-server connection for `options`.
+
+    Returns the client and the API-key login duration, or None when no login ran.
+    """
+    from codex.app_server import AppServerClient
+
+    client = AppServerClient.connect_stdio(
+        process_options=options.to_app_server_options(),
+        initialize_options=AppServerInitializeOptions(experimental_api=experimental_api),
+    )
+    if options.api_key is None:
+        return client, None
+    started = time.perf_counter()
+    try:
+        client.account.login_api_key(api_key=options.api_key)
+    except AppServerError:
+        client.close()
+        raise
+    return client, time.perf_counter() - started
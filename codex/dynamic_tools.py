@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import inspect
 import json
 from collections.abc import Awaitable, Callable, Iterable, Mapping, Sequence
@@ -37,6 +38,9 @@ class _ResolvedDynamicTool:
         )
 
 
+type _BlockingRunner = Callable[[Callable[[], object]], Awaitable[object]]
+
+
 class _HandlerInstaller(Protocol):
     def __call__(
         self,
@@ -100,8 +104,13 @@ def merge_dynamic_tool_specs(
 
 
 class _DynamicToolRuntime:
-    def __init__(self, install_handler: _HandlerInstaller) -> None:
+    def __init__(
+        self,
+        install_handler: _HandlerInstaller,
+        run_blocking: _BlockingRunner | None = None,
+    ) -> None:
         self._install_handler = install_handler
+        self._run_blocking = run_blocking
         self._mode: str | None = None
         self._tools: dict[tuple[str, str], _ResolvedDynamicTool] = {}
 
@@ -125,6 +134,10 @@ class _DynamicToolRuntime:
         for tool in resolved_tools:
             self._tools[(thread_id, tool.name)] = tool
 
+    def deactivate(self, thread_id: str) -> None:
+        for key in [key for key in self._tools if key[0] == thread_id]:
+            del self._tools[key]
+
     def prepare_activation(self, resolved_tools: Sequence[_ResolvedDynamicTool]) -> None:
         if not resolved_tools:
             return
@@ -143,7 +156,10 @@ class _DynamicToolRuntime:
 
         validated = tool.input_model.model_validate(request.params.arguments)
         arguments = validated.model_dump(mode="python")
-        result = tool.callable(**arguments)
+        if self._run_blocking is None or inspect.iscoroutinefunction(tool.callable):
+            result = tool.callable(**arguments)
+        else:
+            result = await self._run_blocking(functools.partial(tool.callable, **arguments))
         if inspect.isawaitable(result):
             result = await cast(Awaitable[object], result)
         return _normalize_tool_result(result)
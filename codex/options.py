@@ -50,11 +50,53 @@ class CodexOptions(_CodexOptionsModel):
         default=None,
         description="Forwarded to AppServerProcessOptions.env.",
     )
+    prewarm: bool = Field(
+        default=False,
+        exclude=True,
+        description=(
+            "SDK-only. Start and initialize the app-server in the background as soon as Codex "
+            "is constructed, as if Codex.prewarm() were called."
+        ),
+    )
 
     def to_app_server_options(self) -> AppServerProcessOptions:
         return AppServerProcessOptions.model_validate(self.model_dump(mode="python"))
 
 
+class CodexPoolOptions(_CodexOptionsModel):
+    """Sizing and eviction options for `CodexPool` and `AsyncCodexPool`."""
+
+    max_connections: int = Field(
+        default=4,
+        ge=1,
+        description="Maximum app-server processes the pool keeps for each distinct CodexOptions.",
+    )
+    max_threads_per_connection: int = Field(
+        default=1,
+        ge=1,
+        description=(
+            "Maximum concurrent checkouts sharing one app-server connection. Each checkout "
+            "drives its own conversation threads; 1 gives every checkout a dedicated process."
+        ),
+    )
+    max_idle_seconds: float | None = Field(
+        default=300.0,
+        gt=0,
+        description=(
+            "Close connections that have not been checked out for this long. "
+            "None keeps idle connections until the pool closes."
+        ),
+    )
+    checkout_timeout: float | None = Field(
+        default=None,
+        gt=0,
+        description=(
+            "Seconds checkout() waits for a free connection when the pool is at capacity. "
+            "None waits indefinitely."
+        ),
+    )
+
+
 class ThreadStartOptions(_CodexOptionsModel):
     """Thread creation options for the high-level `Codex` client."""
 
@@ -286,6 +328,10 @@ class TurnOptions(_CodexOptionsModel):
         default=None,
         description="Forwarded to AppServerTurnOptions.summary.",
     )
+    retain_text_deltas: bool = Field(
+        default=True,
+        description="Forwarded to AppServerTurnOptions.retain_text_deltas.",
+    )
 
     def to_app_server_options(self) -> AppServerTurnOptions:
         return AppServerTurnOptions.model_validate(self.model_dump(mode="python"))
@@ -306,6 +352,7 @@ type CancelSignal = SupportsIsSet | SupportsAborted
 
 __all__ = [
     "CodexOptions",
+    "CodexPoolOptions",
     "ThreadStartOptions",
     "ThreadResumeOptions",
     "TurnOptions",
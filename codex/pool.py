@@ -0,0 +1,471 @@
+"""Warm app-server connection pools shared across `Codex` instances."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager, suppress
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Protocol
+
+from codex.app_server.errors import AppServerError
+from codex.app_server.options import AppServerInitializeOptions
+from codex.errors import CodexError
+from codex.options import CodexOptions, CodexPoolOptions
+
+if TYPE_CHECKING:
+    from codex.app_server import AppServerClient, AsyncAppServerClient
+
+__all__ = ["AsyncCodexPool", "CodexPool"]
+
+
+class _PooledClient(Protocol):
+    @property
+    def connected(self) -> bool: ...
+
+    def _release_threads(self) -> object: ...
+
+
+type _PoolKey = tuple[str, bool]
+
+
+@dataclass(slots=True, eq=False)
+class _PooledConnection[ClientT: _PooledClient]:
+    client: ClientT
+    key: _PoolKey
+    leases: int = 0
+    idle_since: float = field(default_factory=time.monotonic)
+    resetting: bool = False
+
+
+class _PoolState[ClientT: _PooledClient]:
+    """Connection bookkeeping shared by the sync and async pools.
+
+    Callers hold the pool lock around every method. Nothing here blocks or closes
+    clients; methods hand back the clients that must be closed outside the lock.
+    """
+
+    def __init__(self, options: CodexPoolOptions) -> None:
+        self.options = options
+        self.closed = False
+        self._connections: dict[_PoolKey, list[_PooledConnection[ClientT]]] = {}
+        self._by_client: dict[int, _PooledConnection[ClientT]] = {}
+        self._spawning: dict[_PoolKey, int] = {}
+
+    def raise_if_closed(self) -> None:
+        if self.closed:
+            raise CodexError("Codex pool is closed")
+
+    def lease(self, key: _PoolKey) -> tuple[_PooledConnection[ClientT] | None, list[ClientT]]:
+        """Lease the least-loaded healthy connection for `key`, dropping dead ones."""
+        stale: list[ClientT] = []
+        best: _PooledConnection[ClientT] | None = None
+        for connection in list(self._connections.get(key, ())):
+            if not connection.client.connected:
+                if connection.leases == 0:
+                    stale.append(self._forget(connection))
+                continue
+            if connection.resetting or connection.leases >= self.options.max_threads_per_connection:
+                continue
+            if best is None or connection.leases < best.leases:
+                best = connection
+        if best is not None:
+            best.leases += 1
+        return best, stale
+
+    def reserve_spawn(self, key: _PoolKey) -> bool:
+        spawning = self._spawning.get(key, 0)
+        if len(self._connections.get(key, ())) + spawning >= self.options.max_connections:
+            return False
+        self._spawning[key] = spawning + 1
+        return True
+
+    def finish_spawn(self, key: _PoolKey, client: ClientT | None, *, leased: bool) -> None:
+        self._spawning[key] -= 1
+        if not self._spawning[key]:
+            del self._spawning[key]
+        if client is None:
+            return
+        connection = _PooledConnection(client, key, leases=1 if leased else 0)
+        self._connections.setdefault(key, []).append(connection)
+        self._by_client[id(client)] = connection
+
+    def begin_release(self, client: ClientT) -> bool:
+        """Return whether `client`'s last lease is ending, so it must be reset before reuse.
+
+        A connection being reset is not leased out until `release()` is called.
+        """
+        connection = self._leased(client)
+        if connection.leases > 1 or self.closed or not client.connected:
+            return False
+        connection.resetting = True
+        return True
+
+    def release(self, client: ClientT) -> ClientT | None:
+        """Return a leased client; hand it back for closing if it must not be reused."""
+        connection = self._leased(client)
+        connection.resetting = False
+        connection.leases -= 1
+        if connection.leases == 0:
+            connection.idle_since = time.monotonic()
+            if self.closed or not client.connected:
+                return self._forget(connection)
+        return None
+
+    def evict_idle(self) -> list[ClientT]:
+        max_idle = self.options.max_idle_seconds
+        if max_idle is None:
+            return []
+        cutoff = time.monotonic() - max_idle
+        return [
+            self._forget(connection)
+            for connections in list(self._connections.values())
+            for connection in list(connections)
+            if connection.leases == 0 and connection.idle_since <= cutoff
+        ]
+
+    def idle_count(self, key: _PoolKey) -> int:
+        return sum(1 for connection in self._connections.get(key, ()) if connection.leases == 0)
+
+    def close(self) -> list[ClientT]:
+        self.closed = True
+        clients = [connection.client for connection in self._by_client.values()]
+        self._connections.clear()
+        self._by_client.clear()
+        return clients
+
+    def _leased(self, client: ClientT) -> _PooledConnection[ClientT]:
+        connection = self._by_client.get(id(client))
+        if connection is None:
+            raise CodexError("Client was not checked out from this pool")
+        return connection
+
+    def _forget(self, connection: _PooledConnection[ClientT]) -> ClientT:
+        connections = self._connections.get(connection.key, [])
+        if connection in connections:
+            connections.remove(connection)
+            if not connections:
+                del self._connections[connection.key]
+        self._by_client.pop(id(connection.client), None)
+        return connection.client
+
+
+def _pool_key(options: CodexOptions | None, experimental_api: bool) -> _PoolKey:
+    return ((options or CodexOptions()).model_dump_json(), experimental_api)
+
+
+def _close_quietly(close: Callable[[], object]) -> None:
+    with suppress(Exception):
+        close()
+
+
+class CodexPool:
+    """Keep warm, initialized `codex app-server` connections for reuse.
+
+    Connections are keyed by `CodexOptions` and whether the experimental API is
+    enabled. Pass the pool to `Codex(pool=...)` so short-lived `Codex` instances
+    skip process spawn, `initialize`, and API-key login, or use `connection()` to
+    borrow an `AppServerClient` directly. Idle connections past `max_idle_seconds`
+    and connections whose transport has died are dropped on the next checkout or
+    checkin.
+    """
+
+    def __init__(self, options: CodexPoolOptions | None = None) -> None:
+        self._state: _PoolState[AppServerClient] = _PoolState(options or CodexPoolOptions())
+        self._condition = threading.Condition()
+
+    def __enter__(self) -> CodexPool:
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        _ = (exc_type, exc, tb)
+        self.close()
+
+    def checkout(
+        self,
+        options: CodexOptions | None = None,
+        *,
+        experimental_api: bool = False,
+    ) -> AppServerClient:
+        """Lease a connection for `options`, spawning one if the pool has room.
+
+        Raises:
+            CodexError: the pool is closed, or `checkout_timeout` elapsed at capacity.
+        """
+        key = _pool_key(options, experimental_api)
+        timeout = self._state.options.checkout_timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._condition:
+                self._state.raise_if_closed()
+                stale = self._state.evict_idle()
+                connection, unhealthy = self._state.lease(key)
+                stale.extend(unhealthy)
+                spawn = connection is None and self._state.reserve_spawn(key)
+                if connection is None and not spawn and not stale:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise CodexError("Timed out waiting for a pooled app-server connection")
+                    self._condition.wait(remaining)
+                    continue
+            for client in stale:
+                _close_quietly(client.close)
+            if connection is not None:
+                return connection.client
+            if spawn:
+                return self._spawn(key, options, experimental_api=experimental_api, leased=True)
+
+    def checkin(self, client: AppServerClient) -> None:
+        """Return a connection obtained from `checkout()` to the pool.
+
+        When the last lease on a connection ends, the threads it loaded are
+        unsubscribed and their dynamic tools dropped before it is lent out again.
+        """
+        with self._condition:
+            reset = self._state.begin_release(client)
+        if reset:
+            try:
+                client._release_threads()
+            except Exception:
+                _close_quietly(client.close)
+        with self._condition:
+            discard = self._state.release(client)
+            stale = self._state.evict_idle()
+            self._condition.notify_all()
+        for stale_client in [*stale, *([] if discard is None else [discard])]:
+            _close_quietly(stale_client.close)
+
+    @contextmanager
+    def connection(
+        self,
+        options: CodexOptions | None = None,
+        *,
+        experimental_api: bool = False,
+    ) -> Iterator[AppServerClient]:
+        """Check out a connection for the duration of a `with` block."""
+        client = self.checkout(options, experimental_api=experimental_api)
+        try:
+            yield client
+        finally:
+            self.checkin(client)
+
+    def warm(
+        self,
+        options: CodexOptions | None = None,
+        *,
+        count: int = 1,
+        experimental_api: bool = False,
+    ) -> int:
+        """Spawn idle connections until `count` are ready for `options`; return how many started."""
+        key = _pool_key(options, experimental_api)
+        started = 0
+        while True:
+            with self._condition:
+                self._state.raise_if_closed()
+                if self._state.idle_count(key) >= count or not self._state.reserve_spawn(key):
+                    return started
+            self._spawn(key, options, experimental_api=experimental_api, leased=False)
+            started += 1
+
+    def close(self) -> None:
+        """Close every pooled connection, including ones that are checked out."""
+        with self._condition:
+            clients = self._state.close()
+            self._condition.notify_all()
+        for client in clients:
+            _close_quietly(client.close)
+
+    def _spawn(
+        self,
+        key: _PoolKey,
+        options: CodexOptions | None,
+        *,
+        experimental_api: bool,
+        leased: bool,
+    ) -> AppServerClient:
+        from codex.codex import _connect_client
+
+        client: AppServerClient | None = None
+        try:
+            client, _ = _connect_client(
+                options or CodexOptions(), experimental_api=experimental_api
+            )
+        finally:
+            with self._condition:
+                closed = self._state.closed
+                self._state.finish_spawn(key, None if closed else client, leased=leased)
+                self._condition.notify_all()
+        if closed:
+            _close_quietly(client.close)
+            raise CodexError("Codex pool is closed")
+        return client
+
+
+class AsyncCodexPool:
+    """Async counterpart of `CodexPool` that lends `AsyncAppServerClient` connections.
+
+    Use `connection()` as a drop-in source of initialized clients:
+
+        async with pool.connection(options) as client:
+            thread = await client.start_thread()
+    """
+
+    def __init__(self, options: CodexPoolOptions | None = None) -> None:
+        self._state: _PoolState[AsyncAppServerClient] = _PoolState(options or CodexPoolOptions())
+        self._condition = asyncio.Condition()
+
+    async def __aenter__(self) -> AsyncCodexPool:
+        return self
+
+    async def __aexit__(self, exc_type: object, exc: object, tb: object) -> None:
+        _ = (exc_type, exc, tb)
+        await self.close()
+
+    async def checkout(
+        self,
+        options: CodexOptions | None = None,
+        *,
+        experimental_api: bool = False,
+    ) -> AsyncAppServerClient:
+        """Lease a connection for `options`, spawning one if the pool has room.
+
+        Raises:
+            CodexError: the pool is closed, or `checkout_timeout` elapsed at capacity.
+        """
+        key = _pool_key(options, experimental_api)
+        timeout = self._state.options.checkout_timeout
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            async with self._condition:
+                self._state.raise_if_closed()
+                stale = self._state.evict_idle()
+                connection, unhealthy = self._state.lease(key)
+                stale.extend(unhealthy)
+                spawn = connection is None and self._state.reserve_spawn(key)
+                if connection is None and not spawn and not stale:
+                    remaining = None if deadline is None else deadline - loop.time()
+                    if remaining is not None and remaining <= 0:
+                        raise CodexError("Timed out waiting for a pooled app-server connection")
+                    with suppress(TimeoutError):
+                        await asyncio.wait_for(self._condition.wait(), remaining)
+                    continue
+            for client in stale:
+                await _aclose_quietly(client)
+            if connection is not None:
+                return connection.client
+            if spawn:
+                return await self._spawn(
+                    key, options, experimental_api=experimental_api, leased=True
+                )
+
+    async def checkin(self, client: AsyncAppServerClient) -> None:
+        """Return a connection obtained from `checkout()` to the pool.
+
+        When the last lease on a connection ends, the threads it loaded are
+        unsubscribed and their dynamic tools dropped before it is lent out again.
+        """
+        async with self._condition:
+            reset = self._state.begin_release(client)
+        if reset:
+            try:
+                await client._release_threads()
+            except Exception:
+                await _aclose_quietly(client)
+        async with self._condition:
+            discard = self._state.release(client)
+            stale = self._state.evict_idle()
+            self._condition.notify_all()
+        for stale_client in [*stale, *([] if discard is None else [discard])]:
+            await _aclose_quietly(stale_client)
+
+    @asynccontextmanager
+    async def connection(
+        self,
+        options: CodexOptions | None = None,
+        *,
+        experimental_api: bool = False,
+    ) -> AsyncIterator[AsyncAppServerClient]:
+        """Check out a connection for the duration of an `async with` block."""
+        client = await self.checkout(options, experimental_api=experimental_api)
+        try:
+            yield client
+        finally:
+            await self.checkin(client)
+
+    async def warm(
+        self,
+        options: CodexOptions | None = None,
+        *,
+        count: int = 1,
+        experimental_api: bool = False,
+    ) -> int:
+        """Spawn idle connections until `count` are ready for `options`; return how many started."""
+        key = _pool_key(options, experimental_api)
+        started = 0
+        while True:
+            async with self._condition:
+                self._state.raise_if_closed()
+                if self._state.idle_count(key) >= count or not self._state.reserve_spawn(key):
+                    return started
+            await self._spawn(key, options, experimental_api=experimental_api, leased=False)
+            started += 1
+
+    async def close(self) -> None:
+        """Close every pooled connection, including ones that are checked out."""
+        async with self._condition:
+            clients = self._state.close()
+            self._condition.notify_all()
+        for client in clients:
+            await _aclose_quietly(client)
+
+    async def _spawn(
+        self,
+        key: _PoolKey,
+        options: CodexOptions | None,
+        *,
+        experimental_api: bool,
+        leased: bool,
+    ) -> AsyncAppServerClient:
+        client: AsyncAppServerClient | None = None
+        try:
+            client = await _connect_async_client(
+                options or CodexOptions(),
+                experimental_api=experimental_api,
+            )
+        finally:
+            async with self._condition:
+                closed = self._state.closed
+                self._state.finish_spawn(key, None if closed else client, leased=leased)
+                self._condition.notify_all()
+        if closed:
+            await _aclose_quietly(client)
+            raise CodexError("Codex pool is closed")
+        return client
+
+
+async def _connect_async_client(
+    options: CodexOptions,
+    *,
+    experimental_api: bool,
+) -> AsyncAppServerClient:
+    from codex.app_server import AsyncAppServerClient
+
+    client = await AsyncAppServerClient.connect_stdio(
+        process_options=options.to_app_server_options(),
+        initialize_options=AppServerInitializeOptions(experimental_api=experimental_api),
+    )
+    try:
+        if options.api_key is not None:
+            await client.account.login_api_key(api_key=options.api_key)
+    except AppServerError:
+        await client.close()
+        raise
+    return client
+
+
+async def _aclose_quietly(client: AsyncAppServerClient) -> None:
+    with suppress(Exception):
+        await client.close()
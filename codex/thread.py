@@ -2,14 +2,14 @@
 
 from __future__ import annotations
 
-import threading
-import time
 from collections.abc import Callable, Collection, Mapping, Sequence
 from typing import TYPE_CHECKING, Any, TypeVar
 
 from pydantic import BaseModel
 
-from codex._turn_options import with_model_output_schema
+from codex._signals import is_signal_aborted as _is_signal_aborted
+from codex._signals import signal_watch_service
+from codex._turn_options import with_model_output_schema, without_text_deltas
 from codex.app_server.errors import AppServerTurnError
 from codex.app_server.options import (
     AppServerThreadResumeOptions,
@@ -19,8 +19,6 @@ from codex.app_server.options import (
 from codex.errors import ThreadRunError
 from codex.options import (
     CancelSignal,
-    SupportsAborted,
-    SupportsIsSet,
     ThreadResumeOptions,
     ThreadStartOptions,
     TurnOptions,
@@ -28,7 +26,7 @@ from codex.options import (
 from codex.protocol import types as protocol
 
 if TYPE_CHECKING:
-    from codex.app_server import AppServerClient, AppServerThread, TurnStream
+    from codex.app_server import AppServerClient, AppServerThread, DeltaEvent, TurnStream
 
 type _ClientFactory = Callable[..., AppServerClient]
 
@@ -65,8 +63,8 @@ class CodexTurnStream:
     def __iter__(self) -> CodexTurnStream:
         return self
 
-    def __next__(self) -> BaseModel:
-        notification: BaseModel = next(self._stream)
+    def __next__(self) -> BaseModel | DeltaEvent:
+        notification: BaseModel | DeltaEvent = next(self._stream)
         if self.final_turn is not None:
             self._watcher.stop()
         return notification
@@ -188,7 +186,7 @@ class Thread:
         Raises:
             ThreadRunError: terminal turn status is failed/interrupted.
         """
-        stream = self.run(input, turn_options, signal=signal)
+        stream = self.run(input, _final_output_turn_options(turn_options), signal=signal)
         stream.wait()
         return stream.final_text
 
@@ -205,7 +203,7 @@ class Thread:
             ThreadRunError: terminal turn status is failed/interrupted.
             ValueError: no final assistant message or invalid JSON payload.
         """
-        stream = self.run(input, turn_options, signal=signal)
+        stream = self.run(input, _final_output_turn_options(turn_options), signal=signal)
         stream.wait()
         return stream.final_json()
 
@@ -226,10 +224,12 @@ class Thread:
         """
         stream = self.run(
             input,
-            with_model_output_schema(
-                None if turn_options is None else _to_app_server_turn_options(turn_options),
-                model_type,
-                owner="Thread.run_model()",
+            without_text_deltas(
+                with_model_output_schema(
+                    None if turn_options is None else _to_app_server_turn_options(turn_options),
+                    model_type,
+                    owner="Thread.run_model()",
+                )
             ),
             signal=signal,
         )
@@ -255,16 +255,6 @@ class Thread:
         return self._thread
 
 
-def _is_signal_aborted(signal: CancelSignal | None) -> bool:
-    if signal is None:
-        return False
-    if isinstance(signal, SupportsAborted):
-        return signal.aborted
-    if isinstance(signal, SupportsIsSet):
-        return bool(signal.is_set())
-    raise TypeError("signal must expose `aborted` or `is_set()`")
-
-
 def _to_app_server_start_options(
     options: ThreadStartOptions | AppServerThreadStartOptions | None,
 ) -> AppServerThreadStartOptions | None:
@@ -293,28 +283,21 @@ def _to_app_server_turn_options(
     return options
 
 
+def _final_output_turn_options(
+    options: TurnOptions | AppServerTurnOptions | None,
+) -> AppServerTurnOptions:
+    return without_text_deltas(None if options is None else _to_app_server_turn_options(options))
+
+
 class _SignalWatcher:
+    """Interrupt a turn when its cancel signal fires, via the shared watch service."""
+
     def __init__(self, stream: CodexTurnStream, signal: CancelSignal | None) -> None:
-        self._stream = stream
-        self._signal = signal
-        self._stop = threading.Event()
-        self._thread: threading.Thread | None = None
-        if signal is not None:
-            self._thread = threading.Thread(target=self._run, name="codex-turn-signal", daemon=True)
-            self._thread.start()
+        self._watch = (
+            None if signal is None else signal_watch_service().watch(signal, stream._interrupt)
+        )
 
     def stop(self) -> None:
-        self._stop.set()
-        thread = self._thread
-        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
-            thread.join(timeout=0.1)
-
-    def _run(self) -> None:
-        while not self._stop.is_set():
-            if _is_signal_aborted(self._signal):
-                try:
-                    self._stream._interrupt()
-                finally:
-                    self._stop.set()
-                return
-            time.sleep(0.05)
+        watch, self._watch = self._watch, None
+        if watch is not None:
+            watch.cancel()
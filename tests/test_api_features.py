@@ -772,7 +772,10 @@ def test_run_passes_process_thread_and_turn_options_through(
 
     _, run_options = fake_thread.run_calls[0]
     assert isinstance(run_options, AppServerTurnOptions)
-    assert run_options == turn_options.to_app_server_options()
+    # run_text() never exposes its stream, so it keeps no deltas and takes compact ones.
+    assert run_options == turn_options.to_app_server_options().model_copy(
+        update={"retain_text_deltas": False, "compact_deltas": True}
+    )
 
 
 def test_run_turn_signal_interrupts_in_flight_turn(monkeypatch: pytest.MonkeyPatch) -> None:
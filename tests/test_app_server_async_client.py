@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 import asyncio
+import json
+from typing import cast
 
 import pytest
+from pydantic import BaseModel
 
-from codex.app_server._async_client import AsyncEventsClient, AsyncTurnStream
+from codex.app_server import AgentMessageDeltaEvent, MappedTurn, ReasoningTextDeltaEvent
+from codex.app_server._async_client import AsyncAppServerClient, AsyncEventsClient, AsyncTurnStream
 from codex.app_server.errors import AppServerProtocolError, AppServerTurnError
 from codex.app_server.models import ReviewResult
+from codex.app_server.transports import AsyncMessageTransport
 from codex.protocol import types as protocol
 
 
@@ -14,14 +19,23 @@ class _FakeSession:
     def __init__(self) -> None:
         self.calls: list[tuple[object, object]] = []
 
-    def subscribe_notifications(self, methods: object, *, predicate: object = None) -> object:
+    def subscribe_notifications(
+        self,
+        methods: object,
+        *,
+        predicate: object = None,
+        maxsize: object = None,
+        overflow: object = None,
+    ) -> object:
         self.calls.append((methods, predicate))
+        self.bounds = (maxsize, overflow)
         return "subscription"
 
 
 class _FakeSubscription:
     def __init__(self) -> None:
         self.updated_predicate: object | None = None
+        self.updated_scope: tuple[str, str | None] | None = None
         self.closed = False
 
     async def next(self) -> protocol.ServerNotification:
@@ -33,6 +47,9 @@ class _FakeSubscription:
     def update_predicate(self, predicate: object) -> None:
         self.updated_predicate = predicate
 
+    def update_scope(self, thread_id: str, turn_id: str | None = None) -> None:
+        self.updated_scope = (thread_id, turn_id)
+
 
 class _QueuedSubscription(_FakeSubscription):
     def __init__(self, notifications: list[protocol.Notification]) -> None:
@@ -87,6 +104,15 @@ def test_async_events_client_subscribe_delegates_to_session() -> None:
     assert session.calls == [(["turn/completed"], None)]
 
 
+def test_async_events_client_subscribe_forwards_queue_bounds() -> None:
+    session = _FakeSession()
+    events = AsyncEventsClient(session)  # type: ignore[arg-type]
+
+    events.subscribe(["item/agentMessage/delta"], maxsize=16, overflow="coalesce")
+
+    assert session.bounds == (16, "coalesce")
+
+
 def test_async_events_client_subscribe_command_exec_output_filters_by_process_id() -> None:
     session = _FakeSession()
     events = AsyncEventsClient(session)  # type: ignore[arg-type]
@@ -175,52 +201,6 @@ def test_async_events_client_subscribe_process_events_filters_by_process_handle(
     assert predicate(other_handle) is False
 
 
-def test_async_turn_stream_scope_predicate_filters_by_thread_and_turn() -> None:
-    predicate = AsyncTurnStream._scope_predicate("thr-1", "turn-1")
-
-    matching_turn = protocol.TurnCompletedNotificationModel.model_validate(
-        {
-            "method": "turn/completed",
-            "params": {"threadId": "thr-1", "turn": _turn_payload()},
-        }
-    )
-    matching_usage = protocol.ThreadTokenUsageUpdatedNotificationModel.model_validate(
-        {
-            "method": "thread/tokenUsage/updated",
-            "params": {
-                "threadId": "thr-1",
-                "turnId": "turn-other",
-                "tokenUsage": {
-                    "last": {
-                        "inputTokens": 1,
-                        "cachedInputTokens": 0,
-                        "outputTokens": 2,
-                        "reasoningOutputTokens": 0,
-                        "totalTokens": 3,
-                    },
-                    "total": {
-                        "inputTokens": 1,
-                        "cachedInputTokens": 0,
-                        "outputTokens": 2,
-                        "reasoningOutputTokens": 0,
-                        "totalTokens": 3,
-                    },
-                },
-            },
-        }
-    )
-    wrong_thread = protocol.TurnCompletedNotificationModel.model_validate(
-        {
-            "method": "turn/completed",
-            "params": {"threadId": "thr-2", "turn": _turn_payload()},
-        }
-    )
-
-    assert predicate(matching_turn) is True
-    assert predicate(matching_usage) is True
-    assert predicate(wrong_thread) is False
-
-
 def test_async_turn_stream_apply_tracks_text_usage_items_and_final_turn() -> None:
     stream = AsyncTurnStream(
         _FakeThread(),  # type: ignore[arg-type]
@@ -301,6 +281,41 @@ def test_async_turn_stream_apply_tracks_text_usage_items_and_final_turn() -> Non
     assert stream.final_turn is not None
 
 
+def test_async_turn_stream_accumulates_deltas_without_retaining_them() -> None:
+    stream = AsyncTurnStream(
+        _FakeThread(),  # type: ignore[arg-type]
+        _FakeSubscription(),  # type: ignore[arg-type]
+        protocol.Turn.model_validate(_turn_payload(status="inProgress")),
+        retain_text_deltas=False,
+    )
+
+    def delta(text: str) -> protocol.ItemAgentMessageDeltaNotification:
+        return protocol.ItemAgentMessageDeltaNotification.model_validate(
+            {
+                "method": "item/agentMessage/delta",
+                "params": {
+                    "threadId": "thr-1",
+                    "turnId": "turn-1",
+                    "itemId": "item-1",
+                    "delta": text,
+                },
+            }
+        )
+
+    for text in ["Hel", "lo", " "]:
+        stream._apply(delta(text))
+    stream._apply(
+        protocol.TurnCompletedNotificationModel.model_validate(
+            {"method": "turn/completed", "params": {"threadId": "thr-1", "turn": _turn_payload()}}
+        )
+    )
+
+    assert stream.final_text == "Hello "
+    stream._apply(delta("world"))
+    assert stream.final_text == "Hello world"
+    assert stream.text_deltas == ()
+
+
 def test_async_turn_stream_apply_replaces_existing_item_state() -> None:
     stream = AsyncTurnStream(
         _FakeThread(),  # type: ignore[arg-type]
@@ -582,8 +597,13 @@ def test_async_turn_stream_start_review_installs_safe_initial_predicate() -> Non
         subscription = _FakeSubscription()
 
         def subscribe_notifications(
-            methods: object, *, predicate: object = None
+            methods: object,
+            *,
+            predicate: object = None,
+            scope: object = None,
+            compact_deltas: object = None,
         ) -> _FakeSubscription:
+            assert scope is None
             session.calls.append((methods, predicate))
             return subscription
 
@@ -602,7 +622,7 @@ def test_async_turn_stream_start_review_installs_safe_initial_predicate() -> Non
         assert "model/safetyBuffering/updated" in session.calls[0][0]
         initial_predicate = session.calls[0][1]
         assert callable(initial_predicate)
-        assert callable(subscription.updated_predicate)
+        assert subscription.updated_scope == ("thr-review-1", "turn-1")
 
         unrelated = protocol.TurnCompletedNotificationModel.model_validate(
             {
@@ -619,9 +639,338 @@ def test_async_turn_stream_start_review_installs_safe_initial_predicate() -> Non
 
         assert initial_predicate(unrelated) is False
         assert initial_predicate(matching) is False
-        assert subscription.updated_predicate(matching) is True
         assert stream.thread_id == "thr-review-1"
 
         await stream.close()
 
     asyncio.run(scenario())
+
+
+class _MapTurnsThread:
+    def __init__(self, owner: _MapTurnsOwner, thread_id: str) -> None:
+        self.owner = owner
+        self.id = thread_id
+
+    async def run_text(self, input: object, options: object = None) -> str:
+        _ = options
+        self.owner.in_flight += 1
+        self.owner.peak = max(self.owner.peak, self.owner.in_flight)
+        try:
+            text = str(input)
+            self.owner.runs.append(text)
+            if text == "slow":
+                await self.owner.gate.wait()
+            await asyncio.sleep(0.001 * (len(text) % 3))
+            if text == "fail":
+                raise RuntimeError("turn failed")
+            return text.upper()
+        finally:
+            self.owner.in_flight -= 1
+
+    async def unsubscribe(self) -> None:
+        self.owner.released.append(self.id)
+
+
+class _MapTurnsOwner:
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.peak = 0
+        self.started: list[tuple[object, str]] = []
+        self.runs: list[str] = []
+        self.released: list[str] = []
+        self.gate = asyncio.Event()
+
+
+def _map_turns_clients(
+    monkeypatch: pytest.MonkeyPatch,
+    owner: _MapTurnsOwner,
+    count: int,
+) -> list[AsyncAppServerClient]:
+    async def fake_start_thread(self: AsyncAppServerClient, options: object = None) -> object:
+        _ = options
+        thread_id = f"thr-{len(owner.started)}"
+        owner.started.append((self, thread_id))
+        return _MapTurnsThread(owner, thread_id)
+
+    monkeypatch.setattr(AsyncAppServerClient, "start_thread", fake_start_thread)
+    return [AsyncAppServerClient(cast(AsyncMessageTransport, object())) for _ in range(count)]
+
+
+def test_async_client_map_turns_bounds_in_flight_turns(monkeypatch: pytest.MonkeyPatch) -> None:
+    owner = _MapTurnsOwner()
+    [client] = _map_turns_clients(monkeypatch, owner, 1)
+
+    async def scenario() -> list[MappedTurn]:
+        inputs = (f"prompt-{index}" for index in range(10))
+        return [result async for result in client.map_turns(inputs, concurrency=3)]
+
+    results = asyncio.run(scenario())
+
+    assert sorted(result.index for result in results) == list(range(10))
+    assert all(result.final_text == str(result.input).upper() for result in results)
+    assert owner.peak == 3
+    assert len(owner.started) == 10
+    assert sorted(owner.released) == sorted(thread_id for _, thread_id in owner.started)
+
+
+def test_async_client_map_turns_orders_reuses_threads_and_shards(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    owner = _MapTurnsOwner()
+    primary, secondary = _map_turns_clients(monkeypatch, owner, 2)
+
+    async def scenario() -> list[MappedTurn]:
+        inputs = ["a", "bb", "fail", "dddd", "e", "ff"]
+        return [
+            result
+            async for result in primary.map_turns(
+                inputs,
+                concurrency=2,
+                reuse_threads=True,
+                ordered=True,
+                connections=[secondary],
+            )
+        ]
+
+    results = asyncio.run(scenario())
+
+    assert [result.index for result in results] == list(range(6))
+    failed = results[2]
+    assert not failed.ok
+    assert isinstance(failed.error, RuntimeError)
+    assert failed.final_text is None
+    assert [result.final_text for result in results if result.ok] == ["A", "BB", "DDDD", "E", "FF"]
+    assert [client for client, _ in owner.started] == [primary, secondary]
+    assert {result.thread_id for result in results} == {"thr-0", "thr-1"}
+    assert sorted(owner.released) == ["thr-0", "thr-1"]
+
+
+def test_async_client_map_turns_ordered_waits_for_the_slowest_turn(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    owner = _MapTurnsOwner()
+    [client] = _map_turns_clients(monkeypatch, owner, 1)
+
+    async def scenario() -> list[MappedTurn]:
+        results = client.map_turns(["slow", "b", "c", "d", "e"], concurrency=2, ordered=True)
+        first = asyncio.create_task(anext(results))
+        for _ in range(20):
+            await asyncio.sleep(0)
+        # The slot taken by "b" is only returned once "slow" is yielded ahead of it.
+        assert owner.runs == ["slow", "b"]
+        owner.gate.set()
+        return [await first, *[result async for result in results]]
+
+    results = asyncio.run(scenario())
+
+    assert [result.final_text for result in results] == ["SLOW", "B", "C", "D", "E"]
+
+
+def test_async_client_map_turns_cancels_running_turns_when_closed_early(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    owner = _MapTurnsOwner()
+    [client] = _map_turns_clients(monkeypatch, owner, 1)
+
+    async def scenario() -> None:
+        results = client.map_turns(["a", "bb", "ccc", "dddd"], concurrency=4)
+        async for _ in results:
+            break
+        await results.aclose()
+        assert owner.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_async_turn_stream_yields_json_items_before_the_message_completes() -> None:
+    class _Record(BaseModel):
+        name: str
+
+    def delta(text: str) -> protocol.ItemAgentMessageDeltaNotification:
+        return protocol.ItemAgentMessageDeltaNotification.model_validate(
+            {
+                "method": "item/agentMessage/delta",
+                "params": {
+                    "threadId": "thr-1",
+                    "turnId": "turn-1",
+                    "itemId": "item-1",
+                    "delta": text,
+                },
+            }
+        )
+
+    text = '{"records": [{"name": "a,]"}, {"name": "b"}, {"name": "c"}]}'
+    notifications: list[protocol.Notification] = [
+        delta(text[: text.index('{"name": "b"')]),
+        delta(text[text.index('{"name": "b"') : text.index('"c"')]),
+        delta(text[text.index('"c"') :]),
+        protocol.ItemCompletedNotificationModel.model_validate(
+            {
+                "method": "item/completed",
+                "params": {
+                    "threadId": "thr-1",
+                    "turnId": "turn-1",
+                    "completedAtMs": 1_714_000_000_000,
+                    "item": {"id": "item-1", "type": "agentMessage", "text": text},
+                },
+            }
+        ),
+        protocol.TurnCompletedNotificationModel.model_validate(
+            {"method": "turn/completed", "params": {"threadId": "thr-1", "turn": _turn_payload()}}
+        ),
+    ]
+
+    async def scenario() -> None:
+        subscription = _QueuedSubscription(notifications)
+        stream = AsyncTurnStream(
+            _FakeThread(),  # type: ignore[arg-type]
+            subscription,  # type: ignore[arg-type]
+            protocol.Turn.model_validate(_turn_payload(status="inProgress")),
+        )
+        assert stream.partial_json() is None
+        seen: list[tuple[str, int]] = []
+        async for record in stream.iter_json_items(("records", "*"), _Record):
+            seen.append((record.name, len(notifications)))
+            if record.name == "a,]":
+                assert stream.partial_json() == {"records": [{"name": "a,]"}]}
+
+        assert seen == [("a,]", 4), ("b", 3), ("c", 2)]
+        assert stream.partial_json() == json.loads(text)
+        assert subscription.closed is True
+
+    asyncio.run(scenario())
+
+
+def test_async_turn_stream_json_items_fall_back_to_the_completed_message() -> None:
+    text = '{"records": [1, 2, 3]}'
+    notifications: list[protocol.Notification] = [
+        protocol.ItemCompletedNotificationModel.model_validate(
+            {
+                "method": "item/completed",
+                "params": {
+                    "threadId": "thr-1",
+                    "turnId": "turn-1",
+                    "completedAtMs": 1_714_000_000_000,
+                    "item": {"id": "item-1", "type": "agentMessage", "text": text},
+                },
+            }
+        ),
+        protocol.TurnCompletedNotificationModel.model_validate(
+            {"method": "turn/completed", "params": {"threadId": "thr-1", "turn": _turn_payload()}}
+        ),
+    ]
+
+    async def scenario() -> None:
+        stream = AsyncTurnStream(
+            _FakeThread(),  # type: ignore[arg-type]
+            _QueuedSubscription(notifications),  # type: ignore[arg-type]
+            protocol.Turn.model_validate(_turn_payload(status="inProgress")),
+        )
+        assert [item async for item in stream.iter_json_items(("records", "*"))] == [1, 2, 3]
+
+    asyncio.run(scenario())
+
+
+def test_async_turn_stream_json_feed_skips_prose_messages() -> None:
+    def delta(item_id: str, text: str) -> protocol.ItemAgentMessageDeltaNotification:
+        return protocol.ItemAgentMessageDeltaNotification.model_validate(
+            {
+                "method": "item/agentMessage/delta",
+                "params": {
+                    "threadId": "thr-1",
+                    "turnId": "turn-1",
+                    "itemId": item_id,
+                    "delta": text,
+                },
+            }
+        )
+
+    def item(method: str, item_id: str, text: str, phase: str | None) -> dict[str, object]:
+        time_field = "startedAtMs" if method == "item/started" else "completedAtMs"
+        payload: dict[str, object] = {"id": item_id, "type": "agentMessage", "text": text}
+        if phase is not None:
+            payload["phase"] = phase
+        return {
+            "method": method,
+            "params": {
+                "threadId": "thr-1",
+                "turnId": "turn-1",
+                time_field: 1_714_000_000_000,
+                "item": payload,
+            },
+        }
+
+    commentary = "Checking [files, tests] now"
+    prose = "Found {2 issues}, fixing"
+    text = '{"records": [1, 2]}'
+    notifications: list[protocol.Notification] = [
+        protocol.ItemStartedNotificationModel.model_validate(
+            item("item/started", "item-1", "", "commentary")
+        ),
+        delta("item-1", commentary[:12]),
+        delta("item-1", commentary[12:]),
+        protocol.ItemCompletedNotificationModel.model_validate(
+            item("item/completed", "item-1", commentary, "commentary")
+        ),
+        # Phase-less prose is parsed until it stops being JSON, then ignored.
+        delta("item-2", prose),
+        protocol.ItemCompletedNotificationModel.model_validate(
+            item("item/completed", "item-2", prose, None)
+        ),
+        delta("item-3", text[:12]),
+        delta("item-3", text[12:]),
+        protocol.ItemCompletedNotificationModel.model_validate(
+            item("item/completed", "item-3", text, "final_answer")
+        ),
+        protocol.TurnCompletedNotificationModel.model_validate(
+            {"method": "turn/completed", "params": {"threadId": "thr-1", "turn": _turn_payload()}}
+        ),
+    ]
+    prose_notifications = [*notifications[:6], notifications[-1]]
+
+    async def scenario() -> None:
+        stream = AsyncTurnStream(
+            _FakeThread(),  # type: ignore[arg-type]
+            _QueuedSubscription(notifications),  # type: ignore[arg-type]
+            protocol.Turn.model_validate(_turn_payload(status="inProgress")),
+        )
+        assert stream.partial_json() is None
+        events = [event async for event in stream]
+
+        assert len(events) == 10
+        assert stream.partial_json() == {"records": [1, 2]}
+
+        prose_only = AsyncTurnStream(
+            _FakeThread(),  # type: ignore[arg-type]
+            _QueuedSubscription(prose_notifications),  # type: ignore[arg-type]
+            protocol.Turn.model_validate(_turn_payload(status="inProgress")),
+        )
+        assert [value async for value in prose_only.iter_json_items(("*",))] == []
+
+    asyncio.run(scenario())
+
+
+def test_async_turn_stream_applies_compact_delta_events() -> None:
+    notifications: list[object] = [
+        AgentMessageDeltaEvent("thr-1", "turn-1", "item-1", '{"answer": ', None),
+        ReasoningTextDeltaEvent("thr-1", "turn-1", "reason-1", "thinking", None, 0),
+        AgentMessageDeltaEvent("thr-1", "turn-1", "item-1", '"ok"}', None),
+        protocol.TurnCompletedNotificationModel.model_validate(
+            {"method": "turn/completed", "params": {"threadId": "thr-1", "turn": _turn_payload()}}
+        ),
+    ]
+
+    async def scenario() -> None:
+        stream = AsyncTurnStream(
+            _FakeThread(),  # type: ignore[arg-type]
+            _QueuedSubscription(notifications),  # type: ignore[arg-type]
+            protocol.Turn.model_validate(_turn_payload(status="inProgress")),
+        )
+        events = [event async for event in stream]
+
+        assert isinstance(events[0], AgentMessageDeltaEvent)
+        assert stream.text_deltas == ('{"answer": ', '"ok"}')
+        assert stream.final_text == '{"answer": "ok"}'
+        assert stream.partial_json() == {"answer": "ok"}
+
+    asyncio.run(scenario())
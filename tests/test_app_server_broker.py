@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import asyncio
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from codex.app_server import (
+    AppServerBroker,
+    AppServerConnectionError,
+    AppServerSocketOptions,
+    AsyncAppServerClient,
+)
+from codex.app_server._broker import _BrokerClient
+from codex.app_server._session import _AsyncSession
+from codex.app_server.transports import AsyncTcpTransport, AsyncUnixSocketTransport
+
+JsonObject = dict[str, Any]
+
+
+class _FakeUpstream:
+    """Shared app-server stand-in that answers requests and records what it was sent."""
+
+    def __init__(self) -> None:
+        self.sent: list[JsonObject] = []
+        self.starts = 0
+        self._incoming: asyncio.Queue[JsonObject | None] = asyncio.Queue()
+        self._threads = 0
+
+    async def start(self) -> None:
+        self.starts += 1
+
+    async def send(self, message: JsonObject) -> None:
+        self.sent.append(message)
+        method = message.get("method")
+        if "id" not in message or method is None:
+            return
+        result: object = {}
+        if method == "initialize":
+            result = {"userAgent": "shared-server"}
+        elif method == "thread/start":
+            self._threads += 1
+            result = {"thread": {"id": f"thr-{self._threads}"}}
+        elif method == "model/list":
+            result = {"data": [], "requestId": message["id"]}
+        self.push({"id": message["id"], "result": result})
+
+    async def receive(self) -> JsonObject | None:
+        return await self._incoming.get()
+
+    async def close(self) -> None:
+        self.push(None)
+
+    def push(self, message: JsonObject | None) -> None:
+        self._incoming.put_nowait(message)
+
+    def methods(self) -> list[str]:
+        return [message["method"] for message in self.sent if "method" in message]
+
+
+def _socket_path() -> str:
+    # Unix socket paths are limited to about 100 bytes, so avoid long pytest tmp paths.
+    return str(Path(tempfile.mkdtemp(prefix="codex-broker-")) / "broker.sock")
+
+
+def test_broker_shares_one_initialized_app_server_between_clients() -> None:
+    async def scenario() -> None:
+        upstream = _FakeUpstream()
+        path = _socket_path()
+        async with AppServerBroker(upstream) as broker:
+            await broker.listen_unix(path)
+            port = await broker.listen_tcp()
+            first = _AsyncSession(AsyncUnixSocketTransport(path))
+            second = _AsyncSession(AsyncTcpTransport("127.0.0.1", port))
+            first_init = await first.start()
+            await second.start()
+
+            first_models, second_models = await asyncio.gather(
+                first.request("model/list", {}),
+                second.request("model/list", {}),
+            )
+
+            assert first_init.user_agent == "shared-server"
+            assert upstream.starts == 1
+            assert upstream.methods().count("initialize") == 1
+            assert upstream.methods().count("initialized") == 1
+            # Both sessions used request id 1; the broker gave them distinct upstream ids.
+            assert isinstance(first_models, dict) and isinstance(second_models, dict)
+            assert first_models["requestId"] != second_models["requestId"]
+            assert broker.client_count == 2
+
+            await first.close()
+            await second.close()
+
+    asyncio.run(scenario())
+
+
+def test_broker_routes_thread_traffic_to_the_owning_client() -> None:
+    async def scenario() -> None:
+        upstream = _FakeUpstream()
+        path = _socket_path()
+        async with AppServerBroker(upstream) as broker:
+            await broker.listen_unix(path)
+            owner = _AsyncSession(AsyncUnixSocketTransport(path))
+            other = _AsyncSession(AsyncUnixSocketTransport(path))
+            await owner.start()
+            await other.start()
+            owner_events = owner.subscribe_notifications({"custom/event"})
+            other_events = other.subscribe_notifications({"custom/event"})
+            owner.on_request("item/tool/call", lambda request: {"handledBy": "owner"})
+
+            thread = await owner.request("thread/start", {})
+            assert thread == {"thread": {"id": "thr-1"}}
+            upstream.push({"method": "custom/event", "params": {"threadId": "thr-1"}})
+            upstream.push({"method": "custom/event", "params": {"threadId": "thr-orphan"}})
+            upstream.push({"method": "custom/event", "params": {"global": True}})
+            upstream.push(
+                {
+                    "id": "srv-1",
+                    "method": "item/tool/call",
+                    "params": {
+                        "threadId": "thr-1",
+                        "turnId": "turn-1",
+                        "callId": "call-1",
+                        "tool": "lookup",
+                        "arguments": {},
+                    },
+                }
+            )
+            upstream.push(
+                {
+                    "id": "srv-2",
+                    "method": "item/commandExecution/requestApproval",
+                    "params": {"threadId": "thr-orphan", "turnId": "turn-1", "itemId": "i-1"},
+                }
+            )
+
+            first = await asyncio.wait_for(owner_events.next(), timeout=1)
+            second = await asyncio.wait_for(owner_events.next(), timeout=1)
+            broadcast = await asyncio.wait_for(other_events.next(), timeout=1)
+            assert first.params == {"threadId": "thr-1"}
+            assert second.params == {"global": True}
+            assert broadcast.params == {"global": True}
+            while not any(message.get("id") == "srv-1" for message in upstream.sent):
+                await asyncio.sleep(0.01)
+            response = next(message for message in upstream.sent if message.get("id") == "srv-1")
+            assert response["result"] == {"handledBy": "owner"}
+            while not any(message.get("id") == "srv-2" for message in upstream.sent):
+                await asyncio.sleep(0.01)
+            orphaned = next(message for message in upstream.sent if message.get("id") == "srv-2")
+            assert orphaned["error"]["message"] == "no broker client owns the thread"
+
+            await owner.close()
+            while "thread/unsubscribe" not in upstream.methods():
+                await asyncio.sleep(0.01)
+            await other.close()
+
+    asyncio.run(scenario())
+
+
+def test_broker_unsubscribes_threads_loaded_for_a_departed_client() -> None:
+    class _ClosedWriter:
+        def is_closing(self) -> bool:
+            return True
+
+    async def scenario() -> None:
+        upstream = _FakeUpstream()
+        broker = AppServerBroker(upstream)
+        departed = _BrokerClient(0, _ClosedWriter(), broker._codec)  # type: ignore[arg-type]
+
+        await broker._claim_thread(departed, {"thread": {"id": "thr-9"}})
+
+        assert upstream.sent[-1]["method"] == "thread/unsubscribe"
+        assert upstream.sent[-1]["params"] == {"threadId": "thr-9"}
+        assert broker._thread_clients == {}
+
+    asyncio.run(scenario())
+
+
+def test_unix_socket_client_reports_missing_broker() -> None:
+    async def scenario() -> None:
+        with pytest.raises(AppServerConnectionError, match="Failed to connect to unix socket"):
+            await AsyncAppServerClient.connect_unix_socket(
+                _socket_path(), AppServerSocketOptions(connect_timeout=1)
+            )
+
+    asyncio.run(scenario())
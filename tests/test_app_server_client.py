@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 import asyncio
+import base64
 import concurrent.futures
 import inspect
+import io
 import threading
 import time
-from collections.abc import Callable
+from collections.abc import AsyncIterator, Callable
 from contextlib import suppress
+from pathlib import Path
 from queue import Queue
 from typing import Any, cast
 
@@ -16,8 +19,10 @@ from pydantic import BaseModel, ValidationError
 import codex
 import codex.app_server as app_server_pkg
 from codex.app_server import (
+    AppServerCacheOptions,
     AppServerClient,
     AppServerClientInfo,
+    AppServerError,
     AppServerInitializeOptions,
     AppServerProtocolError,
     AppServerRpcError,
@@ -25,12 +30,16 @@ from codex.app_server import (
     AppServerThreadListOptions,
     AppServerThreadResumeOptions,
     AppServerThreadStartOptions,
+    AppServerTimeoutError,
     AppServerTurnError,
     AppServerTurnOptions,
     AppServerWebSocketOptions,
     AsyncAppServerClient,
+    _fs_sync,
+    deadline,
     dynamic_tool,
 )
+from codex.app_server._pagination import iter_pages
 from codex.app_server._sync_client import _LoopThread
 from codex.app_server.models import EmptyResult, GenericNotification, GenericServerRequest
 from codex.protocol import types as protocol
@@ -2526,6 +2535,94 @@ def test_async_client_start_thread_registers_annotation_driven_dynamic_tools() -
     asyncio.run(scenario())
 
 
+def test_async_client_invalidate_cache_drops_entries_without_awaiting() -> None:
+    async def scenario() -> None:
+        transport = ScriptedTransport()
+        transport.responses["config/read"] = {"config": {}}
+        client = AsyncAppServerClient(
+            transport,
+            AppServerInitializeOptions(cache=AppServerCacheOptions(ttl={"config/read": 60})),
+        )
+        await client.start()
+
+        await client.rpc.request("config/read", {})
+        await client.rpc.request("config/read", {})
+        assert client.invalidate_cache("config/read") == 1
+        await client.rpc.request("config/read", {})
+
+        reads = [m for m in transport.sent if m.get("method") == "config/read"]
+        assert len(reads) == 2
+        await client.close()
+
+    asyncio.run(scenario())
+
+
+def test_async_client_release_threads_does_not_retry_a_failed_unsubscribe() -> None:
+    async def scenario() -> None:
+        transport = ScriptedTransport()
+        transport.responses["thread/start"] = {"thread": _thread_payload()}
+        transport.responses["thread/unsubscribe"] = lambda message: {
+            "id": message["id"],
+            "error": {"code": -32603, "message": "unsubscribe failed"},
+        }
+        client = AsyncAppServerClient(transport)
+        await client.start()
+
+        await client.start_thread()
+        await client._release_threads()
+        await client._release_threads()
+
+        unsubscribes = [m for m in transport.sent if m.get("method") == "thread/unsubscribe"]
+        assert len(unsubscribes) == 1
+        assert client._session.loaded_thread_ids() == []
+
+        await client.close()
+
+    asyncio.run(scenario())
+
+
+def test_async_client_release_threads_unsubscribes_and_drops_dynamic_tools() -> None:
+    async def scenario() -> None:
+        transport = ScriptedTransport()
+        transport.responses["thread/start"] = {"thread": _thread_payload()}
+        transport.responses["thread/unsubscribe"] = {}
+        client = AsyncAppServerClient(transport)
+        await client.start()
+
+        @dynamic_tool
+        def lookup_ticket(id: str) -> str:
+            """Look up a support ticket by id."""
+            return f"Ticket {id}"
+
+        await client.start_thread(tools=[lookup_ticket])
+        await client._release_threads()
+        await client._release_threads()
+
+        unsubscribes = [m for m in transport.sent if m.get("method") == "thread/unsubscribe"]
+        assert [m["params"] for m in unsubscribes] == [{"threadId": "thr-1"}]
+        transport.push(
+            {
+                "id": "req-1",
+                "method": "item/tool/call",
+                "params": {
+                    "callId": "call-1",
+                    "threadId": "thr-1",
+                    "turnId": "turn-1",
+                    "tool": "lookup_ticket",
+                    "arguments": {"id": "123"},
+                },
+            }
+        )
+        response = await asyncio.to_thread(
+            transport.wait_for_message, lambda message: message.get("id") == "req-1"
+        )
+        assert "No annotation-driven dynamic tool" in response["error"]["message"]
+
+        await client.close()
+
+    asyncio.run(scenario())
+
+
 def test_async_client_rejects_dynamic_tool_activation_after_manual_handler_registration() -> None:
     async def scenario() -> None:
         transport = ScriptedTransport()
@@ -2653,6 +2750,24 @@ def test_sync_client_exposes_oo_thread_and_stream_api() -> None:
         client.close()
 
 
+def test_sync_client_deadline_propagates_to_the_loop_thread() -> None:
+    loop = _LoopThread()
+    transport = ScriptedTransport()
+    async_client = AsyncAppServerClient(transport)
+    loop.run(async_client.start())
+    client = AppServerClient(async_client, loop)
+
+    try:
+        with deadline(0.05), pytest.raises(AppServerTimeoutError):
+            client.models.list()
+        with pytest.raises(AppServerTimeoutError):
+            client.rpc.request("thread/list", {}, timeout=0.01)
+        assert client.request_stats.timed_out == 2
+        assert client.request_stats.pending == 0
+    finally:
+        client.close()
+
+
 def test_turn_stream_can_parse_final_json_and_model() -> None:
     loop = _LoopThread()
     transport = ScriptedTransport()
@@ -3332,3 +3447,418 @@ def test_sync_client_close_surfaces_reader_failure() -> None:
         client.close()
 
     assert transport.closed is True
+
+
+def test_sync_turn_stream_iterates_json_items_from_deltas() -> None:
+    loop = _LoopThread()
+    transport = ScriptedTransport()
+    transport.responses["thread/start"] = {"thread": _thread_payload()}
+    transport.responses["turn/start"] = {"turn": _turn_payload()}
+    async_client = AsyncAppServerClient(transport)
+    loop.run(async_client.start())
+    client = AppServerClient(async_client, loop)
+
+    try:
+        thread = client.start_thread()
+        stream = thread.run("Return JSON")
+        text = '[{"answer": "one"}, {"answer": "two"}]'
+        for chunk in (text[:10], text[10:25], text[25:]):
+            transport.push(
+                {
+                    "method": "item/agentMessage/delta",
+                    "params": {
+                        "threadId": "thr-1",
+                        "turnId": "turn-1",
+                        "itemId": "item-1",
+                        "delta": chunk,
+                    },
+                }
+            )
+        transport.push(
+            {
+                "method": "item/completed",
+                "params": {
+                    "threadId": "thr-1",
+                    "turnId": "turn-1",
+                    "completedAtMs": 1_714_000_000_000,
+                    "item": _agent_message_item(text),
+                },
+            }
+        )
+        transport.push(
+            {
+                "method": "turn/completed",
+                "params": {"threadId": "thr-1", "turn": _turn_payload(status="completed")},
+            }
+        )
+
+        assert list(stream.iter_json_items(("*",), SummaryModel)) == [
+            SummaryModel(answer="one"),
+            SummaryModel(answer="two"),
+        ]
+        assert stream.partial_json() == [{"answer": "one"}, {"answer": "two"}]
+    finally:
+        client.close()
+
+
+def _paged(
+    pages: dict[str | None, tuple[list[JsonObject], str | None]],
+) -> Callable[[JsonObject], JsonObject]:
+    def respond(message: JsonObject) -> JsonObject:
+        data, next_cursor = pages[message["params"].get("cursor")]
+        return {"id": message["id"], "result": {"data": data, "nextCursor": next_cursor}}
+
+    return respond
+
+
+def test_iter_pages_prefetches_a_bounded_number_of_pages() -> None:
+    pages = {None: "c1", "c1": "c2", "c2": "c3", "c3": None}
+
+    async def scenario() -> None:
+        fetched: list[str | None] = []
+
+        async def fetch(cursor: str | None) -> protocol.ModelListResponse:
+            fetched.append(cursor)
+            return protocol.ModelListResponse(data=[], nextCursor=pages[cursor])
+
+        iterator = iter_pages(fetch, prefetch=2)
+        first = await anext(iterator)
+        await asyncio.sleep(0.01)
+        assert first.nextCursor == "c1"
+        # The page being handled plus two ahead; the fourth waits for the caller.
+        assert fetched == [None, "c1", "c2"]
+        assert [page.nextCursor async for page in iterator] == ["c2", "c3", None]
+        assert fetched == [None, "c1", "c2", "c3"]
+
+        unbuffered = [page.nextCursor async for page in iter_pages(fetch, prefetch=0)]
+        assert unbuffered == ["c1", "c2", "c3", None]
+
+    asyncio.run(scenario())
+
+
+def test_async_client_iter_threads_follows_cursors() -> None:
+    async def scenario() -> None:
+        transport = ScriptedTransport()
+        transport.responses["thread/list"] = _paged(
+            {
+                "start": ([_thread_payload("thr-1"), _thread_payload("thr-2")], "next"),
+                "next": ([_thread_payload("thr-3")], None),
+            }
+        )
+        client = AsyncAppServerClient(transport)
+        await client.start()
+
+        threads = [
+            thread.id
+            async for thread in client.iter_threads(
+                AppServerThreadListOptions(cursor="start", archived=True), page_size=2
+            )
+        ]
+
+        assert threads == ["thr-1", "thr-2", "thr-3"]
+        requests = [message["params"] for message in transport.sent if "id" in message]
+        assert requests[1:] == [
+            {"archived": True, "cursor": "start", "limit": 2},
+            {"archived": True, "cursor": "next", "limit": 2},
+        ]
+        await client.close()
+
+    asyncio.run(scenario())
+
+
+def test_sync_thread_iter_items_streams_across_pages_and_stops_early() -> None:
+    loop = _LoopThread()
+    transport = ScriptedTransport()
+    transport.responses["thread/start"] = {"thread": _thread_payload()}
+    transport.responses["thread/items/list"] = _paged(
+        {
+            None: ([{"turnId": "turn-1", "item": _agent_message_item("a", "item-1")}], "p2"),
+            "p2": ([{"turnId": "turn-1", "item": _agent_message_item("b", "item-2")}], "p3"),
+            "p3": ([{"turnId": "turn-2", "item": _agent_message_item("c", "item-3")}], None),
+        }
+    )
+    async_client = AsyncAppServerClient(transport)
+    loop.run(async_client.start())
+    client = AppServerClient(async_client, loop)
+
+    try:
+        thread = client.start_thread()
+        items = [item.root.id for item in thread.iter_items(page_size=1)]
+        assert items == ["item-1", "item-2", "item-3"]
+
+        for item in thread.iter_items(page_size=1, prefetch=0):
+            assert item.root.id == "item-1"
+            break
+        item_requests = [
+            message["params"].get("cursor")
+            for message in transport.sent
+            if message.get("method") == "thread/items/list"
+        ]
+        assert item_requests == [None, "p2", "p3", None]
+    finally:
+        client.close()
+
+
+def _upload_transport(exit_code: int = 0) -> tuple[ScriptedTransport, list[bytes]]:
+    transport = ScriptedTransport()
+    written: list[bytes] = []
+
+    def write_stdin(message: JsonObject) -> JsonObject:
+        delta = message["params"].get("deltaBase64")
+        if delta is not None:
+            written.append(base64.b64decode(delta))
+        return {"id": message["id"], "result": {}}
+
+    transport.responses["command/exec"] = {"exitCode": exit_code, "stderr": "", "stdout": ""}
+    transport.responses["command/exec/write"] = write_stdin
+    transport.responses["fs/writeFile"] = {}
+    return transport, written
+
+
+class _DelayedExecTransport(ScriptedTransport):
+    """Starts the upload process only after rejecting the first stdin write."""
+
+    def __init__(self, *, error: JsonObject | None = None, exit_delay: float = 0.0) -> None:
+        super().__init__()
+        self.exec_id: object = None
+        self.running = False
+        self.written: list[bytes] = []
+        self.error = error
+        self.exit_delay = exit_delay
+
+    async def send(self, message: JsonObject) -> None:
+        await super().send(message)
+        method = message.get("method")
+        if method == "command/exec":
+            self.exec_id = message["id"]
+        elif method == "command/exec/write":
+            params = message["params"]
+            if not self.running:
+                self.running = True
+                error = self.error or {
+                    "code": -32600,
+                    "message": f"unknown process id {params['processId']}",
+                }
+                self.push({"id": message["id"], "error": error})
+                return
+            if params.get("deltaBase64") is not None:
+                self.written.append(base64.b64decode(params["deltaBase64"]))
+            self.push({"id": message["id"], "result": {}})
+            if params.get("closeStdin"):
+                result = {"id": self.exec_id, "result": {"exitCode": 0, "stderr": "", "stdout": ""}}
+                threading.Timer(self.exit_delay, self.push, [result]).start()
+
+
+def test_async_fs_upload_retries_writes_until_the_process_starts() -> None:
+    async def scenario() -> None:
+        transport = _DelayedExecTransport()
+        client = AsyncAppServerClient(transport)
+        await client.start()
+
+        sent = await client.fs.upload(path="/repo/data.bin", source=b"0123456789", chunk_size=4)
+
+        assert sent == 10
+        assert transport.written == [b"0123", b"4567", b"89"]
+        writes = [m for m in transport.sent if m.get("method") == "command/exec/write"]
+        assert [base64.b64decode(m["params"]["deltaBase64"]) for m in writes[:2]] == [b"0123"] * 2
+        await client.close()
+
+    asyncio.run(scenario())
+
+
+def test_async_fs_upload_reads_file_objects_off_the_event_loop() -> None:
+    class _RecordingFile(io.BytesIO):
+        def __init__(self, data: bytes) -> None:
+            super().__init__(data)
+            self.threads: set[int] = set()
+
+        def read(self, size: int | None = -1, /) -> bytes:
+            self.threads.add(threading.get_ident())
+            return super().read(size)
+
+    async def scenario() -> None:
+        transport, written = _upload_transport()
+        client = AsyncAppServerClient(transport)
+        await client.start()
+        source = _RecordingFile(b"0123456789")
+
+        sent = await client.fs.upload(path="/repo/data.bin", source=source, chunk_size=4)
+
+        assert sent == 10
+        assert written == [b"0123", b"4567", b"89"]
+        assert threading.get_ident() not in source.threads
+        await client.close()
+
+    asyncio.run(scenario())
+
+
+def test_async_fs_upload_raises_other_first_write_errors_at_once() -> None:
+    async def scenario() -> None:
+        transport = _DelayedExecTransport(error={"code": -32603, "message": "stdin is closed"})
+        transport.responses["command/exec/terminate"] = {}
+        client = AsyncAppServerClient(transport)
+        await client.start()
+
+        with pytest.raises(AppServerRpcError, match="stdin is closed"):
+            await client.fs.upload(path="/repo/data.bin", source=b"0123456789", chunk_size=4)
+
+        writes = [m for m in transport.sent if m.get("method") == "command/exec/write"]
+        assert len(writes) == 1
+        await client.close()
+
+    asyncio.run(scenario())
+
+
+def test_async_fs_upload_exec_outlives_the_request_timeout() -> None:
+    async def scenario() -> None:
+        transport = _DelayedExecTransport(exit_delay=0.2)
+        client = AsyncAppServerClient(transport, AppServerInitializeOptions(request_timeout=0.05))
+        await client.start()
+
+        sent = await client.fs.upload(path="/repo/data.bin", source=b"0123456789", chunk_size=4)
+
+        assert sent == 10
+        await client.close()
+
+    asyncio.run(scenario())
+
+
+def test_async_fs_upload_streams_large_sources_in_bounded_chunks(tmp_path: Path) -> None:
+    source = tmp_path / "dataset.bin"
+    source.write_bytes(b"0123456789")
+
+    async def scenario() -> None:
+        transport, written = _upload_transport()
+        client = AsyncAppServerClient(transport)
+        await client.start()
+        progress: list[tuple[int, int | None]] = []
+
+        sent = await client.fs.upload(
+            path="/repo/data.bin",
+            source=source,
+            chunk_size=4,
+            progress=lambda done, total: progress.append((done, total)),
+        )
+
+        assert sent == 10
+        assert written == [b"0123", b"4567", b"89"]
+        assert progress == [(4, 10), (8, 10), (10, 10)]
+        methods = sorted(m["method"] for m in transport.sent if "id" in m)[:-1]
+        assert methods == ["command/exec"] + ["command/exec/write"] * 4
+        execute = next(m for m in transport.sent if m.get("method") == "command/exec")["params"]
+        assert execute["command"][-1] == "/repo/data.bin"
+        assert execute["streamStdin"] is True
+        assert transport.sent[-1]["params"] == {
+            "closeStdin": True,
+            "processId": execute["processId"],
+        }
+
+        async def pieces() -> AsyncIterator[bytes]:
+            for piece in (b"ab", b"cdefg", b"h"):
+                yield piece
+
+        written.clear()
+        assert await client.fs.upload(path="/repo/x", source=pieces(), chunk_size=3) == 8
+        assert written == [b"abc", b"def", b"gh"]
+        await client.close()
+
+    asyncio.run(scenario())
+
+
+def test_async_fs_upload_sends_small_sources_as_one_write_and_reports_exit_errors() -> None:
+    async def scenario() -> None:
+        transport, _ = _upload_transport(exit_code=1)
+        client = AsyncAppServerClient(transport)
+        await client.start()
+
+        assert await client.fs.upload(path="/repo/small", source=b"tiny") == 4
+        write = transport.sent[-1]
+        assert write["method"] == "fs/writeFile"
+        assert write["params"] == {"path": "/repo/small", "dataBase64": "dGlueQ=="}
+
+        with pytest.raises(AppServerError, match="exit code 1"):
+            await client.fs.upload(path="/repo/big", source=b"x" * 10, chunk_size=4)
+        await client.close()
+
+    asyncio.run(scenario())
+
+
+def test_sync_fs_upload_reads_file_objects() -> None:
+    loop = _LoopThread()
+    transport, written = _upload_transport()
+    async_client = AsyncAppServerClient(transport)
+    loop.run(async_client.start())
+    client = AppServerClient(async_client, loop)
+
+    try:
+        assert client.fs.upload(path="/repo/f", source=io.BytesIO(b"abcdef"), chunk_size=4) == 6
+        assert written == [b"abcd", b"ef"]
+    finally:
+        client.close()
+
+
+def test_async_fs_sync_tree_uploads_changed_files_and_skips_the_rest(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    local = tmp_path / "workspace"
+    (local / "src" / "pkg").mkdir(parents=True)
+    (local / "empty").mkdir()
+    (local / "README.md").write_text("hello")
+    (local / "src" / "pkg" / "a.py").write_text("a = 1\n")
+    (local / "src" / "pkg" / "b.py").write_text("b = 2\n")
+    manifest = tmp_path / "manifest.json"
+
+    async def scenario() -> None:
+        transport, _ = _upload_transport()
+        transport.responses["fs/createDirectory"] = {}
+        client = AsyncAppServerClient(transport)
+        await client.start()
+
+        def requests() -> list[tuple[str, str]]:
+            found = [
+                (m["method"], m["params"]["path"])
+                for m in transport.sent
+                if m.get("method") in ("fs/createDirectory", "fs/writeFile")
+            ]
+            transport.sent.clear()
+            return sorted(found)
+
+        result = await client.fs.sync_tree(
+            local_dir=local, remote_dir="/sandbox", manifest=manifest, concurrency=2
+        )
+        assert (result.files_written, result.files_skipped, result.directories_created) == (3, 0, 3)
+        assert result.bytes_written == 17
+        assert result.bytes_per_second > 0
+        assert requests() == [
+            ("fs/createDirectory", "/sandbox"),
+            ("fs/createDirectory", "/sandbox/empty"),
+            ("fs/createDirectory", "/sandbox/src/pkg"),
+            ("fs/writeFile", "/sandbox/README.md"),
+            ("fs/writeFile", "/sandbox/src/pkg/a.py"),
+            ("fs/writeFile", "/sandbox/src/pkg/b.py"),
+        ]
+
+        # Same content with a new mtime is rehashed and skipped; changed content is sent.
+        (local / "README.md").write_text("hello")
+        (local / "src" / "pkg" / "b.py").write_text("b = 3\n")
+        result = await client.fs.sync_tree(
+            local_dir=local, remote_dir="/sandbox", manifest=manifest
+        )
+        assert (result.files_written, result.files_skipped, result.directories_created) == (1, 2, 0)
+        assert requests() == [("fs/writeFile", "/sandbox/src/pkg/b.py")]
+
+        # A manifest recorded for another remote directory is ignored.
+        result = await client.fs.sync_tree(local_dir=local, remote_dir="/other", manifest=manifest)
+        assert result.files_written == 3
+
+        # Without a manifest every file is sent and none is hashed.
+        monkeypatch.setattr(_fs_sync, "_sha256", _unexpected_hash)
+        result = await client.fs.sync_tree(local_dir=local, remote_dir="/sandbox")
+        assert (result.files_written, result.files_skipped) == (3, 0)
+        await client.close()
+
+    asyncio.run(scenario())
+
+
+def _unexpected_hash(path: Path) -> str:
+    raise AssertionError(f"{path} was hashed")
@@ -1,8 +1,16 @@
 from __future__ import annotations
 
+import json
+
 import pytest
 from pydantic import BaseModel
 
+from codex.app_server._delta_events import (
+    AgentMessageDeltaEvent,
+    ReasoningTextDeltaEvent,
+    compact_delta_event,
+)
+from codex.app_server._incremental_json import IncrementalJsonParser
 from codex.app_server._payloads import normalize_input_item, normalize_turn_input, serialize_value
 from codex.app_server._protocol_helpers import (
     extract_item,
@@ -11,6 +19,7 @@ from codex.app_server._protocol_helpers import (
     extract_token_usage,
     extract_turn,
     extract_turn_id,
+    merge_delta_notifications,
     method_name,
     parse_notification,
     parse_result,
@@ -19,6 +28,7 @@ from codex.app_server._protocol_helpers import (
 )
 from codex.app_server.errors import AppServerProtocolError
 from codex.app_server.models import EmptyResult, GenericNotification, GenericServerRequest
+from codex.app_server.options import ProtocolValidationMode
 from codex.protocol import types as protocol
 
 
@@ -93,6 +103,24 @@ def test_parse_notification_rejects_malformed_known_methods_in_non_strict_mode()
         )
 
 
+def test_parse_notification_validates_directly_into_the_method_model() -> None:
+    parsed = parse_notification(
+        {
+            "method": "item/agentMessage/delta",
+            "params": {
+                "threadId": "thr-1",
+                "turnId": "turn-1",
+                "itemId": "item-1",
+                "delta": "hello",
+            },
+        },
+        strict=True,
+    )
+
+    assert isinstance(parsed, protocol.ItemAgentMessageDeltaNotification)
+    assert extract_text_delta(parsed) == "hello"
+
+
 def test_parse_server_request_allows_generic_unknown_methods_in_non_strict_mode() -> None:
     parsed = parse_server_request(
         {"id": "req-1", "method": "custom/request", "params": {"ok": True}},
@@ -224,3 +252,180 @@ def test_extract_helpers_read_item_deltas_and_usage() -> None:
     usage = extract_token_usage(usage_notification)
     assert usage is not None
     assert usage.total.totalTokens == 3
+
+
+def test_incremental_json_parser_emits_values_at_path_across_chunk_boundaries() -> None:
+    document = {
+        "records": [{"text": 'a,]}"\\b', "tags": ["x", {"y": None}]}, 2, "three", [], {}],
+        'k"ey': True,
+    }
+    text = json.dumps(document)
+
+    for size in (1, 2, 3, 7, len(text)):
+        parser = IncrementalJsonParser(("records", "*"))
+        values: list[object] = []
+        for start in range(0, len(text), size):
+            values.extend(parser.feed(text[start : start + size]))
+        assert values == document["records"]
+        assert parser.partial() == document
+
+    parser = IncrementalJsonParser(('k"ey',))
+    assert parser.feed(text) == [True]
+
+
+def test_incremental_json_parser_partial_closes_open_containers() -> None:
+    parser = IncrementalJsonParser()
+    assert parser.partial() is None
+
+    assert parser.feed('{"done": [1, 2], "name": "par') == [[1, 2]]
+    assert parser.partial() == {"done": [1, 2]}
+    assert parser.feed('tial", "count": 4') == ["partial"]
+    assert parser.partial() == {"done": [1, 2], "name": "partial"}
+    assert parser.feed("}") == [4]
+    assert parser.partial() == {"done": [1, 2], "name": "partial", "count": 4}
+
+
+def _item_heavy_thread() -> dict[str, object]:
+    items: list[dict[str, object]] = [
+        {"id": "msg-1", "type": "agentMessage", "phase": "final_answer", "text": "done"},
+        {
+            "id": "cmd-1",
+            "type": "commandExecution",
+            "command": "rg foo",
+            "commandActions": [
+                {"type": "search", "command": "rg foo", "query": "foo", "path": None},
+                {"type": "unknown", "command": "true"},
+            ],
+            "cwd": "/repo",
+            "status": "completed",
+            "aggregatedOutput": "foo.py:1",
+            "exitCode": 0,
+        },
+        {
+            "id": "patch-1",
+            "type": "fileChange",
+            "status": "completed",
+            "changes": [
+                {"path": "a.py", "diff": "+x", "kind": {"type": "add"}},
+                {"path": "b.py", "diff": "-y", "kind": {"type": "update", "move_path": "c.py"}},
+            ],
+        },
+    ]
+    return {
+        "id": "thr-1",
+        "sessionId": "session-1",
+        "preview": "",
+        "ephemeral": False,
+        "modelProvider": "openai",
+        "createdAt": 1730910000,
+        "updatedAt": 1730910000,
+        "cwd": "/repo",
+        "cliVersion": "1.0.0",
+        "source": "appServer",
+        "status": {"type": "idle"},
+        "turns": [{**_turn_payload(), "items": items}],
+    }
+
+
+@pytest.mark.parametrize("validation", ["lazy", "trusted"])
+def test_fast_validation_modes_build_the_same_models(validation: ProtocolValidationMode) -> None:
+    thread = _item_heavy_thread()
+    result = parse_result({"thread": thread}, protocol.ThreadReadResponse, validation=validation)
+    assert result == protocol.ThreadReadResponse.model_validate({"thread": thread})
+    assert result.model_dump(mode="json") == protocol.ThreadReadResponse.model_validate(
+        {"thread": thread}
+    ).model_dump(mode="json")
+
+    for item in result.thread.turns[0].items:
+        message = {
+            "method": "item/completed",
+            "params": {
+                "threadId": "thr-1",
+                "turnId": "turn-1",
+                "completedAtMs": 1,
+                "item": item.model_dump(mode="json", exclude_unset=True),
+            },
+        }
+        notification = parse_notification(message, strict=False, validation=validation)
+        assert notification == parse_notification(message, strict=False)
+        assert isinstance(notification, protocol.ItemCompletedNotificationModel)
+        assert type(notification.params.item.root) is type(item.root)
+
+
+def test_fast_validation_modes_still_reject_malformed_payloads() -> None:
+    message = {
+        "method": "item/completed",
+        "params": {
+            "threadId": "thr-1",
+            "turnId": "turn-1",
+            "completedAtMs": 1,
+            "item": {"id": "msg-1", "type": "agentMessage"},
+        },
+    }
+    for validation in ("lazy", "trusted"):
+        with pytest.raises(AppServerProtocolError):
+            parse_notification(message, strict=False, validation=validation)  # type: ignore[arg-type]
+        with pytest.raises(AppServerProtocolError):
+            parse_result(
+                {"thread": {"id": "thr-1"}},
+                protocol.ThreadReadResponse,
+                validation=validation,  # type: ignore[arg-type]
+            )
+
+
+@pytest.mark.parametrize(
+    ("method", "extra"),
+    [
+        ("item/agentMessage/delta", {}),
+        ("item/commandExecution/outputDelta", {}),
+        ("item/reasoning/textDelta", {"contentIndex": 2}),
+    ],
+)
+def test_compact_delta_events_convert_to_the_protocol_model(
+    method: str, extra: dict[str, object]
+) -> None:
+    message = {
+        "method": method,
+        "emittedAtMs": 1730910000000,
+        "params": {"threadId": "thr-1", "turnId": "turn-1", "itemId": "item-1", "delta": "hi"},
+    }
+    message["params"].update(extra)  # type: ignore[attr-defined]
+
+    event = compact_delta_event(message)
+
+    assert event is not None
+    assert event.method == method_name(event) == method
+    assert event.params.delta == "hi"
+    assert extract_thread_id(event) == "thr-1"
+    assert extract_turn_id(event) == "turn-1"
+    assert event.to_model() == parse_notification(message, strict=False)
+    with pytest.raises(AttributeError):
+        event.delta = "changed"  # type: ignore[misc]
+
+
+def test_compact_delta_events_leave_other_shapes_to_the_protocol_model() -> None:
+    params = {"threadId": "thr-1", "turnId": "turn-1", "itemId": "item-1", "delta": "hi"}
+
+    assert compact_delta_event({"method": "item/completed", "params": params}) is None
+    assert compact_delta_event({"method": "item/agentMessage/delta", "params": {}}) is None
+    assert (
+        compact_delta_event({"method": "item/agentMessage/delta", "params": {**params, "delta": 1}})
+        is None
+    )
+    # Reasoning deltas also need their content index.
+    assert compact_delta_event({"method": "item/reasoning/textDelta", "params": params}) is None
+
+
+def test_compact_delta_events_merge_consecutive_deltas_of_one_stream() -> None:
+    first = AgentMessageDeltaEvent("thr-1", "turn-1", "item-1", "Hel", None)
+    second = AgentMessageDeltaEvent("thr-1", "turn-1", "item-1", "lo", 5)
+
+    merged = merge_delta_notifications(first, second)
+
+    assert merged == AgentMessageDeltaEvent("thr-1", "turn-1", "item-1", "Hello", None)
+    assert extract_text_delta(first) == "Hel"
+    other_item = AgentMessageDeltaEvent("thr-1", "turn-1", "item-2", "!", None)
+    assert merge_delta_notifications(first, other_item) is None
+    reasoning = ReasoningTextDeltaEvent("thr-1", "turn-1", "item-1", "?", None, 0)
+    assert merge_delta_notifications(first, reasoning) is None
+    assert extract_text_delta(reasoning) is None
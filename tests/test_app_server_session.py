@@ -1,15 +1,31 @@
 from __future__ import annotations
 
 import asyncio
+import threading
 from collections.abc import Mapping
-from typing import Any
+from typing import Any, cast
 
 import pytest
 from pydantic import BaseModel
 
+from codex.app_server import (
+    DEFAULT_COALESCE_METHODS,
+    AgentMessageDeltaEvent,
+    AppServerCacheOptions,
+    AppServerCacheStats,
+    AppServerRequestStats,
+    _response_cache,
+    deadline,
+)
 from codex.app_server._session import _AsyncSession, _jsonrpc_error_from_exception
-from codex.app_server.errors import AppServerClosedError, AppServerProtocolError, AppServerRpcError
-from codex.app_server.options import AppServerInitializeOptions
+from codex.app_server.errors import (
+    AppServerClosedError,
+    AppServerConnectionError,
+    AppServerProtocolError,
+    AppServerRpcError,
+    AppServerTimeoutError,
+)
+from codex.app_server.options import AppServerInitializeOptions, AppServerReconnectOptions
 
 JsonObject = dict[str, Any]
 
@@ -44,6 +60,11 @@ class _FakeTransport:
         self._incoming.put_nowait(message)
 
 
+async def _dispatch_server_request(session: _AsyncSession, message: JsonObject) -> None:
+    session._dispatch_server_request(message)
+    await asyncio.gather(*session._request_tasks)
+
+
 def test_jsonrpc_error_from_exception_preserves_rpc_fields() -> None:
     error = _jsonrpc_error_from_exception(AppServerRpcError(123, "boom", {"detail": "bad"}))
 
@@ -96,13 +117,74 @@ def test_async_session_broadcast_routes_only_matching_notifications() -> None:
     asyncio.run(scenario())
 
 
+def test_async_session_delivers_compact_deltas_only_to_sinks_that_ask() -> None:
+    async def scenario() -> None:
+        session = _AsyncSession(
+            _FakeTransport(),
+            AppServerInitializeOptions(compact_deltas=True),
+        )
+        compact = session.subscribe_notifications(["item/agentMessage/delta"])
+        full = session.subscribe_notifications(["item/agentMessage/delta"], compact_deltas=False)
+        message = {
+            "method": "item/agentMessage/delta",
+            "params": {"threadId": "thr-1", "turnId": "turn-1", "itemId": "item-1", "delta": "hi"},
+        }
+
+        await session._broadcast_notification(message)
+
+        event = await compact.next()
+        assert isinstance(event, AgentMessageDeltaEvent)
+        assert event.to_model() == await full.next()
+
+        # Payloads the compact form cannot hold are still validated as protocol models.
+        with pytest.raises(AppServerProtocolError):
+            await session._broadcast_notification({**message, "params": {}})
+
+        await compact.close()
+        await full.close()
+
+    asyncio.run(scenario())
+
+
+def test_async_session_broadcast_skips_parsing_when_no_sink_wants_the_method() -> None:
+    async def scenario() -> None:
+        session = _AsyncSession(
+            _FakeTransport(),
+            AppServerInitializeOptions(strict_protocol=False),
+        )
+        subscription = session.subscribe_notifications(["custom/notify"])
+
+        # Malformed, but nobody subscribed to it, so it is never validated.
+        await session._broadcast_notification({"method": "turn/completed", "params": {}})
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(subscription.next(), timeout=0.01)
+
+        await subscription.close()
+
+    asyncio.run(scenario())
+
+
+def test_async_session_broadcast_still_validates_unwanted_methods_in_strict_mode() -> None:
+    async def scenario() -> None:
+        session = _AsyncSession(
+            _FakeTransport(),
+            AppServerInitializeOptions(strict_protocol=True),
+        )
+
+        with pytest.raises(AppServerProtocolError, match="turn/completed"):
+            await session._broadcast_notification({"method": "turn/completed", "params": {}})
+
+    asyncio.run(scenario())
+
+
 def test_async_session_server_request_without_handler_returns_method_not_found() -> None:
     async def scenario() -> None:
         transport = _FakeTransport()
         session = _AsyncSession(transport, AppServerInitializeOptions(strict_protocol=False))
 
-        await session._handle_server_request(
-            {"id": "req-1", "method": "custom/request", "params": {"ok": True}}
+        await _dispatch_server_request(
+            session, {"id": "req-1", "method": "custom/request", "params": {"ok": True}}
         )
 
         assert transport.sent == [
@@ -126,8 +208,8 @@ def test_async_session_server_request_handler_failure_returns_structured_error()
             "custom/request", lambda request: (_ for _ in ()).throw(ValueError("boom"))
         )
 
-        await session._handle_server_request(
-            {"id": "req-1", "method": "custom/request", "params": {"ok": True}}
+        await _dispatch_server_request(
+            session, {"id": "req-1", "method": "custom/request", "params": {"ok": True}}
         )
 
         assert transport.sent == [
@@ -153,8 +235,13 @@ def test_async_session_start_rejects_after_close() -> None:
         transport = _FakeTransport()
         session = _AsyncSession(transport)
 
+        assert session.startup_timings is None
         result = await session.start()
         assert result.user_agent == "test-client"
+        timings = session.startup_timings
+        assert timings is not None
+        assert timings.transport_seconds >= 0
+        assert timings.initialize_seconds >= 0
 
         await session.close()
 
@@ -245,7 +332,8 @@ def test_async_session_request_model_adaptation_wraps_protocol_errors() -> None:
 
         session.on_request("item/tool/call", lambda request: request, request_model=_WrongRequest)
 
-        await session._handle_server_request(
+        await _dispatch_server_request(
+            session,
             {
                 "id": "req-1",
                 "method": "item/tool/call",
@@ -256,7 +344,7 @@ def test_async_session_request_model_adaptation_wraps_protocol_errors() -> None:
                     "tool": "lookup_ticket",
                     "arguments": {"id": "123"},
                 },
-            }
+            },
         )
 
         assert transport.sent[-1] == {
@@ -275,3 +363,724 @@ def test_async_session_request_model_adaptation_wraps_protocol_errors() -> None:
         await session.close()
 
     asyncio.run(scenario())
+
+
+def test_async_session_slow_request_handler_does_not_stall_the_reader() -> None:
+    async def scenario() -> None:
+        transport = _FakeTransport()
+        session = _AsyncSession(transport, AppServerInitializeOptions(strict_protocol=False))
+        await session.start()
+        release = asyncio.Event()
+
+        async def slow_handler(request: BaseModel) -> dict[str, object]:
+            _ = request
+            await release.wait()
+            return {"ok": True}
+
+        session.on_request("custom/request", slow_handler)
+        subscription = session.subscribe_notifications(["custom/notify"])
+
+        transport.push({"id": "req-1", "method": "custom/request", "params": {}})
+        transport.push({"method": "custom/notify", "params": {"value": 1}})
+
+        event = await asyncio.wait_for(subscription.next(), timeout=1)
+        assert event.method == "custom/notify"
+        assert {"id": "req-1", "result": {"ok": True}} not in transport.sent
+
+        release.set()
+        for _ in range(10):
+            await asyncio.sleep(0)
+        assert {"id": "req-1", "result": {"ok": True}} in transport.sent
+
+        await subscription.close()
+        await session.close()
+
+    asyncio.run(scenario())
+
+
+def test_async_session_limits_concurrent_handlers_per_method() -> None:
+    async def scenario() -> None:
+        transport = _FakeTransport()
+        session = _AsyncSession(
+            transport,
+            AppServerInitializeOptions(server_request_concurrency={"custom/request": 1}),
+        )
+        await session.start()
+        active = 0
+        peak = 0
+
+        async def handler(request: BaseModel) -> None:
+            nonlocal active, peak
+            _ = request
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+        session.on_request("custom/request", handler)
+        for index in range(3):
+            transport.push({"id": f"req-{index}", "method": "custom/request", "params": {}})
+
+        for _ in range(100):
+            if sum(1 for message in transport.sent if "result" in message) == 3:
+                break
+            await asyncio.sleep(0.01)
+
+        assert peak == 1
+        assert [message["id"] for message in transport.sent if "result" in message] == [
+            "req-0",
+            "req-1",
+            "req-2",
+        ]
+        await session.close()
+
+    asyncio.run(scenario())
+
+
+def test_async_session_runs_sync_handlers_off_the_event_loop_thread() -> None:
+    async def scenario() -> None:
+        transport = _FakeTransport()
+        session = _AsyncSession(transport)
+        loop_thread = threading.current_thread()
+        handler_threads: list[threading.Thread] = []
+
+        def handler(request: BaseModel) -> dict[str, object]:
+            _ = request
+            handler_threads.append(threading.current_thread())
+            return {"ok": True}
+
+        session.on_request("custom/request", handler)
+        await _dispatch_server_request(session, {"id": "req-1", "method": "custom/request"})
+
+        assert transport.sent == [{"id": "req-1", "result": {"ok": True}}]
+        assert handler_threads and handler_threads[0] is not loop_thread
+        await session.close()
+
+    asyncio.run(scenario())
+
+
+def test_async_session_close_cancels_in_flight_request_handlers() -> None:
+    async def scenario() -> None:
+        transport = _FakeTransport()
+        session = _AsyncSession(transport)
+        await session.start()
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def handler(request: BaseModel) -> None:
+            _ = request
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        session.on_request("custom/request", handler)
+        transport.push({"id": "req-1", "method": "custom/request", "params": {}})
+        await asyncio.wait_for(started.wait(), timeout=1)
+
+        await session.close()
+
+        assert cancelled.is_set()
+        assert session._request_tasks == set()
+
+    asyncio.run(scenario())
+
+
+def _agent_delta(delta: str, item_id: str = "item-1") -> JsonObject:
+    return {
+        "method": "item/agentMessage/delta",
+        "params": {"threadId": "thr-1", "turnId": "turn-1", "itemId": item_id, "delta": delta},
+    }
+
+
+async def _drain(subscription: Any) -> list[Any]:
+    events = []
+    while not subscription.queue.empty():
+        events.append(await subscription.next())
+    return events
+
+
+def test_async_session_bounded_subscription_drop_policies() -> None:
+    async def scenario() -> None:
+        session = _AsyncSession(_FakeTransport())
+        oldest = session.subscribe_notifications(maxsize=2, overflow="drop_oldest")
+        newest = session.subscribe_notifications(maxsize=2, overflow="drop_newest")
+
+        for delta in ["a", "b", "c"]:
+            await session._broadcast_notification(_agent_delta(delta))
+
+        assert [event.params.delta for event in await _drain(oldest)] == ["b", "c"]
+        assert [event.params.delta for event in await _drain(newest)] == ["a", "b"]
+        assert (oldest.dropped, newest.dropped) == (1, 1)
+
+    asyncio.run(scenario())
+
+
+def test_async_session_bounded_subscription_coalesces_consecutive_deltas() -> None:
+    async def scenario() -> None:
+        session = _AsyncSession(_FakeTransport())
+        subscription = session.subscribe_notifications(maxsize=2, overflow="coalesce")
+
+        for delta, item_id in [("a", "item-1"), ("b", "item-2"), ("c", "item-2"), ("d", "item-3")]:
+            await session._broadcast_notification(_agent_delta(delta, item_id))
+
+        events = await _drain(subscription)
+        assert [(event.params.itemId, event.params.delta) for event in events] == [
+            ("item-2", "bc"),
+            ("item-3", "d"),
+        ]
+        assert (subscription.coalesced, subscription.dropped) == (1, 1)
+
+    asyncio.run(scenario())
+
+
+def test_async_session_blocking_subscription_is_released_by_close() -> None:
+    async def scenario() -> None:
+        session = _AsyncSession(_FakeTransport())
+        subscription = session.subscribe_notifications(maxsize=1)
+
+        await session._broadcast_notification(_agent_delta("a"))
+        blocked = asyncio.create_task(session._broadcast_notification(_agent_delta("b")))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+
+        await subscription.close()
+        await asyncio.wait_for(blocked, timeout=1)
+
+        with pytest.raises(StopAsyncIteration):
+            await subscription.next()
+
+    asyncio.run(scenario())
+
+
+def test_async_session_bounded_turn_stream_never_drops_terminal_notifications() -> None:
+    async def scenario() -> None:
+        session = _AsyncSession(_FakeTransport())
+        subscription = session.subscribe_notifications(
+            maxsize=1, overflow="drop_newest", scope=("thr-1", "turn-1")
+        )
+
+        await session._broadcast_notification(_agent_delta("a"))
+        await session._broadcast_notification(
+            {
+                "method": "turn/completed",
+                "params": {
+                    "threadId": "thr-1",
+                    "turn": {"id": "turn-1", "items": [], "status": "completed"},
+                },
+            }
+        )
+        await session._broadcast_notification(_agent_delta("b"))
+
+        events = await _drain(subscription)
+        assert [event.method.root for event in events] == [
+            "item/agentMessage/delta",
+            "turn/completed",
+        ]
+        assert subscription.dropped == 1
+
+    asyncio.run(scenario())
+
+
+def test_async_session_bounded_subscription_bounds_every_notification() -> None:
+    def item_started(index: int) -> JsonObject:
+        return {
+            "method": "item/started",
+            "params": {
+                "threadId": "thr-1",
+                "turnId": "turn-1",
+                "startedAtMs": 1_714_000_000_000,
+                "item": {"id": f"item-{index}", "type": "agentMessage", "text": ""},
+            },
+        }
+
+    async def scenario() -> None:
+        session = _AsyncSession(_FakeTransport())
+        subscriptions = {
+            policy: session.subscribe_notifications(maxsize=10, overflow=policy)
+            for policy in ("drop_oldest", "drop_newest", "coalesce")
+        }
+        turn = session.subscribe_notifications(
+            maxsize=10, overflow="drop_newest", scope=("thr-1", "turn-1")
+        )
+
+        for index in range(1000):
+            await session._broadcast_notification(item_started(index))
+        await session._broadcast_notification(_turn_completed("thr-1", "turn-1"))
+
+        for policy, subscription in subscriptions.items():
+            assert subscription.queue.qsize() == 10, policy
+            assert subscription.dropped == 991, policy
+        newest = await _drain(subscriptions["drop_newest"])
+        assert [event.params.item.root.id for event in newest] == [f"item-{i}" for i in range(10)]
+        oldest = await _drain(subscriptions["drop_oldest"])
+        assert [event.params.item.root.id for event in oldest[:-1]] == [
+            f"item-{i}" for i in range(991, 1000)
+        ]
+        assert oldest[-1].method.root == "turn/completed"
+        events = await _drain(turn)
+        assert len(events) == 11
+        assert events[-1].method.root == "turn/completed"
+        assert turn.dropped == 990
+
+    asyncio.run(scenario())
+
+
+def _turn_completed(thread_id: str, turn_id: str) -> JsonObject:
+    return {
+        "method": "turn/completed",
+        "params": {
+            "threadId": thread_id,
+            "turn": {"id": turn_id, "items": [], "status": "completed"},
+        },
+    }
+
+
+def test_async_session_routes_scoped_subscriptions_by_thread_and_turn() -> None:
+    async def scenario() -> None:
+        session = _AsyncSession(_FakeTransport())
+        methods = {"turn/completed", "thread/tokenUsage/updated"}
+        turn = session.subscribe_notifications(methods, scope=("thr-1", "turn-1"))
+        thread = session.subscribe_notifications(methods, scope=("thr-1", None))
+        usage_totals = {
+            "inputTokens": 1,
+            "cachedInputTokens": 0,
+            "outputTokens": 2,
+            "reasoningOutputTokens": 0,
+            "totalTokens": 3,
+        }
+
+        await session._broadcast_notification(_turn_completed("thr-1", "turn-1"))
+        await session._broadcast_notification(_turn_completed("thr-1", "turn-2"))
+        await session._broadcast_notification(_turn_completed("thr-2", "turn-1"))
+        await session._broadcast_notification(
+            {
+                "method": "thread/tokenUsage/updated",
+                "params": {
+                    "threadId": "thr-1",
+                    "turnId": "turn-other",
+                    "tokenUsage": {"last": usage_totals, "total": usage_totals},
+                },
+            }
+        )
+
+        turn_events = await _drain(turn)
+        thread_events = await _drain(thread)
+        assert [event.method.root for event in turn_events] == [
+            "turn/completed",
+            "thread/tokenUsage/updated",
+        ]
+        assert turn_events[0].params.turn.id == "turn-1"
+        assert [getattr(event.params, "turnId", None) for event in thread_events] == [
+            None,
+            None,
+            "turn-other",
+        ]
+
+    asyncio.run(scenario())
+
+
+def test_async_session_update_scope_reindexes_and_clears_predicate() -> None:
+    async def scenario() -> None:
+        session = _AsyncSession(_FakeTransport())
+        subscription = session.subscribe_notifications(
+            {"turn/completed"},
+            predicate=lambda notification: False,
+        )
+
+        await session._broadcast_notification(_turn_completed("thr-1", "turn-1"))
+        subscription.update_scope("thr-1", "turn-1")
+        await session._broadcast_notification(_turn_completed("thr-2", "turn-1"))
+        await session._broadcast_notification(_turn_completed("thr-1", "turn-1"))
+
+        events = await _drain(subscription)
+        assert [event.params.threadId for event in events] == ["thr-1"]
+
+        await subscription.close()
+        assert len(session._router) == 0
+        assert session._router.route(_turn_completed("thr-1", "turn-1")) == []
+
+    asyncio.run(scenario())
+
+
+class _DroppingTransport(_FakeTransport):
+    """Fake websocket-like transport that can drop and be reopened by `start()`."""
+
+    def __init__(self, results: Mapping[str, object], *, fail_starts: int = 0) -> None:
+        super().__init__()
+        self.results = dict(results)
+        self.starts = 0
+        self.fail_starts = fail_starts
+
+    async def start(self) -> None:
+        self.starts += 1
+        if self.starts > 1 and self.fail_starts:
+            self.fail_starts -= 1
+            raise AppServerConnectionError("connection refused")
+        self.started = True
+
+    async def send(self, message: JsonObject) -> None:
+        await super().send(message)
+        method = message.get("method")
+        if "id" in message and isinstance(method, str) and method in self.results:
+            self.push({"id": message["id"], "result": self.results[method]})
+
+    async def receive(self) -> JsonObject | None:
+        message = await self._incoming.get()
+        if isinstance(message, Exception):
+            raise message
+        return message
+
+    async def close(self) -> None:
+        self.closed = True
+
+    def drop(self) -> None:
+        self._incoming.put_nowait(AppServerConnectionError("websocket receive failed"))  # type: ignore[arg-type]
+
+
+_NO_BACKOFF = AppServerReconnectOptions(initial_backoff=0, max_attempts=2)
+
+
+def test_async_session_reconnect_resumes_threads_and_replays_idempotent_requests() -> None:
+    async def scenario() -> None:
+        transport = _DroppingTransport(
+            {"thread/start": {"thread": {"id": "thr-1"}}, "thread/resume": {}}
+        )
+        session = _AsyncSession(transport, reconnect=_NO_BACKOFF)
+        await session.start()
+        await session.request("thread/start", {})
+
+        read = asyncio.create_task(session.request("thread/read", {"threadId": "thr-1"}))
+        steer = asyncio.create_task(session.request("turn/steer", {"threadId": "thr-1"}))
+        await asyncio.sleep(0)
+        read_id = transport.sent[-2]["id"]
+        transport.sent.clear()
+        transport.drop()
+
+        with pytest.raises(AppServerConnectionError, match="websocket receive failed"):
+            await steer
+        while len(transport.sent) < 4:
+            await asyncio.sleep(0)
+        assert [message.get("method") for message in transport.sent] == [
+            "initialize",
+            "initialized",
+            "thread/resume",
+            "thread/read",
+        ]
+        assert transport.sent[2]["params"] == {"threadId": "thr-1", "excludeTurns": True}
+        assert transport.sent[3]["id"] == read_id
+        transport.push({"id": read_id, "result": {"thread": {"id": "thr-1"}}})
+        assert await read == {"thread": {"id": "thr-1"}}
+        assert transport.starts == 2
+        assert session.reconnects == 1
+        assert session.connected
+
+        await session.close()
+
+    asyncio.run(scenario())
+
+
+def test_async_session_reconnect_catches_turn_streams_up_from_turn_list() -> None:
+    async def scenario() -> None:
+        turn = {
+            "id": "turn-1",
+            "status": "completed",
+            "items": [{"id": "msg-1", "type": "agentMessage", "text": "done"}],
+        }
+        transport = _DroppingTransport({"thread/resume": {}, "thread/turns/list": {"data": [turn]}})
+        session = _AsyncSession(transport, reconnect=_NO_BACKOFF)
+        await session.start()
+        subscription = session.subscribe_notifications(
+            {"item/completed", "turn/completed"}, scope=("thr-1", "turn-1")
+        )
+
+        transport.drop()
+
+        item = await asyncio.wait_for(subscription.next(), timeout=1)
+        completed = await asyncio.wait_for(subscription.next(), timeout=1)
+        assert item.params.item.root.text == "done"
+        assert completed.params.turn.status.root == "completed"
+        list_request = next(m for m in transport.sent if m.get("method") == "thread/turns/list")
+        assert list_request["params"]["threadId"] == "thr-1"
+
+        await subscription.close()
+        await session.close()
+
+    asyncio.run(scenario())
+
+
+def test_async_session_reconnect_gives_up_after_max_attempts() -> None:
+    async def scenario() -> None:
+        transport = _DroppingTransport({}, fail_starts=2)
+        session = _AsyncSession(transport, reconnect=_NO_BACKOFF)
+        await session.start()
+        read = asyncio.create_task(session.request("thread/read", {"threadId": "thr-1"}))
+        subscription = session.subscribe_notifications({"turn/completed"})
+        await asyncio.sleep(0)
+
+        transport.drop()
+
+        with pytest.raises(AppServerConnectionError, match="websocket receive failed") as exc_info:
+            await read
+        assert "Reconnecting failed after 2 attempts" in str(exc_info.value.__notes__)
+        with pytest.raises(AppServerConnectionError):
+            await subscription.next()
+        with pytest.raises(AppServerConnectionError):
+            await session.request("thread/list", {})
+
+    asyncio.run(scenario())
+
+
+def test_async_session_request_timeout_drops_pending_entry_and_notifies_cancel() -> None:
+    async def scenario() -> None:
+        transport = _FakeTransport()
+        session = _AsyncSession(
+            transport,
+            AppServerInitializeOptions(cancel_request_method="$/cancelRequest"),
+        )
+        await session.start()
+
+        with pytest.raises(AppServerTimeoutError, match="'model/list' timed out") as exc_info:
+            await session.request("model/list", {}, timeout=0.01)
+        assert isinstance(exc_info.value, TimeoutError)
+        request = next(m for m in transport.sent if m.get("method") == "model/list")
+        await asyncio.sleep(0)
+        assert transport.sent[-1] == {"method": "$/cancelRequest", "params": {"id": request["id"]}}
+        assert session._pending == {}
+
+        # A late response for the abandoned request is ignored.
+        transport.push({"id": request["id"], "result": {"data": []}})
+        await asyncio.sleep(0)
+        assert session.request_stats == AppServerRequestStats(
+            sent=2, failed=0, timed_out=1, pending=0
+        )
+
+        await session.close()
+
+    asyncio.run(scenario())
+
+
+def test_async_session_deadline_caps_default_and_nested_timeouts() -> None:
+    async def scenario() -> None:
+        transport = _FakeTransport()
+        session = _AsyncSession(transport, AppServerInitializeOptions(request_timeout=30))
+        await session.start()
+
+        with deadline(10):
+            with deadline(0.01):
+                with pytest.raises(AppServerTimeoutError) as exc_info:
+                    await session.request("thread/list", {})
+            assert exc_info.value.timeout <= 0.01
+            # Tasks started inside a deadline inherit it.
+            with deadline(0.01):
+                task = asyncio.create_task(session.request("model/list", {}))
+            with pytest.raises(AppServerTimeoutError):
+                await task
+        with deadline(0):
+            with pytest.raises(AppServerTimeoutError):
+                await session.request("config/read", {})
+        assert "config/read" not in [m.get("method") for m in transport.sent]
+        assert session.request_stats.timed_out == 3
+
+        await session.close()
+
+    asyncio.run(scenario())
+
+
+class _CountingTransport(_FakeTransport):
+    """Answers every request right away with how many times its method was called."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls: dict[str, int] = {}
+
+    async def send(self, message: JsonObject) -> None:
+        await super().send(message)
+        method = message.get("method")
+        if "id" in message and method != "initialize":
+            count = self.calls[method] = self.calls.get(method, 0) + 1
+            self.push({"id": message["id"], "result": {"data": [count]}})
+
+
+def test_async_session_cache_serves_repeats_and_invalidates_on_writes_and_notifications() -> None:
+    async def scenario() -> None:
+        transport = _CountingTransport()
+        session = _AsyncSession(
+            transport, AppServerInitializeOptions(cache=AppServerCacheOptions())
+        )
+        await session.start()
+
+        first = await session.request("skills/list", {"cwds": ["/repo"]})
+        assert first == {"data": [1]}
+        cast(dict[str, Any], first)["data"].append("mutated")
+        assert await session.request("skills/list", {"cwds": ["/repo"]}) == {"data": [1]}
+        assert await session.request("skills/list", {"cwds": ["/other"]}) == {"data": [2]}
+        # Uncached methods always go to the server.
+        await session.request("thread/list", {})
+        await session.request("thread/list", {})
+        assert transport.calls["thread/list"] == 2
+
+        # forceReload refreshes the entry ordinary requests read.
+        reloaded = {"cwds": ["/repo"], "forceReload": True}
+        assert await session.request("skills/list", reloaded) == {"data": [3]}
+        assert await session.request("skills/list", {"cwds": ["/repo"]}) == {"data": [3]}
+
+        await session.request("config/read", {})
+        await session.request("skills/config/write", {"path": "/s", "enabled": False})
+        assert await session.request("skills/list", {"cwds": ["/repo"]}) == {"data": [4]}
+        assert await session.request("config/read", {}) == {"data": [1]}
+
+        await session.request("config/value/write", {"keyPath": "model", "value": "x"})
+        assert await session.request("config/read", {}) == {"data": [2]}
+        assert await session.request("skills/list", {"cwds": ["/repo"]}) == {"data": [5]}
+
+        transport.push({"method": "skills/changed", "params": {}})
+        await asyncio.sleep(0)
+        assert await session.request("skills/list", {"cwds": ["/repo"]}) == {"data": [6]}
+
+        assert session.cache_stats == AppServerCacheStats(
+            hits=3, misses=8, evictions=0, invalidations=5, size=2
+        )
+        assert session.invalidate_cache(["config/read"]) == 1
+        await session.close()
+
+    asyncio.run(scenario())
+
+
+def test_async_session_cache_expires_entries_and_evicts_least_recently_used(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    now = [100.0]
+    monkeypatch.setattr(_response_cache.time, "monotonic", lambda: now[0])
+
+    async def scenario() -> None:
+        transport = _CountingTransport()
+        options = AppServerCacheOptions(ttl={"model/list": 10, "app/list": 60}, maxsize=2)
+        session = _AsyncSession(transport, AppServerInitializeOptions(cache=options))
+        await session.start()
+
+        await session.request("model/list", {})
+        now[0] += 9
+        assert await session.request("model/list", {}) == {"data": [1]}
+        now[0] += 1
+        assert await session.request("model/list", {}) == {"data": [2]}
+
+        await session.request("app/list", {"limit": 1})
+        await session.request("model/list", {})
+        await session.request("app/list", {"limit": 2})
+        # model/list was used more recently, so the first app/list page was evicted.
+        assert await session.request("model/list", {}) == {"data": [2]}
+        assert await session.request("app/list", {"limit": 1}) == {"data": [3]}
+        stats = session.cache_stats
+        assert stats is not None and stats.evictions == 2 and stats.size == 2
+
+        await session.close()
+
+    asyncio.run(scenario())
+
+
+def test_async_session_cache_skips_storing_reads_that_overlap_a_write() -> None:
+    async def scenario() -> None:
+        transport = _FakeTransport()
+        session = _AsyncSession(
+            transport, AppServerInitializeOptions(cache=AppServerCacheOptions())
+        )
+        await session.start()
+
+        read = asyncio.create_task(session.request("config/read", {}))
+        write = asyncio.create_task(session.request("config/batchWrite", {"edits": []}))
+        await asyncio.sleep(0)
+        read_id, write_id = (m["id"] for m in transport.sent[-2:])
+        transport.push({"id": write_id, "result": {}})
+        transport.push({"id": read_id, "result": {"config": "old"}})
+        await asyncio.gather(read, write)
+
+        assert session.cache_stats is not None and session.cache_stats.size == 0
+        await session.close()
+
+    asyncio.run(scenario())
+
+
+async def _settle() -> None:
+    # Shared requests are sent from their own task, a few loop iterations after the call.
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_async_session_coalesces_identical_concurrent_reads() -> None:
+    async def scenario() -> None:
+        transport = _FakeTransport()
+        session = _AsyncSession(
+            transport,
+            AppServerInitializeOptions(coalesce_methods=frozenset({"model/list"})),
+        )
+        await session.start()
+
+        calls = [
+            asyncio.create_task(session.request("model/list", {"limit": 5})) for _ in range(20)
+        ]
+        other = asyncio.create_task(session.request("model/list", {"limit": 6}))
+        await _settle()
+        sent = [m for m in transport.sent if m.get("method") == "model/list"]
+        assert [m["params"] for m in sent] == [{"limit": 5}, {"limit": 6}]
+
+        # A write in between starts a fresh flight for reads made after it.
+        write = asyncio.create_task(session.request("config/value/write", {}))
+        late = asyncio.create_task(session.request("model/list", {"limit": 5}))
+        await _settle()
+        assert len([m for m in transport.sent if m.get("method") == "model/list"]) == 3
+
+        for message in transport.sent[1:]:
+            if "id" in message:
+                transport.push({"id": message["id"], "result": {"data": [message["id"]]}})
+        results = await asyncio.gather(*calls)
+        await asyncio.gather(other, write, late)
+
+        assert all(result == results[0] for result in results)
+        assert len({id(result) for result in results}) == 20
+        assert late.result() != results[0]
+        assert session.request_stats == AppServerRequestStats(
+            sent=5, failed=0, timed_out=0, pending=0, coalesced=19
+        )
+        await session.close()
+
+    asyncio.run(scenario())
+
+
+def test_async_session_coalesced_request_outlives_callers_until_all_give_up() -> None:
+    async def scenario() -> None:
+        transport = _FakeTransport()
+        session = _AsyncSession(
+            transport,
+            AppServerInitializeOptions(
+                coalesce_methods=DEFAULT_COALESCE_METHODS,
+                cancel_request_method="$/cancelRequest",
+            ),
+        )
+        await session.start()
+
+        impatient = asyncio.create_task(session.request("thread/read", {}, timeout=0.01))
+        patient = asyncio.create_task(session.request("thread/read", {}))
+        with pytest.raises(AppServerTimeoutError):
+            await impatient
+        request = transport.sent[-1]
+        transport.push({"id": request["id"], "result": {"thread": "t"}})
+        assert await patient == {"thread": "t"}
+
+        first = asyncio.create_task(session.request("thread/read", {}))
+        second = asyncio.create_task(session.request("thread/read", {}))
+        await _settle()
+        first.cancel()
+        await _settle()
+        assert session._pending != {}
+        second.cancel()
+        await asyncio.gather(first, second, return_exceptions=True)
+        await _settle()
+        assert session._pending == {}
+        assert transport.sent[-1]["method"] == "$/cancelRequest"
+
+        await session.close()
+
+    asyncio.run(scenario())
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import asyncio
+import logging
 import sys
 from typing import Any
 
 import pytest
 
 from codex._binary import BundledAppServerNotFoundError
+from codex.app_server._json_codec import StdlibJsonCodec, resolve_json_codec
 from codex.app_server.errors import (
     AppServerClosedError,
     AppServerConnectionError,
@@ -27,11 +29,19 @@ class _FakeStreamWriter:
         self.buffer = bytearray()
         self.closed = False
         self.raise_on_drain: Exception | None = None
+        self.writes: list[list[bytes]] = []
+        self.drain_calls = 0
 
     def write(self, data: bytes) -> None:
         self.buffer.extend(data)
 
+    def writelines(self, data: list[bytes]) -> None:
+        self.writes.append(list(data))
+        for chunk in data:
+            self.buffer.extend(chunk)
+
     async def drain(self) -> None:
+        self.drain_calls += 1
         if self.raise_on_drain is not None:
             raise self.raise_on_drain
 
@@ -43,6 +53,7 @@ class _FakeStreamReader:
     def __init__(self, chunks: list[bytes]) -> None:
         self._chunks = chunks[:]
         self.raise_on_readline: Exception | None = None
+        self.read_sizes: list[int] = []
 
     async def readline(self) -> bytes:
         if self.raise_on_readline is not None:
@@ -51,6 +62,12 @@ class _FakeStreamReader:
             return self._chunks.pop(0)
         return b""
 
+    async def read(self, n: int) -> bytes:
+        self.read_sizes.append(n)
+        if self._chunks:
+            return self._chunks.pop(0)
+        return b""
+
 
 class _FakeProcess:
     def __init__(
@@ -87,11 +104,13 @@ class _FakeProcess:
 class _FakeWebSocketConnection:
     def __init__(self, recv_values: list[object] | None = None) -> None:
         self.recv_values = (recv_values or [])[:]
-        self.sent: list[str] = []
+        self.sent: list[str | bytes] = []
+        self.sent_as_text: list[bool | None] = []
         self.closed = False
 
-    async def send(self, payload: str) -> None:
+    async def send(self, payload: str | bytes, text: bool | None = None) -> None:
         self.sent.append(payload)
+        self.sent_as_text.append(text)
 
     async def recv(self) -> object:
         if not self.recv_values:
@@ -297,6 +316,51 @@ def test_stdio_transport_send_and_receive_round_trip() -> None:
     asyncio.run(scenario())
 
 
+def test_stdio_transport_coalesces_sends_from_one_loop_iteration() -> None:
+    async def scenario() -> None:
+        stdin = _FakeStreamWriter()
+        transport = AsyncStdioTransport()
+        transport._process = _FakeProcess(
+            stdin=stdin,
+            stdout=_FakeStreamReader([]),
+            stderr=_FakeStreamReader([]),
+        )
+
+        await asyncio.gather(*(transport.send({"id": index}) for index in range(3)))
+        await transport.send({"id": 3})
+
+        assert stdin.writes == [
+            [b'{"id":0}\n', b'{"id":1}\n', b'{"id":2}\n'],
+            [b'{"id":3}\n'],
+        ]
+        assert stdin.drain_calls == 2
+        stats = transport.send_stats
+        assert (stats.queued, stats.peak_queued, stats.messages, stats.batches) == (0, 3, 4, 2)
+
+    asyncio.run(scenario())
+
+
+def test_stdio_transport_cancelled_sender_does_not_fail_its_batch() -> None:
+    async def scenario() -> None:
+        stdin = _FakeStreamWriter()
+        transport = AsyncStdioTransport()
+        transport._process = _FakeProcess(
+            stdin=stdin,
+            stdout=_FakeStreamReader([]),
+            stderr=_FakeStreamReader([]),
+        )
+
+        cancelled = asyncio.create_task(transport.send({"id": 0}))
+        kept = asyncio.create_task(transport.send({"id": 1}))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await kept
+
+        assert stdin.writes == [[b'{"id":0}\n', b'{"id":1}\n']]
+
+    asyncio.run(scenario())
+
+
 def test_stdio_transport_send_raises_when_closed() -> None:
     async def scenario() -> None:
         transport = AsyncStdioTransport()
@@ -338,25 +402,46 @@ def test_stdio_transport_receive_raises_for_invalid_json() -> None:
     asyncio.run(scenario())
 
 
-def test_stdio_transport_receive_wraps_overlong_line_errors() -> None:
+def test_stdio_transport_receive_enforces_configured_message_limit() -> None:
     async def scenario() -> None:
-        stdout = _FakeStreamReader([])
-        stdout.raise_on_readline = ValueError("Separator is not found, and chunk exceed the limit")
-        transport = AsyncStdioTransport()
+        transport = AsyncStdioTransport(AppServerProcessOptions(max_message_bytes=16))
         transport._process = _FakeProcess(
             stdin=_FakeStreamWriter(),
-            stdout=stdout,
+            stdout=_FakeStreamReader([b'{"method":"ok"}\n{"method":', b'"far-too-long"}\n']),
             stderr=_FakeStreamReader([]),
         )
+        assert await transport.receive() == {"method": "ok"}
         with pytest.raises(
             AppServerProtocolError,
-            match=r"stdout line exceeded configured limit of 4194304 bytes",
+            match=r"stdout line exceeded configured limit of 16 bytes",
         ):
             await transport.receive()
 
     asyncio.run(scenario())
 
 
+def test_stdio_transport_receive_reassembles_messages_across_reads() -> None:
+    async def scenario() -> None:
+        output = "x" * (5 * 1024 * 1024)
+        payload = ('{"method":"item/completed","params":{"output":"' + output + '"}}').encode()
+        chunks = [payload[offset : offset + 65536] for offset in range(0, len(payload), 65536)]
+        chunks[-1] += b'\n{"method":"ping"}\n{"method":"tail"}'
+        transport = AsyncStdioTransport()
+        transport._process = _FakeProcess(
+            stdin=_FakeStreamWriter(),
+            stdout=_FakeStreamReader(chunks),
+            stderr=_FakeStreamReader([]),
+        )
+
+        large = await transport.receive()
+        assert large == {"method": "item/completed", "params": {"output": output}}
+        assert await transport.receive() == {"method": "ping"}
+        assert await transport.receive() == {"method": "tail"}
+        assert await transport.receive() is None
+
+    asyncio.run(scenario())
+
+
 def test_stdio_transport_receive_raises_for_non_object_payload() -> None:
     async def scenario() -> None:
         transport = AsyncStdioTransport()
@@ -371,6 +456,64 @@ def test_stdio_transport_receive_raises_for_non_object_payload() -> None:
     asyncio.run(scenario())
 
 
+class _RecordingCodec:
+    def __init__(self) -> None:
+        self.encoded: list[object] = []
+        self.decoded: list[bytes] = []
+
+    def encode(self, message: object) -> bytes:
+        self.encoded.append(message)
+        return b'{"encoded":true}'
+
+    def decode(self, payload: bytes | bytearray | memoryview | str) -> object:
+        assert isinstance(payload, memoryview)
+        self.decoded.append(bytes(payload))
+        if bytes(payload) == b"bad":
+            raise ValueError("bad payload")
+        return {"method": "decoded"}
+
+
+def test_stdio_transport_uses_configured_json_codec() -> None:
+    async def scenario() -> None:
+        codec = _RecordingCodec()
+        stdin = _FakeStreamWriter()
+        transport = AsyncStdioTransport(AppServerProcessOptions(json_codec=codec))
+        transport._process = _FakeProcess(
+            stdin=stdin,
+            stdout=_FakeStreamReader([b'{"method":"ping"}\n', b"bad\n"]),
+            stderr=_FakeStreamReader([]),
+        )
+
+        await transport.send({"method": "initialize"})
+        assert await transport.receive() == {"method": "decoded"}
+        with pytest.raises(AppServerProtocolError, match="Failed to decode"):
+            await transport.receive()
+
+        assert codec.encoded == [{"method": "initialize"}]
+        assert codec.decoded == [b'{"method":"ping"}', b"bad"]
+        assert bytes(stdin.buffer) == b'{"encoded":true}\n'
+
+    asyncio.run(scenario())
+
+
+def test_json_codec_auto_falls_back_to_stdlib_and_named_codecs_require_their_package(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    monkeypatch.setitem(sys.modules, "msgspec", None)
+
+    codec = resolve_json_codec("auto")
+
+    assert isinstance(codec, StdlibJsonCodec)
+    assert codec.decode(codec.encode({"text": "h\u00e9"})) == {"text": "h\u00e9"}
+    with pytest.raises(AppServerConnectionError, match="optional `orjson` package"):
+        AsyncStdioTransport(AppServerProcessOptions(json_codec="orjson"))
+    with pytest.raises(AppServerConnectionError, match="optional `msgspec` package"):
+        AsyncWebSocketTransport(
+            "ws://127.0.0.1:4500", AppServerWebSocketOptions(json_codec="msgspec")
+        )
+
+
 def test_stdio_transport_close_terminates_and_waits() -> None:
     async def scenario() -> None:
         process = _FakeProcess(
@@ -387,7 +530,7 @@ def test_stdio_transport_close_terminates_and_waits() -> None:
         assert process.stdin is not None and process.stdin.closed is True
         assert process.terminated is True
         assert process.wait_calls >= 1
-        assert transport._stderr_lines == ["stderr line"]
+        assert transport.stderr_tail == ("stderr line",)
 
     asyncio.run(scenario())
 
@@ -414,6 +557,62 @@ def test_stdio_transport_close_surfaces_overlong_stderr_line() -> None:
     asyncio.run(scenario())
 
 
+def test_stdio_transport_keeps_a_bounded_stderr_tail_and_attaches_it_on_crash() -> None:
+    async def scenario() -> None:
+        process = _FakeProcess(
+            stdin=_FakeStreamWriter(),
+            stdout=_FakeStreamReader([]),
+            stderr=_FakeStreamReader([f"line {index}\n".encode() for index in range(5)]),
+            returncode=101,
+        )
+        transport = AsyncStdioTransport(AppServerProcessOptions(stderr_tail_lines=2))
+        transport._process = process
+        transport._stderr_task = asyncio.create_task(transport._drain_stderr(process.stderr))
+
+        with pytest.raises(AppServerClosedError, match="exited with code 101") as exc_info:
+            await transport.receive()
+
+        assert exc_info.value.stderr_tail == ("line 3", "line 4")
+        assert str(exc_info.value).endswith("line 3\nline 4")
+        assert transport.stderr_tail == ("line 3", "line 4")
+
+    asyncio.run(scenario())
+
+
+def test_stdio_transport_forwards_stderr_with_rate_limit(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    forwarded: list[str] = []
+
+    async def on_stderr(line: str) -> None:
+        forwarded.append(line)
+
+    async def scenario() -> None:
+        transport = AsyncStdioTransport(
+            AppServerProcessOptions(
+                stderr_callback=on_stderr,
+                stderr_log_level=logging.WARNING,
+                stderr_rate_limit=2,
+            )
+        )
+        for index in range(5):
+            await transport._stderr.add(f"burst {index}")
+        await asyncio.sleep(0.6)
+        await transport._stderr.add("later")
+
+    with caplog.at_level(logging.WARNING, logger="codex.app_server.stderr"):
+        asyncio.run(scenario())
+
+    expected = [
+        "burst 0",
+        "burst 1",
+        "[3 app-server stderr lines suppressed by rate limit]",
+        "later",
+    ]
+    assert forwarded == expected
+    assert [record.getMessage() for record in caplog.records] == expected
+
+
 def test_stdio_transport_close_kills_after_wait_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
     async def fake_wait_for(awaitable: object, timeout: float) -> object:
         _ = timeout
@@ -509,7 +708,8 @@ def test_websocket_transport_send_receive_and_close(monkeypatch: pytest.MonkeyPa
         message = await transport.receive()
         await transport.close()
 
-        assert connection.sent == ['{"method":"initialize","params":{}}']
+        assert connection.sent == [b'{"method":"initialize","params":{}}']
+        assert connection.sent_as_text == [True]
         assert message == {"method": "ping", "params": {}}
         assert connection.closed is True
 
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import threading
+
 import pytest
 from pydantic import BaseModel
 
@@ -8,6 +10,7 @@ import codex.codex as codex_module
 import codex.options as options_module
 import codex.thread as thread_module
 from codex._turn_options import with_model_output_schema
+from codex.app_server import AppServerStartupTimings
 from codex.app_server.options import (
     AppServerInitializeOptions,
     AppServerProcessOptions,
@@ -193,6 +196,86 @@ def test_codex_logs_in_via_app_server_account_client_when_api_key_is_set(
     assert fake_client.account.login_api_key_calls == ["sk-test"]
 
 
+def test_codex_prewarm_connects_in_background_and_reports_timings(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fake_client = _FakeAppServerClient()
+    fake_client.startup_timings = AppServerStartupTimings(  # type: ignore[attr-defined]
+        transport_seconds=0.25,
+        initialize_seconds=0.5,
+    )
+    release = threading.Event()
+    connect_threads: list[str] = []
+
+    def fake_connect_stdio(
+        cls: type[object],
+        process_options: AppServerProcessOptions | None = None,
+        initialize_options: object | None = None,
+    ) -> _FakeAppServerClient:
+        _ = (cls, process_options, initialize_options)
+        connect_threads.append(threading.current_thread().name)
+        release.wait(timeout=1)
+        return fake_client
+
+    monkeypatch.setattr(
+        "codex.app_server.AppServerClient.connect_stdio",
+        classmethod(fake_connect_stdio),
+    )
+
+    client = codex_module.Codex(codex_module.CodexOptions(api_key="sk-test", prewarm=True))
+    assert client.startup_timings is None
+
+    release.set()
+    assert client._ensure_client() is fake_client
+    assert connect_threads == ["codex-prewarm"]
+    assert fake_client.account.login_api_key_calls == ["sk-test"]
+
+    timings = client.startup_timings
+    assert timings is not None
+    assert timings.spawn_seconds == 0.25
+    assert timings.handshake_seconds == 0.5
+    assert timings.login_seconds is not None
+    assert timings.ready_wait_seconds >= 0
+
+    client.close()
+    assert fake_client.close_calls == 1
+
+
+def test_codex_prewarm_surfaces_startup_errors_and_reconnects_for_dynamic_tools(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    clients = [_FakeAppServerClient(), _FakeAppServerClient()]
+    experimental_flags: list[bool] = []
+
+    def fake_connect_stdio(
+        cls: type[object],
+        process_options: AppServerProcessOptions | None = None,
+        initialize_options: AppServerInitializeOptions | None = None,
+    ) -> _FakeAppServerClient:
+        _ = (cls, process_options)
+        assert initialize_options is not None
+        experimental_flags.append(initialize_options.experimental_api)
+        if len(experimental_flags) > len(clients):
+            raise RuntimeError("spawn failed")
+        return clients[len(experimental_flags) - 1]
+
+    monkeypatch.setattr(
+        "codex.app_server.AppServerClient.connect_stdio",
+        classmethod(fake_connect_stdio),
+    )
+
+    client = codex_module.Codex()
+    client.prewarm()
+    assert client._ensure_client(require_experimental=True) is clients[1]
+    assert experimental_flags == [False, True]
+    assert clients[0].close_calls == 1
+
+    failing = codex_module.Codex()
+    failing.prewarm()
+    with pytest.raises(RuntimeError, match="spawn failed"):
+        failing._ensure_client()
+
+
 def test_codex_resume_thread_rejects_empty_id() -> None:
     client = codex_module.Codex()
 
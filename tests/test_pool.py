@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from codex import AsyncCodexPool, Codex, CodexError, CodexOptions, CodexPool, CodexPoolOptions
+from codex.app_server import AppServerClient, AsyncAppServerClient
+
+
+class _FakeThread:
+    def __init__(self, thread_id: str) -> None:
+        self.id = thread_id
+
+
+class _FakeAccount:
+    def __init__(self) -> None:
+        self.api_keys: list[str] = []
+
+    def login_api_key(self, *, api_key: str) -> object:
+        self.api_keys.append(api_key)
+        return object()
+
+
+class _FakeClient:
+    def __init__(self) -> None:
+        self.connected = True
+        self.closed = False
+        self.releases = 0
+        self.account = _FakeAccount()
+
+    def start_thread(self, options: object | None = None, *, tools: object | None = None) -> object:
+        _ = (options, tools)
+        return _FakeThread("thr-1")
+
+    def _release_threads(self) -> None:
+        self.releases += 1
+
+    def close(self) -> None:
+        self.closed = True
+        self.connected = False
+
+
+class _FakeAsyncAccount:
+    async def login_api_key(self, *, api_key: str) -> object:
+        _ = api_key
+        return object()
+
+
+class _FakeAsyncClient:
+    def __init__(self) -> None:
+        self.connected = True
+        self.closed = False
+        self.releases = 0
+        self.account = _FakeAsyncAccount()
+
+    async def _release_threads(self) -> None:
+        self.releases += 1
+
+    async def close(self) -> None:
+        self.closed = True
+        self.connected = False
+
+
+def _patch_spawns(monkeypatch: pytest.MonkeyPatch) -> list[_FakeClient]:
+    spawned: list[_FakeClient] = []
+
+    def fake_connect_stdio(
+        cls: type[AppServerClient],
+        process_options: object | None = None,
+        initialize_options: object | None = None,
+    ) -> _FakeClient:
+        _ = (cls, process_options, initialize_options)
+        client = _FakeClient()
+        spawned.append(client)
+        return client
+
+    monkeypatch.setattr(AppServerClient, "connect_stdio", classmethod(fake_connect_stdio))
+    return spawned
+
+
+def test_pool_reuses_checked_in_connection(monkeypatch: pytest.MonkeyPatch) -> None:
+    spawned = _patch_spawns(monkeypatch)
+    options = CodexOptions(api_key="sk-test")
+
+    with CodexPool() as pool:
+        with pool.connection(options) as first:
+            pass
+        with pool.connection(options) as second:
+            pass
+
+        assert first is second
+        assert len(spawned) == 1
+        assert spawned[0].account.api_keys == ["sk-test"]
+        assert not spawned[0].closed
+
+    assert spawned[0].closed
+
+
+def test_pool_keys_connections_by_options_and_experimental_api(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    spawned = _patch_spawns(monkeypatch)
+    pool = CodexPool()
+
+    with pool.connection(CodexOptions(codex_path_override="/bin/a")) as first:
+        pass
+    with pool.connection(CodexOptions(codex_path_override="/bin/b")) as second:
+        pass
+    with pool.connection(
+        CodexOptions(codex_path_override="/bin/a"), experimental_api=True
+    ) as third:
+        pass
+
+    assert len({id(first), id(second), id(third)}) == 3
+    assert len(spawned) == 3
+    pool.close()
+
+
+def test_pool_shares_connection_up_to_thread_limit_then_times_out(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    spawned = _patch_spawns(monkeypatch)
+    pool = CodexPool(
+        CodexPoolOptions(max_connections=1, max_threads_per_connection=2, checkout_timeout=0.05)
+    )
+
+    first = pool.checkout()
+    second = pool.checkout()
+    assert first is second
+    assert len(spawned) == 1
+
+    started = time.monotonic()
+    with pytest.raises(CodexError, match="Timed out"):
+        pool.checkout()
+    assert time.monotonic() - started >= 0.05
+
+    pool.checkin(first)
+    assert pool.checkout() is first
+    pool.close()
+
+
+def test_pool_resets_connection_when_its_last_lease_ends(monkeypatch: pytest.MonkeyPatch) -> None:
+    spawned = _patch_spawns(monkeypatch)
+    pool = CodexPool(CodexPoolOptions(max_connections=1, max_threads_per_connection=2))
+
+    first = pool.checkout()
+    second = pool.checkout()
+    pool.checkin(first)
+    assert spawned[0].releases == 0
+    pool.checkin(second)
+    assert spawned[0].releases == 1
+    assert not spawned[0].closed
+    pool.close()
+
+
+def test_pool_closes_connection_that_fails_to_reset(monkeypatch: pytest.MonkeyPatch) -> None:
+    spawned = _patch_spawns(monkeypatch)
+    pool = CodexPool()
+
+    def fail() -> None:
+        raise RuntimeError("transport broke")
+
+    client = pool.checkout()
+    monkeypatch.setattr(spawned[0], "_release_threads", fail)
+    pool.checkin(client)
+
+    assert spawned[0].closed
+    assert pool.checkout() is spawned[1]
+    pool.close()
+
+
+def test_waiting_checkout_receives_connection_on_checkin(monkeypatch: pytest.MonkeyPatch) -> None:
+    _patch_spawns(monkeypatch)
+    pool = CodexPool(CodexPoolOptions(max_connections=1, checkout_timeout=1))
+    held = pool.checkout()
+    received: list[object] = []
+
+    waiter = threading.Thread(target=lambda: received.append(pool.checkout()))
+    waiter.start()
+    time.sleep(0.02)
+    pool.checkin(held)
+    waiter.join(timeout=1)
+
+    assert received == [held]
+    pool.close()
+
+
+def test_pool_evicts_idle_and_dead_connections(monkeypatch: pytest.MonkeyPatch) -> None:
+    spawned = _patch_spawns(monkeypatch)
+    pool = CodexPool(CodexPoolOptions(max_idle_seconds=0.01))
+
+    assert pool.warm() == 1
+    time.sleep(0.02)
+    fresh = pool.checkout()
+    assert spawned[0].closed
+    assert fresh is spawned[1]
+
+    fresh.connected = False
+    pool.checkin(fresh)
+    assert fresh.closed
+    pool.close()
+
+
+def test_codex_with_pool_checks_client_back_in(monkeypatch: pytest.MonkeyPatch) -> None:
+    spawned = _patch_spawns(monkeypatch)
+    pool = CodexPool()
+
+    for _ in range(3):
+        codex = Codex(pool=pool)
+        assert codex.start_thread().id == "thr-1"
+        codex.close()
+
+    assert len(spawned) == 1
+    assert not spawned[0].closed
+    pool.close()
+    assert spawned[0].closed
+
+
+def test_async_pool_reuses_connection(monkeypatch: pytest.MonkeyPatch) -> None:
+    spawned: list[_FakeAsyncClient] = []
+
+    async def fake_connect_stdio(
+        cls: type[AsyncAppServerClient],
+        process_options: object | None = None,
+        initialize_options: object | None = None,
+    ) -> _FakeAsyncClient:
+        _ = (cls, process_options, initialize_options)
+        client = _FakeAsyncClient()
+        spawned.append(client)
+        return client
+
+    monkeypatch.setattr(AsyncAppServerClient, "connect_stdio", classmethod(fake_connect_stdio))
+
+    async def scenario() -> None:
+        async with AsyncCodexPool(CodexPoolOptions(max_connections=1)) as pool:
+            async with pool.connection() as first:
+                pass
+            async with pool.connection() as second:
+                pass
+            assert first is second
+            assert not spawned[0].closed
+        assert spawned[0].closed
+
+    asyncio.run(scenario())
+    assert len(spawned) == 1
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+
+from codex._signals import _SignalWatchService
+
+
+class _AbortFlag:
+    def __init__(self) -> None:
+        self.aborted = False
+
+
+def test_threading_event_watches_share_the_poller_and_fire_once() -> None:
+    service = _SignalWatchService()
+    signal = threading.Event()
+    other = threading.Event()
+    fired = [threading.Event() for _ in range(20)]
+    calls: list[int] = []
+
+    def callback(index: int) -> Callable[[], None]:
+        def fire() -> None:
+            calls.append(index)
+            fired[index].set()
+
+        return fire
+
+    for index in range(len(fired)):
+        service.watch(signal, callback(index))
+    service.watch(other, lambda: None).cancel()
+
+    poller = service._poller
+    assert poller is not None
+
+    signal.set()
+    assert all(event.wait(timeout=1) for event in fired)
+    poller.join(timeout=1)
+    assert sorted(calls) == list(range(20))
+    assert service._poller is None
+
+
+def test_cancelling_the_last_watch_stops_the_poller_promptly() -> None:
+    service = _SignalWatchService()
+    watch = service.watch(threading.Event(), lambda: None)
+    poller = service._poller
+    assert poller is not None
+
+    watch.cancel()
+
+    poller.join(timeout=1)
+    assert not poller.is_alive()
+    assert service._poller is None
+
+
+def test_cancelled_watch_does_not_fire() -> None:
+    service = _SignalWatchService()
+    signal = threading.Event()
+    kept = threading.Event()
+    cancelled_calls: list[int] = []
+    cancelled = service.watch(signal, lambda: cancelled_calls.append(1))
+    service.watch(signal, kept.set)
+    cancelled.cancel()
+
+    signal.set()
+
+    assert kept.wait(timeout=1)
+    time.sleep(0.05)
+    assert cancelled_calls == []
+
+
+def test_asyncio_event_bound_to_running_loop_fires_without_polling() -> None:
+    service = _SignalWatchService()
+    done = threading.Event()
+
+    async def scenario() -> None:
+        signal = asyncio.Event()
+        waiter = asyncio.create_task(signal.wait())
+        await asyncio.sleep(0)
+        await asyncio.to_thread(service.watch, signal, done.set)
+        await asyncio.sleep(0)
+        signal.set()
+        await waiter
+        assert await asyncio.to_thread(done.wait, 1)
+
+    asyncio.run(scenario())
+
+    assert service._poller is None
+
+
+def test_custom_abort_signal_is_polled_by_a_single_shared_thread() -> None:
+    service = _SignalWatchService()
+    flags = [_AbortFlag() for _ in range(10)]
+    fired = [threading.Event() for _ in flags]
+    for flag, event in zip(flags, fired, strict=True):
+        service.watch(flag, event.set)
+
+    poller = service._poller
+    assert poller is not None
+    flags[3].aborted = True
+
+    assert fired[3].wait(timeout=1)
+    assert not any(event.is_set() for index, event in enumerate(fired) if index != 3)
+    assert service._poller is poller
+
+    for flag in flags:
+        flag.aborted = True
+    assert all(event.wait(timeout=1) for event in fired)
+    poller.join(timeout=1)
+    assert service._poller is None
@@ -11,6 +11,7 @@ import pytest
 
 from codex.app_server import AppServerClient, AsyncAppServerClient
 from codex.app_server._sync_client import _LoopThread
+from codex.app_server._sync_threads import _SyncNotificationBuffer
 from codex.protocol import types as protocol
 
 JsonObject = dict[str, Any]
@@ -418,3 +419,106 @@ def test_turn_stream_yields_moderation_metadata_and_does_not_hang() -> None:
         assert events[0].params.metadata == {"blocked": False}
     finally:
         client.close()
+
+
+def _agent_delta(delta: str) -> JsonObject:
+    return {
+        "method": "item/agentMessage/delta",
+        "params": {"threadId": "thr-1", "turnId": "turn-1", "itemId": "item-1", "delta": delta},
+    }
+
+
+def test_turn_stream_iter_batches_groups_notifications_until_turn_completes() -> None:
+    client, transport = _make_sync_client()
+    try:
+        thread = client.start_thread()
+        stream = thread.run("Batched consumption")
+
+        for delta in ["a", "b", "c", "d", "e"]:
+            transport.push(_agent_delta(delta))
+        transport.push(
+            {
+                "method": "turn/completed",
+                "params": {
+                    "threadId": "thr-1",
+                    "turn": _turn_payload(turn_id="turn-1", status="completed"),
+                },
+            }
+        )
+
+        batches = list(stream.iter_batches(max_items=3, max_latency=1.0))
+
+        assert [len(batch) for batch in batches] == [3, 3]
+        assert isinstance(batches[-1][-1], protocol.TurnCompletedNotificationModel)
+        assert stream.text_deltas == ("a", "b", "c", "d", "e")
+        assert list(stream) == []
+    finally:
+        client.close()
+
+
+def test_turn_stream_state_follows_what_the_caller_has_consumed() -> None:
+    client, transport = _make_sync_client()
+    try:
+        thread = client.start_thread()
+        stream = thread.run("Prefetched consumption")
+
+        for delta in ["a", "b", "c"]:
+            transport.push(_agent_delta(delta))
+        transport.push(
+            {
+                "method": "turn/completed",
+                "params": {
+                    "threadId": "thr-1",
+                    "turn": _turn_payload(turn_id="turn-1", status="completed"),
+                },
+            }
+        )
+        time.sleep(0.05)
+
+        next(stream)
+        assert stream.text_deltas == ("a",)
+        next(stream)
+        assert stream.text_deltas == ("a", "b")
+        assert stream.final_turn is None
+
+        _wait_with_timeout(stream)
+        assert stream.text_deltas == ("a", "b", "c")
+        assert stream.final_turn is not None
+    finally:
+        client.close()
+
+
+def test_notification_subscription_iter_batches_stops_after_close() -> None:
+    client, transport = _make_sync_client()
+    try:
+        subscription = client.events.subscribe({"custom/notify"})
+        batches = subscription.iter_batches(max_items=10, max_latency=1.0)
+        transport.push({"method": "custom/notify", "params": {"n": 1}})
+        transport.push({"method": "custom/notify", "params": {"n": 2}})
+
+        first = next(batches)
+        subscription.close()
+
+        assert [event.params for event in first] == [{"n": 1}, {"n": 2}]
+        assert list(batches) == []
+    finally:
+        client.close()
+
+
+def test_sync_notification_buffer_delivers_batch_before_surfacing_error() -> None:
+    source: list[object] = ["first", "second", RuntimeError("boom")]
+
+    async def next_item() -> Any:
+        item = source.pop(0)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    buffer = _SyncNotificationBuffer(asyncio.run, next_item, lambda: bool(source))
+
+    assert buffer.next() == "first"
+    assert buffer.next() == "second"
+    with pytest.raises(RuntimeError, match="boom"):
+        buffer.next()
+    with pytest.raises(ValueError, match="max_items"):
+        next(buffer.batches(0, 0.0))